@@ -0,0 +1,283 @@
+"""
+Resolución por lotes sin interfaz gráfica.
+
+Lee instancias (inicial, meta) de un archivo JSONL o de texto, las resuelve con cualquier algoritmo de
+searches/ en un ProcessPoolExecutor (las instancias se despachan en bloques para amortizar la
+comunicación entre procesos) y escribe un resultado JSONL por instancia, en el mismo orden de entrada.
+
+Formatos de entrada:
+    JSONL: {"id": "a1", "start": [1, 2, 3, 4, 5, 6, 0, 7, 8], "goal": [...], "size": "3x3"}
+           start y goal pueden ser listas planas o listas de filas; goal y size son opcionales.
+    Texto: una instancia por línea, "inicial ; meta" con los números separados por espacios o comas
+           (la meta es opcional); las líneas vacías y las que empiezan con # se ignoran.
+
+Uso:
+    python batch.py instancias.jsonl --solver astar --param heuristic=linear_conflict -o resultados.jsonl
+    python batch.py instancias.txt --solver bpp --param nProf=25 --workers 8 --chunk-size 256
+    python batch.py instancias.jsonl --cache soluciones.sqlite   # reutiliza soluciones previas (ver cache.py)
+    python batch.py instancias.jsonl --time-limit 0.5 --node-limit 1000000   # presupuesto por instancia
+
+Con presupuesto (--time-limit, --node-limit, --memory-limit; ver puzzle.Budget), una instancia que lo
+agota se informa con solved=false, exhausted (el límite agotado), best_h y los movimientos hasta el
+mejor estado alcanzado.
+
+Este módulo no importa tkinter (ni gui.py), por lo que puede ejecutarse en servidores sin pantalla.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Deque, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+from cache import SolutionCache
+from puzzle import Budget, Geometry, State, geometry, is_solvable, parse_geometry, resolve_geometry
+from searches.registry import SOLVERS, check_params, get_solver
+
+# Instancia lista para resolver: (id, inicial, meta, filas, columnas) o (id, None, mensaje de error, 0, 0)
+Instance = Tuple[Any, Optional[State], Any, int, int]
+
+# Caché de soluciones abierta en este proceso, por ruta (cada proceso del pool abre la suya)
+_CACHES: Dict[str, SolutionCache] = {}
+
+
+def _board(value: Any) -> Tuple[State, Optional[Geometry]]:
+    # Lista plana o lista de filas; las filas determinan la geometría
+    if value and all(isinstance(row, list) for row in value):
+        return tuple(v for row in value for v in row), geometry(len(value), len(value[0]))
+    return tuple(value), None
+
+
+def _split_numbers(text: str) -> State:
+    return tuple(int(p) for p in text.replace(',', ' ').split())
+
+
+def _make_instance(ident: Any, start: State, goal: Optional[State], geom: Optional[Geometry]) -> Instance:
+    # Valida el par y fija la geometría (explícita, de las filas o cuadrada deducida del largo)
+    geom = resolve_geometry(start, geom)
+    if goal is None:
+        goal = geom.goal
+    for name, st in (('inicial', start), ('meta', goal)):
+        if len(st) != geom.size or set(st) != set(range(geom.size)):
+            raise ValueError(f"El estado {name} debe contener los números 0..{geom.size - 1} sin repetir.")
+    return ident, start, goal, geom.rows, geom.cols
+
+
+def read_instances(lines: Iterable[str], fmt: str, geom: Optional[Geometry] = None) -> Iterator[Instance]:
+    """
+    Genera las instancias de forma perezosa (no se carga el archivo completo). Una línea inválida
+    produce una instancia de error con su mensaje, para que el resultado conserve el orden.
+    """
+    for lineno, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+        ident: Any = lineno
+        try:
+            if fmt == 'jsonl':
+                rec = json.loads(line)
+                ident = rec.get('id', lineno)
+                start, start_geom = _board(rec['start'])
+                goal = _board(rec['goal'])[0] if rec.get('goal') is not None else None
+                inst_geom = parse_geometry(rec['size']) if rec.get('size') else (start_geom or geom)
+            else:
+                start_txt, _, goal_txt = line.replace('|', ';').partition(';')
+                start = _split_numbers(start_txt)
+                goal = _split_numbers(goal_txt) if goal_txt.strip() else None
+                inst_geom = geom
+            yield _make_instance(ident, start, goal, inst_geom)
+        except (ValueError, KeyError, TypeError) as e:
+            yield ident, None, f"Línea {lineno}: {e}", 0, 0
+
+
+def _cache(path: str) -> SolutionCache:
+    if path not in _CACHES:
+        _CACHES[path] = SolutionCache(path)
+    return _CACHES[path]
+
+
+def solve_instance(
+    solver: str,
+    params: Dict[str, Any],
+    inst: Instance,
+    cache_path: Optional[str] = None,
+    limits: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    # Resuelve una instancia (consultando la caché si se indicó) y arma su registro de resultado;
+    # limits son los argumentos de un puzzle.Budget propio de la instancia
+    ident, start, goal, rows, cols = inst
+    record: Dict[str, Any] = {'id': ident, 'solver': solver}
+    if start is None:
+        record.update(solved=False, error=goal)
+        return record
+    geom = geometry(rows, cols)
+    if not is_solvable(start, goal, geom):
+        record.update(solved=False, error='El par (inicial, meta) no es resoluble.')
+        return record
+    if limits:
+        params = dict(params, budget=Budget(**limits))
+    t0 = time.perf_counter()
+    hits = 0
+    try:
+        if cache_path is None:
+            sol = get_solver(solver)(start, goal, geom=geom, **params)
+        else:
+            # Un fracaso guardado se retorna como None: el acierto se detecta por el contador
+            cache = _cache(cache_path)
+            hits = cache.hits
+            sol = cache.solve(solver, start, goal, geom=geom, **params)
+            hits = cache.hits - hits
+    except Exception as e:
+        record.update(solved=False, error=f"{type(e).__name__}: {e}", elapsed=round(time.perf_counter() - t0, 6))
+        return record
+    elapsed = time.perf_counter() - t0
+    if sol is None:
+        record.update(solved=False, moves=None, depth=None, nodes_generated=None, nodes_expanded=None)
+    else:
+        record.update(
+            solved=sol.complete,
+            moves=sol.moves,
+            depth=sol.depth,
+            nodes_generated=sol.nodes_generated,
+            nodes_expanded=sol.nodes_expanded,
+        )
+        if not sol.complete:
+            record.update(exhausted=sol.reason, best_h=sol.best_h)
+    record['elapsed'] = round(elapsed, 6)
+    if cache_path is not None:
+        record['cached'] = hits > 0
+    return record
+
+
+def _solve_chunk(
+    solver: str,
+    params: Dict[str, Any],
+    chunk: List[Instance],
+    cache_path: Optional[str] = None,
+    limits: Optional[Dict[str, Any]] = None,
+) -> List[Dict[str, Any]]:
+    # Unidad de trabajo de cada proceso: un bloque de instancias
+    return [solve_instance(solver, params, inst, cache_path, limits) for inst in chunk]
+
+
+def _chunks(instances: Iterable[Instance], size: int) -> Iterator[List[Instance]]:
+    chunk: List[Instance] = []
+    for inst in instances:
+        chunk.append(inst)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def run_batch(
+    instances: Iterable[Instance],
+    solver: str,
+    params: Dict[str, Any],
+    workers: Optional[int] = None,
+    chunk_size: int = 64,
+    cache_path: Optional[str] = None,
+    limits: Optional[Dict[str, Any]] = None,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Resuelve las instancias y genera los resultados en el orden de entrada.
+    Con workers=1 se resuelve en el proceso actual; si no, en un ProcessPoolExecutor con a lo sumo
+    2 bloques pendientes por proceso, de modo que la memoria no crece con el tamaño de la entrada.
+    cache_path: base sqlite de SolutionCache; cada proceso la abre con su propio LRU en memoria.
+    limits: argumentos de puzzle.Budget (time_limit, max_nodes, max_memory) aplicados a cada instancia.
+    """
+    check_params(solver, params)  # Falla antes de lanzar procesos si el nombre o los parámetros no existen
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        for chunk in _chunks(instances, chunk_size):
+            yield from _solve_chunk(solver, params, chunk, cache_path, limits)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending: Deque[Future] = deque()
+        for chunk in _chunks(instances, chunk_size):
+            pending.append(pool.submit(_solve_chunk, solver, params, chunk, cache_path, limits))
+            if len(pending) >= 2 * workers:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+def _parse_param(text: str) -> Tuple[str, Any]:
+    # 'clave=valor' con el valor interpretado como JSON (números, true/false, null) o texto
+    key, sep, value = text.partition('=')
+    if not sep or not key:
+        raise argparse.ArgumentTypeError(f"Parámetro inválido: {text} (use clave=valor).")
+    try:
+        return key, json.loads(value)
+    except ValueError:
+        return key, value
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Resuelve lotes de instancias del puzzle sin interfaz gráfica.')
+    parser.add_argument('input', help="Archivo de instancias (.jsonl o texto); '-' para la entrada estándar.")
+    parser.add_argument('--solver', default='astar', choices=sorted(SOLVERS), help='Algoritmo (por defecto astar).')
+    parser.add_argument('--param', action='append', type=_parse_param, default=[], metavar='CLAVE=VALOR',
+                        help='Parámetro del algoritmo; puede repetirse (p. ej. --param nProf=20).')
+    parser.add_argument('--format', choices=['jsonl', 'text'], help='Formato de entrada (por defecto según la extensión).')
+    parser.add_argument('--size', help='Dimensiones por defecto, p. ej. 4x4 (si no, se deducen de cada instancia).')
+    parser.add_argument('--workers', type=int, default=None, help='Procesos (por defecto todos los núcleos).')
+    parser.add_argument('--chunk-size', type=int, default=64, help='Instancias por bloque despachado (por defecto 64).')
+    parser.add_argument('--cache', help='Base sqlite de soluciones a reutilizar y completar (ver cache.py).')
+    parser.add_argument('--time-limit', type=float, help='Segundos máximos por instancia (ver puzzle.Budget).')
+    parser.add_argument('--node-limit', type=int, help='Nodos generados máximos por instancia.')
+    parser.add_argument('--memory-limit', type=float, help='Memoria máxima (MB) que puede crecer el proceso por instancia.')
+    parser.add_argument('-o', '--output', help='Archivo de salida JSONL (por defecto la salida estándar).')
+    args = parser.parse_args(argv)
+
+    params = dict(args.param)
+    try:
+        check_params(args.solver, params)
+    except ValueError as e:
+        parser.error(str(e))
+    if args.chunk_size <= 0 or (args.workers is not None and args.workers <= 0):
+        parser.error('--workers y --chunk-size deben ser enteros positivos.')
+    limits: Dict[str, Any] = {}
+    if args.time_limit is not None:
+        limits['time_limit'] = args.time_limit
+    if args.node_limit is not None:
+        limits['max_nodes'] = args.node_limit
+    if args.memory_limit is not None:
+        limits['max_memory'] = int(args.memory_limit * 2**20)
+    try:
+        Budget(**limits)
+    except ValueError as e:
+        parser.error(str(e))
+    fmt = args.format or ('jsonl' if args.input.endswith(('.jsonl', '.json')) else 'text')
+    geom = parse_geometry(args.size) if args.size else None
+
+    src: TextIO = sys.stdin if args.input == '-' else open(args.input, 'r', encoding='utf-8')
+    out: TextIO = sys.stdout if not args.output else open(args.output, 'w', encoding='utf-8')
+    solved = total = cached = exhausted = 0
+    try:
+        for record in run_batch(
+            read_instances(src, fmt, geom), args.solver, params, args.workers, args.chunk_size, args.cache, limits
+        ):
+            out.write(json.dumps(record, ensure_ascii=False) + '\n')
+            total += 1
+            solved += bool(record['solved'])
+            cached += bool(record.get('cached'))
+            exhausted += bool(record.get('exhausted'))
+    finally:
+        if src is not sys.stdin:
+            src.close()
+        if out is not sys.stdout:
+            out.close()
+    print(f"{solved}/{total} instancias resueltas.", file=sys.stderr)
+    if args.cache:
+        print(f"{cached} respuestas desde la caché.", file=sys.stderr)
+    if limits:
+        print(f"{exhausted} instancias agotaron el presupuesto.", file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
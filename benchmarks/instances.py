@@ -0,0 +1,81 @@
+"""
+Generador reproducible de instancias de prueba agrupadas por profundidad óptima.
+
+Con la misma semilla se obtienen siempre las mismas instancias. En el puzzle-8 la profundidad
+óptima se lee de la base de datos de distancias (distance_db); en otros tableros se calcula con
+IDA* y la distancia caminante, lo que puede tardar en los grupos profundos.
+"""
+import random
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from distance_db import exact_distance
+from puzzle import GEOMETRY_3X3, Geometry, State, is_solvable
+from searches.idastar import idastar
+
+# Grupos (profundidad mínima, profundidad máxima) del puzzle-8 (la máxima posible es 31)
+DEFAULT_BUCKETS: Tuple[Tuple[int, int], ...] = ((1, 8), (9, 14), (15, 20), (21, 26), (27, 31))
+
+# Instancia: {'start': [...], 'goal': [...], 'depth': int, 'bucket': 'a-b'}
+Instance = Dict[str, Any]
+
+
+def bucket_name(bucket: Tuple[int, int]) -> str:
+    return f"{bucket[0]}-{bucket[1]}"
+
+
+def optimal_depth(start: State, goal: State, geom: Geometry) -> int:
+    # Profundidad óptima exacta del par (supone que es resoluble)
+    if geom == GEOMETRY_3X3:
+        return exact_distance(start, goal)
+    return idastar(start, goal, geom=geom, heuristic='walking_distance').depth
+
+
+def _candidate(rng: random.Random, goal: State, geom: Geometry) -> State:
+    # Mitad de las veces una caminata aleatoria desde la meta (instancias poco profundas) y mitad
+    # una permutación aleatoria resoluble (instancias profundas, solo en el puzzle-8: en tableros
+    # mayores resolverlas de forma óptima tomaría demasiado)
+    if geom != GEOMETRY_3X3 or rng.random() < 0.5:
+        st = goal
+        for _ in range(rng.randint(1, 4 * geom.size)):
+            st = rng.choice(geom.neighbors(st))[1]
+        return st
+    while True:
+        perm = list(goal)
+        rng.shuffle(perm)
+        if is_solvable(tuple(perm), goal, geom):
+            return tuple(perm)
+
+
+def generate_instances(
+    seed: int = 0,
+    per_bucket: int = 5,
+    buckets: Sequence[Tuple[int, int]] = DEFAULT_BUCKETS,
+    geom: Geometry = GEOMETRY_3X3,
+    goal: Optional[State] = None,
+    max_attempts: int = 200000,
+) -> List[Instance]:
+    """
+    Genera per_bucket instancias por grupo de profundidad óptima, en orden de grupo.
+    Lanza ValueError si tras max_attempts candidatos algún grupo no se completa (p. ej. un grupo
+    más profundo que el diámetro del espacio de estados).
+    """
+    goal = tuple(goal) if goal is not None else geom.goal
+    rng = random.Random(seed)
+    found: Dict[Tuple[int, int], List[Instance]] = {b: [] for b in buckets}
+    seen = set()
+    for _ in range(max_attempts):
+        if all(len(v) >= per_bucket for v in found.values()):
+            break
+        start = _candidate(rng, goal, geom)
+        if start in seen:
+            continue
+        seen.add(start)
+        depth = optimal_depth(start, goal, geom)
+        for b in buckets:
+            if b[0] <= depth <= b[1] and len(found[b]) < per_bucket:
+                found[b].append({'start': list(start), 'goal': list(goal), 'depth': depth, 'bucket': bucket_name(b)})
+                break
+    missing = [bucket_name(b) for b, v in found.items() if len(v) < per_bucket]
+    if missing:
+        raise ValueError(f"No se completaron los grupos de profundidad: {', '.join(missing)}.")
+    return [inst for b in buckets for inst in found[b]]
@@ -0,0 +1,290 @@
+"""
+Banco de pruebas reproducible de los algoritmos de búsqueda.
+
+Cada algoritmo resuelve las mismas instancias (benchmarks.instances, con semilla fija) bajo un
+presupuesto de tiempo y de nodos, que se le pasa como budget (ver puzzle.Budget). Cada ejecución
+corre en un proceso hijo: la memoria de una ejecución no afecta a la siguiente y, si el algoritmo no
+se detiene a tiempo, el hijo se termina al vencer el plazo. Una ejecución cuenta como resuelta solo
+si retorna una solución completa (no un PartialSolution por presupuesto agotado).
+
+Se informa por algoritmo: instancias resueltas, ejecuciones que agotaron el presupuesto (de tiempo y
+de nodos por separado), tiempo total y medio, nodos por segundo, memoria
+pico (tracemalloc, medida en una segunda pasada para no distorsionar los tiempos) y calidad
+(largo de la solución / profundidad óptima).
+
+Uso:
+    python -m benchmarks.runner --per-bucket 5 --save-baseline base.json
+    python -m benchmarks.runner --per-bucket 5 --compare base.json --threshold 20
+La comparación termina con código 1 si algún algoritmo es más de threshold % más lento que la línea base.
+"""
+import argparse
+import json
+import multiprocessing
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from typing import Any, Dict, List, Optional, Sequence
+
+from benchmarks.instances import DEFAULT_BUCKETS, Instance, generate_instances
+from puzzle import Budget, parse_geometry
+from searches.registry import get_solver
+
+# Parámetros fijos de cada algoritmo del banco. 'nProf' de BPP se toma de la profundidad óptima de
+# la instancia: con ese límite BPP encuentra solución si no agota antes el presupuesto de nodos o de
+# tiempo (en instancias profundas lo agota con frecuencia).
+SOLVER_CONFIGS: Dict[str, Dict[str, Any]] = {
+    'dfs': {},
+    'bpp': {},
+    'hill_climbing': {},
+    'astar': {},
+    'genetic_simple': {'pop_size': 80, 'chrom_len': 40, 'generations': 150},
+}
+
+
+def _params(solver: str, inst: Instance) -> Dict[str, Any]:
+    params = dict(SOLVER_CONFIGS.get(solver, {}))
+    if solver == 'bpp':
+        params['nProf'] = inst['depth']
+    return params
+
+
+def _child(
+    conn,
+    solver: str,
+    inst: Instance,
+    params: Dict[str, Any],
+    time_budget: float,
+    max_nodes: Optional[int],
+    seed: int,
+    measure_memory: bool,
+) -> None:
+    # Proceso hijo: una pasada cronometrada y, si se pide, otra con tracemalloc para la memoria pico.
+    # Cada pasada recibe un Budget nuevo (el plazo corre desde que se crea)
+    fn = get_solver(solver)
+    start, goal = tuple(inst['start']), tuple(inst['goal'])
+    random.seed(seed)  # El genético usa el módulo random: misma semilla, mismo resultado
+    t0 = time.perf_counter()
+    c0 = time.process_time()
+    sol = fn(start, goal, budget=Budget(time_limit=time_budget, max_nodes=max_nodes), **params)
+    solved = sol is not None and sol.complete
+    result: Dict[str, Any] = {
+        'elapsed': time.perf_counter() - t0,
+        'cpu': time.process_time() - c0,
+        'solved': solved,
+        'exhausted': None if sol is None or sol.complete else sol.reason,
+        'length': sol.depth if solved else None,
+        'nodes_generated': sol.nodes_generated if sol is not None else None,
+        'nodes_expanded': sol.nodes_expanded if sol is not None else None,
+        'peak_kib': None,
+    }
+    conn.send(result)  # Se envía ya, por si la pasada de memoria excede el plazo
+    if measure_memory:
+        random.seed(seed)
+        tracemalloc.start()
+        fn(start, goal, budget=Budget(time_limit=time_budget, max_nodes=max_nodes), **params)
+        result['peak_kib'] = tracemalloc.get_traced_memory()[1] / 1024
+        tracemalloc.stop()
+        conn.send(result)
+    conn.close()
+
+
+def run_one(
+    solver: str,
+    inst: Instance,
+    time_budget: float,
+    max_nodes: Optional[int] = None,
+    seed: int = 0,
+    measure_memory: bool = True,
+) -> Dict[str, Any]:
+    # Ejecuta un algoritmo sobre una instancia en un proceso hijo, respetando el presupuesto de tiempo
+    params = _params(solver, inst)
+    parent, child = multiprocessing.Pipe(duplex=False)
+    proc = multiprocessing.Process(
+        target=_child, args=(child, solver, inst, params, time_budget, max_nodes, seed, measure_memory)
+    )
+    proc.start()
+    child.close()
+    result: Optional[Dict[str, Any]] = None
+    deadline = time.monotonic() + (2 if measure_memory else 1) * time_budget
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0 or not parent.poll(remaining):
+            break
+        try:
+            result = parent.recv()
+        except EOFError:
+            break
+        if result['peak_kib'] is not None or not measure_memory:
+            break
+    if proc.is_alive():
+        proc.terminate()
+    proc.join()
+    parent.close()
+    if result is None or result['elapsed'] > time_budget:
+        # Se computa el presupuesto completo: el tiempo real fue al menos ese
+        return {'solver': solver, 'bucket': inst['bucket'], 'depth': inst['depth'], 'timeout': True,
+                'elapsed': time_budget, 'cpu': None, 'solved': False, 'exhausted': 'time', 'length': None,
+                'nodes_generated': None, 'nodes_expanded': None,
+                'peak_kib': result['peak_kib'] if result else None}
+    result.update(solver=solver, bucket=inst['bucket'], depth=inst['depth'], timeout=result['exhausted'] == 'time')
+    return result
+
+
+def summarize(runs: List[Dict[str, Any]]) -> Dict[str, Any]:
+    # Agregados de un conjunto de ejecuciones (de un algoritmo o de un algoritmo en un grupo)
+    solved = [r for r in runs if r['solved']]
+    total_time = sum(r['elapsed'] for r in runs)
+    nodes = sum(r['nodes_generated'] for r in solved)
+    solved_time = sum(r['elapsed'] for r in solved)
+    peaks = [r['peak_kib'] for r in runs if r['peak_kib'] is not None]
+    quality = [r['length'] / r['depth'] for r in solved if r['depth']]
+    return {
+        'runs': len(runs),
+        'solved': len(solved),
+        'timeouts': sum(1 for r in runs if r['timeout']),
+        'node_limits': sum(1 for r in runs if r['exhausted'] == 'nodes'),
+        'exhausted': sum(1 for r in runs if r['exhausted'] is not None),
+        'total_time': total_time,
+        'mean_time': total_time / len(runs) if runs else 0.0,
+        'nodes_per_sec': nodes / solved_time if solved_time > 0 else None,
+        'peak_kib': max(peaks) if peaks else None,
+        'quality': sum(quality) / len(quality) if quality else None,
+    }
+
+
+def run_suite(
+    instances: Sequence[Instance],
+    solvers: Sequence[str],
+    time_budget: float = 10.0,
+    max_nodes: Optional[int] = 200000,
+    seed: int = 0,
+    measure_memory: bool = True,
+    progress: bool = False,
+) -> Dict[str, Any]:
+    """
+    Ejecuta cada algoritmo sobre todas las instancias y retorna
+    {'solvers': {nombre: {'summary': {...}, 'buckets': {grupo: {...}}, 'runs': [...]}}}.
+    """
+    report: Dict[str, Any] = {'solvers': {}}
+    for solver in solvers:
+        get_solver(solver)
+        runs = []
+        for i, inst in enumerate(instances):
+            runs.append(run_one(solver, inst, time_budget, max_nodes, seed + i, measure_memory))
+            if progress:
+                print(f"\r{solver}: {i + 1}/{len(instances)}", end='', file=sys.stderr, flush=True)
+        if progress:
+            print(file=sys.stderr)
+        buckets: Dict[str, List[Dict[str, Any]]] = {}
+        for r in runs:
+            buckets.setdefault(r['bucket'], []).append(r)
+        report['solvers'][solver] = {
+            'summary': summarize(runs),
+            'buckets': {b: summarize(rs) for b, rs in buckets.items()},
+            'runs': runs,
+        }
+    return report
+
+
+def _fmt(value: Any, pattern: str) -> str:
+    return '-' if value is None else pattern.format(value)
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    lines = [
+        f"{'algoritmo':<16}{'resueltas':>10}{'agotadas':>9}{'tiempo':>8}{'nodos':>7}{'t. total (s)':>14}{'t. medio (s)':>14}"
+        f"{'nodos/s':>12}{'mem. pico (KiB)':>17}{'calidad':>9}"
+    ]
+    for solver, data in report['solvers'].items():
+        s = data['summary']
+        lines.append(
+            f"{solver:<16}{s['solved']:>5}/{s['runs']:<4}{s['exhausted']:>9}{s['timeouts']:>8}{s['node_limits']:>7}{s['total_time']:>14.3f}"
+            f"{s['mean_time']:>14.4f}{_fmt(s['nodes_per_sec'], '{:.0f}'):>12}"
+            f"{_fmt(s['peak_kib'], '{:.0f}'):>17}{_fmt(s['quality'], '{:.2f}'):>9}"
+        )
+    return '\n'.join(lines)
+
+
+def compare(report: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """
+    Compara el tiempo total de cada algoritmo con la línea base y retorna las regresiones
+    (más de threshold % más lento). Solo es válido con las mismas instancias (misma configuración).
+    """
+    if report.get('config', {}).get('instances') != baseline.get('config', {}).get('instances'):
+        raise ValueError("La línea base se generó con otras instancias (semilla, grupos o tablero distintos).")
+    regressions = []
+    for solver, data in report['solvers'].items():
+        base = baseline['solvers'].get(solver)
+        if base is None:
+            continue
+        old, new = base['summary']['total_time'], data['summary']['total_time']
+        if old > 0 and (new - old) / old * 100 > threshold:
+            regressions.append(f"{solver}: {old:.3f}s -> {new:.3f}s (+{(new - old) / old * 100:.1f}%)")
+        if data['summary']['solved'] < base['summary']['solved']:
+            regressions.append(f"{solver}: resolvió {data['summary']['solved']} de {base['summary']['solved']} instancias")
+    return regressions
+
+
+def _parse_buckets(text: str) -> List[tuple]:
+    try:
+        return [tuple(int(x) for x in part.split('-')) for part in text.split(',')]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Grupos inválidos: {text} (use p. ej. 1-8,9-14,15-20).")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Banco de pruebas reproducible de los algoritmos de búsqueda.')
+    parser.add_argument('--solvers', default=','.join(SOLVER_CONFIGS), help='Algoritmos separados por comas.')
+    parser.add_argument('--seed', type=int, default=0, help='Semilla del generador de instancias.')
+    parser.add_argument('--per-bucket', type=int, default=5, help='Instancias por grupo de profundidad.')
+    parser.add_argument('--buckets', type=_parse_buckets, default=list(DEFAULT_BUCKETS),
+                        help='Grupos de profundidad óptima, p. ej. 1-8,9-14,15-20.')
+    parser.add_argument('--size', default='3x3', help='Dimensiones del tablero (por defecto 3x3).')
+    parser.add_argument('--time-budget', type=float, default=10.0, help='Segundos por ejecución (por defecto 10).')
+    parser.add_argument('--max-nodes', type=int, default=200000, help='Nodos generados por ejecución.')
+    parser.add_argument('--no-memory', action='store_true', help='No medir la memoria pico (evita la segunda pasada).')
+    parser.add_argument('--output', help='Guarda el reporte completo en JSON.')
+    parser.add_argument('--save-baseline', help='Guarda el reporte como línea base en JSON.')
+    parser.add_argument('--compare', help='Línea base JSON contra la cual comparar.')
+    parser.add_argument('--threshold', type=float, default=20.0, help='Porcentaje de lentitud tolerado (por defecto 20).')
+    args = parser.parse_args(argv)
+
+    geom = parse_geometry(args.size)
+    solvers = [s.strip() for s in args.solvers.split(',') if s.strip()]
+    instances = generate_instances(args.seed, args.per_bucket, args.buckets, geom)
+    report = run_suite(instances, solvers, args.time_budget, args.max_nodes, args.seed,
+                       not args.no_memory, progress=True)
+    report['config'] = {
+        'instances': {'seed': args.seed, 'per_bucket': args.per_bucket,
+                      'buckets': [list(b) for b in args.buckets], 'size': args.size},
+        'time_budget': args.time_budget,
+        'max_nodes': args.max_nodes,
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+    }
+    print(format_report(report))
+
+    for path in (args.output, args.save_baseline):
+        if path:
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(report, f, indent=1)
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        try:
+            regressions = compare(report, baseline, args.threshold)
+        except ValueError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            return 2
+        for r in regressions:
+            print(f"REGRESIÓN {r}", file=sys.stderr)
+        if regressions:
+            return 1
+        print(f"Sin regresiones mayores a {args.threshold:g}% respecto de {args.compare}.")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
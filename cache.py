@@ -0,0 +1,187 @@
+"""
+Caché persistente de soluciones normalizada por meta.
+
+Un par (inicial, meta) se lleva a (inicial', meta canónica) re-etiquetando las fichas: la meta
+canónica tiene las fichas 1..n-1 en orden de lectura y el vacío en la misma celda que la meta
+original, y a cada ficha del inicial se le aplica el mismo re-etiquetado. Los movimientos describen
+el desplazamiento del vacío, que no cambia con el re-etiquetado, y los algoritmos no distinguen
+fichas por su número (la heurística Manhattan, el orden de los sucesores y los desempates se
+conservan), por lo que la secuencia guardada sirve tal cual para el par original; la solución se
+arma desde el estado inicial del llamador y su camino se calcula solo si se recorre.
+
+La clave incluye el algoritmo y sus parámetros (con los valores por defecto completados), ya que
+DFS, BPP y el genético no retornan soluciones óptimas y difieren entre sí. Las entradas viven en un
+LRU en memoria con un máximo de entradas y, opcionalmente, en una base sqlite en disco. El presupuesto
+(budget) no forma parte de la clave y los resultados parciales por presupuesto agotado no se guardan.
+
+Los algoritmos aleatorios (STOCHASTIC) solo usan la caché con una semilla explícita (seed), que hace
+reproducible el resultado; sin ella cada llamada ejecuta el algoritmo y no se guarda nada, ni el éxito
+ni el fracaso, que con otra semilla podría no repetirse. genetic_simple no admite semilla y nunca se
+guarda.
+"""
+import inspect
+import json
+import sqlite3
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from puzzle import AnyState, Geometry, Solution, State, decode_moves, encode_moves, resolve_geometry, to_tuple
+from searches.registry import get_solver
+
+# Entrada guardada: (movimientos en letras (ver puzzle.encode_moves) o None si el algoritmo fracasó,
+# nodos generados, nodos expandidos)
+Entry = Tuple[Optional[str], int, int]
+
+# Algoritmos cuyo resultado depende del generador aleatorio
+STOCHASTIC = frozenset({'genetic_simple', 'genetic_numpy', 'genetic_islands', 'steepest_ascent', 'simulated_annealing'})
+
+
+def normalize(start: State, goal: State) -> Tuple[State, int]:
+    # Re-etiqueta el inicial para que la meta pase a ser la canónica; retorna (inicial', celda del vacío en la meta)
+    label = [0] * len(goal)
+    ordinal = 0
+    for v in goal:
+        if v != 0:
+            ordinal += 1
+            label[v] = ordinal
+    return tuple(label[v] for v in start), goal.index(0)
+
+
+class SolutionCache:
+    """
+    LRU en memoria (max_entries) respaldado opcionalmente por sqlite (path). Un fallo en memoria
+    consulta el disco y, si la entrada existe, la promueve al LRU. Los contadores hits, disk_hits
+    y misses permiten medir la efectividad; bypassed cuenta las llamadas que no usan la caché por
+    ser de un algoritmo aleatorio sin semilla.
+    """
+
+    def __init__(self, path: Optional[str] = None, max_entries: int = 10000):
+        if max_entries <= 0:
+            raise ValueError("max_entries debe ser un entero positivo.")
+        self.path = path
+        self.max_entries = max_entries
+        self._lru: 'OrderedDict[str, Entry]' = OrderedDict()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.bypassed = 0
+        self._db: Optional[sqlite3.Connection] = None
+        if path is not None:
+            self._db = sqlite3.connect(path, timeout=30)
+            self._db.execute('PRAGMA journal_mode=WAL')
+            self._db.execute(
+                'CREATE TABLE IF NOT EXISTS solutions ('
+                'key TEXT PRIMARY KEY, moves TEXT, nodes_generated INTEGER, nodes_expanded INTEGER)'
+            )
+            self._db.commit()
+
+    def __len__(self) -> int:
+        return len(self._lru)
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'hits': self.hits,
+            'disk_hits': self.disk_hits,
+            'misses': self.misses,
+            'bypassed': self.bypassed,
+            'entries': len(self._lru),
+            'hit_rate': self.hit_rate,
+        }
+
+    def get(self, key: str) -> Optional[Entry]:
+        entry = self._lru.get(key)
+        if entry is not None:
+            self._lru.move_to_end(key)
+            self.hits += 1
+            return entry
+        if self._db is not None:
+            row = self._db.execute(
+                'SELECT moves, nodes_generated, nodes_expanded FROM solutions WHERE key = ?', (key,)
+            ).fetchone()
+            if row is not None:
+                entry = (row[0], row[1], row[2])
+                self._remember(key, entry)
+                self.hits += 1
+                self.disk_hits += 1
+                return entry
+        self.misses += 1
+        return None
+
+    def put(self, key: str, entry: Entry) -> None:
+        self._remember(key, entry)
+        if self._db is not None:
+            self._db.execute('INSERT OR REPLACE INTO solutions VALUES (?, ?, ?, ?)', (key,) + entry)
+            self._db.commit()
+
+    def _remember(self, key: str, entry: Entry) -> None:
+        # Inserta al final del LRU y descarta las entradas menos usadas si se supera el máximo
+        self._lru[key] = entry
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.max_entries:
+            self._lru.popitem(last=False)
+
+    def close(self) -> None:
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    @staticmethod
+    def cacheable(solver: str, params: Dict[str, Any]) -> bool:
+        # Un algoritmo aleatorio solo es reproducible con una semilla explícita
+        return solver not in STOCHASTIC or params.get('seed') is not None
+
+    def key(self, solver: str, start: AnyState, goal: AnyState, geom: Geometry, params: Dict[str, Any]) -> str:
+        # Clave: algoritmo, parámetros completos, dimensiones, celda del vacío en la meta e inicial normalizado
+        bound = inspect.signature(get_solver(solver)).bind_partial(**params)
+        bound.apply_defaults()
+        args = {k: v for k, v in bound.arguments.items() if k not in ('start', 'goal', 'geom', 'budget')}
+        if args.get('ctx') is not None:
+            raise ValueError("La caché no admite ctx: el contexto depende de la meta original.")
+        try:
+            args_txt = json.dumps(args, sort_keys=True)
+        except TypeError:
+            raise ValueError(f"Los parámetros de {solver} deben ser serializables para usar la caché.")
+        norm, blank = normalize(to_tuple(start, geom), to_tuple(goal, geom))
+        return f"{solver}|{args_txt}|{geom.rows}x{geom.cols}|{blank}|{bytes(norm).hex()}"
+
+    def solve(
+        self,
+        solver: str,
+        start: AnyState,
+        goal: AnyState,
+        geom: Optional[Geometry] = None,
+        **params: Any,
+    ) -> Optional[Solution]:
+        """
+        Igual que llamar al algoritmo solver con (start, goal, geom=geom, **params), pero consultando
+        primero la caché. Una solución obtenida de la caché trae cached=True y los contadores de nodos
+        de la ejecución original; su camino se recorre en la representación de start. Un fracaso
+        guardado se retorna como None, igual que el original (hits distingue si vino de la caché). Un algoritmo
+        aleatorio sin seed se ejecuta siempre, sin consultar ni completar la caché.
+        """
+        geom = resolve_geometry(start, geom)
+        if not self.cacheable(solver, params):
+            self.bypassed += 1
+            return get_solver(solver)(start, goal, geom=geom, **params)
+        key = self.key(solver, start, goal, geom, params)
+        entry = self.get(key)
+        if entry is None:
+            sol = get_solver(solver)(start, goal, geom=geom, **params)
+            if sol is not None and not sol.complete:
+                return sol
+            if sol is None:
+                self.put(key, (None, 0, 0))
+            else:
+                self.put(key, (encode_moves(sol.codes), sol.nodes_generated, sol.nodes_expanded))
+            return sol
+        codes, nodes_generated, nodes_expanded = entry
+        if codes is None:
+            return None
+        sol = Solution(start, decode_moves(codes), nodes_generated, nodes_expanded, geom=geom)
+        sol.cached = True
+        return sol
@@ -0,0 +1,242 @@
+"""
+Base de datos de distancias exactas para el puzzle-8.
+
+Para cada meta canónica se construye una única vez (BFS hacia atrás) la distancia óptima de los
+181 440 estados alcanzables. Los estados se indexan con ranking.state_ranker, que numera solo los
+estados de una clase de resolubilidad, en un arreglo plano de bytes de 9!/2 posiciones sin huecos.
+Un estado de la otra clase comparte rango con uno alcanzable, así que la tabla sola no lo distingue:
+DistanceDBContext.h compara la paridad (ver puzzle.solvability_parity) y retorna UNREACHABLE. Las
+tablas se guardan en disco como binario compacto y se cargan con mmap.
+
+Una meta arbitraria se lleva a una meta canónica con una simetría del tablero (rotación/reflexión)
+que ubica el vacío en una esquina, un borde o el centro, más un re-etiquetado de las fichas. Así
+tres tablas sirven para cualquier par (inicial, meta).
+"""
+import mmap
+import os
+import struct
+import zlib
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+from puzzle import GEOMETRY_3X3, AnyState, GoalContext, State, solvability_parity, to_tuple
+from ranking import state_ranker, state_space
+
+UNREACHABLE = 255
+TABLE_SIZE = state_space(GEOMETRY_3X3)
+CANONICAL_BLANKS = (0, 1, 4)  # Esquina, borde y centro
+DEFAULT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'tablas')
+
+_MAGIC = b'P8DB'
+_VERSION = 1
+# Encabezado: magia, versión, celda del vacío, meta canónica (9 bytes), CRC32 de la tabla
+_HEADER = struct.Struct('<4sBB9sI')
+
+
+def _symmetries() -> List[Tuple[int, ...]]:
+    # Las 8 simetrías del tablero 3x3 como permutaciones de celdas: sym[celda] = celda destino
+    syms: List[Tuple[int, ...]] = []
+    for transpose in (False, True):
+        for flip_r in (False, True):
+            for flip_c in (False, True):
+                sym = []
+                for i in range(9):
+                    r, c = divmod(i, 3)
+                    if transpose:
+                        r, c = c, r
+                    if flip_r:
+                        r = 2 - r
+                    if flip_c:
+                        c = 2 - c
+                    sym.append(r * 3 + c)
+                syms.append(tuple(sym))
+    return syms
+
+
+_SYMMETRIES = _symmetries()
+_rank = state_ranker(GEOMETRY_3X3)
+_CHECK_EVERY = 4096
+_TABLES: Dict[Tuple[int, Optional[str]], 'DistanceTable'] = {}
+
+
+def canonical_goal(blank_cell: int) -> State:
+    # Meta canónica: fichas 1..8 en orden de lectura con el vacío en blank_cell
+    tiles = list(range(1, 9))
+    tiles.insert(blank_cell, 0)
+    return tuple(tiles)
+
+
+def build_table(blank_cell: int, check: Optional[Callable[[], None]] = None) -> bytearray:
+    # BFS desde la meta canónica; table[rango(estado)] = distancia óptima a la meta (la BFS llena todas las posiciones).
+    # check (opcional) se llama cada _CHECK_EVERY estados; puede lanzar una excepción para interrumpir la construcción
+    goal = canonical_goal(blank_cell)
+    table = bytearray([UNREACHABLE]) * TABLE_SIZE
+    table[_rank(goal)] = 0
+    frontier: List[State] = [goal]
+    depth = 0
+    while frontier:
+        depth += 1
+        nxt: List[State] = []
+        for i, st in enumerate(frontier):
+            if check is not None and i % _CHECK_EVERY == 0:
+                check()
+            for _, nb in GEOMETRY_3X3.neighbors(st):
+                r = _rank(nb)
+                if table[r] == UNREACHABLE:
+                    table[r] = depth
+                    nxt.append(nb)
+        frontier = nxt
+    return table
+
+
+def table_path(blank_cell: int, directory: Optional[str] = None) -> str:
+    return os.path.join(directory or DEFAULT_DIR, f'dist_8puzzle_b{blank_cell}.bin')
+
+
+def save_table(path: str, blank_cell: int, table: Union[bytes, bytearray]) -> None:
+    # Escribe la tabla con su encabezado; se escribe a un temporal y se renombra para no dejar archivos a medias
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    header = _HEADER.pack(_MAGIC, _VERSION, blank_cell, bytes(canonical_goal(blank_cell)), zlib.crc32(table))
+    tmp = path + '.tmp'
+    with open(tmp, 'wb') as f:
+        f.write(header)
+        f.write(table)
+    os.replace(tmp, path)
+
+
+class DistanceTable:
+    """
+    Tabla de distancias de una meta canónica, respaldada por un archivo mapeado en memoria
+    (o por un bytearray recién construido). Solo es válida para estados resolubles respecto de goal.
+    """
+
+    def __init__(self, blank_cell: int, data: Union[bytearray, mmap.mmap], offset: int = 0):
+        self.blank_cell = blank_cell
+        self.goal = canonical_goal(blank_cell)
+        self._data = data
+        self._offset = offset
+
+    @classmethod
+    def load(cls, path: str) -> 'DistanceTable':
+        # Abre el archivo con mmap de solo lectura y valida el encabezado
+        with open(path, 'rb') as f:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(data) != _HEADER.size + TABLE_SIZE:
+            data.close()
+            raise ValueError(f"Tamaño inválido para una tabla de distancias: {path}")
+        magic, version, blank_cell, goal, _ = _HEADER.unpack_from(data, 0)
+        if magic != _MAGIC or version != _VERSION or tuple(goal) != canonical_goal(blank_cell):
+            data.close()
+            raise ValueError(f"Encabezado inválido en la tabla de distancias: {path}")
+        return cls(blank_cell, data, _HEADER.size)
+
+    def verify(self) -> bool:
+        # Comprueba el CRC32 guardado en el encabezado contra el contenido
+        if self._offset == 0:
+            return True
+        crc = _HEADER.unpack_from(self._data, 0)[4]
+        return zlib.crc32(self._data[self._offset:]) == crc
+
+    def __getitem__(self, state: State) -> int:
+        return self._data[self._offset + _rank(state)]
+
+
+def get_table(blank_cell: int, directory: Optional[str] = None, check: Optional[Callable[[], None]] = None) -> DistanceTable:
+    # Carga la tabla desde disco; si no existe (o es inválida) la construye (ver build_table) y la guarda.
+    # Las tablas quedan en memoria por (celda, directorio); una construcción interrumpida no deja nada
+    key = (blank_cell, directory)
+    if key in _TABLES:
+        return _TABLES[key]
+    if blank_cell not in CANONICAL_BLANKS:
+        raise ValueError(f"Celda canónica del vacío inválida: {blank_cell} (use {CANONICAL_BLANKS}).")
+    path = table_path(blank_cell, directory)
+    loaded = None
+    if os.path.exists(path):
+        try:
+            loaded = DistanceTable.load(path)
+        except ValueError:
+            pass
+    if loaded is None:
+        table = build_table(blank_cell, check)
+        save_table(path, blank_cell, table)
+        loaded = DistanceTable(blank_cell, table)
+    _TABLES[key] = loaded
+    return loaded
+
+
+def canonical_blank(goal: AnyState) -> int:
+    # Celda canónica del vacío (ver CANONICAL_BLANKS) de la tabla que sirve para goal
+    b = to_tuple(goal).index(0)
+    return next(s[b] for s in _SYMMETRIES if s[b] in CANONICAL_BLANKS)
+
+
+class DistanceDBContext(GoalContext):
+    """
+    Contexto de meta cuya heurística es la distancia óptima exacta leída de la base de datos.
+    Se usa con astar(..., ctx=DistanceDBContext(goal)) o con searches.exact.exact.
+    """
+
+    incremental = False
+
+    def __init__(self, goal: AnyState, directory: Optional[str] = None):
+        super().__init__(goal, GEOMETRY_3X3)
+        b = self.goal.index(0)
+        sym = next(s for s in _SYMMETRIES if s[b] in CANONICAL_BLANKS)
+        self.table = get_table(sym[b], directory)
+        # label[ficha] = ficha de la meta canónica que ocupa la misma celda (tras la simetría)
+        label: Dict[int, int] = {v: self.table.goal[sym[i]] for i, v in enumerate(self.goal)}
+        # Celda destino y re-etiquetado combinados: estado canónico[sym[i]] = label[estado[i]]
+        self._sym = sym
+        self._label = tuple(label[v] for v in range(9))
+        self._parity = solvability_parity(self.goal, GEOMETRY_3X3)
+
+    def to_canonical(self, state: AnyState) -> State:
+        # Lleva un estado al espacio de la meta canónica (simetría + re-etiquetado)
+        out = [0] * 9
+        label = self._label
+        for i, v in enumerate(to_tuple(state)):
+            out[self._sym[i]] = label[v]
+        return tuple(out)
+
+    def h(self, state: AnyState) -> int:
+        # Distancia exacta, o UNREACHABLE si el estado no es resoluble respecto de la meta
+        if solvability_parity(state, GEOMETRY_3X3) != self._parity:
+            return UNREACHABLE
+        return self.table[self.to_canonical(state)]
+
+    def successors(self, state: AnyState, h: int) -> List[Tuple[str, AnyState, int]]:
+        # Los vecinos conservan la paridad de state: se leen de la tabla sin volver a comprobarla
+        table, canon = self.table, self.to_canonical
+        return [(mv, nb, table[canon(nb)]) for mv, nb in GEOMETRY_3X3.neighbors(state)]
+
+
+@lru_cache(maxsize=64)
+def distance_context(goal: AnyState, directory: Optional[str] = None) -> DistanceDBContext:
+    return DistanceDBContext(goal, directory)
+
+
+def exact_distance(start: AnyState, goal: AnyState, directory: Optional[str] = None) -> Optional[int]:
+    # Distancia óptima entre start y goal, o None si el par no es resoluble
+    d = distance_context(to_tuple(goal), directory).h(start)
+    return None if d == UNREACHABLE else d
+
+
+def optimal_path(
+    start: AnyState, goal: AnyState, directory: Optional[str] = None
+) -> Optional[Tuple[List[AnyState], List[str]]]:
+    # Trayectoria óptima por descenso voraz: en cada paso se toma un vecino con distancia d-1
+    ctx = distance_context(to_tuple(goal), directory)
+    d = ctx.h(start)
+    if d == UNREACHABLE:
+        return None
+    path: List[AnyState] = [start]
+    moves: List[str] = []
+    cur = start
+    while d > 0:
+        for mv, nb, d_nb in ctx.successors(cur, d):
+            if d_nb == d - 1:
+                cur, d = nb, d_nb
+                path.append(nb)
+                moves.append(mv)
+                break
+    return path, moves
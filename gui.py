@@ -1,10 +1,18 @@
+import threading
 import tkinter as tk
 from tkinter import filedialog, messagebox, ttk
-from typing import List, Optional
+from tkinter import font as tkfont
+from typing import List, Optional, Sequence
 
 from puzzle import (
+    Budget,
+    Geometry,
+    SearchCancelled,
+    SearchHooks,
+    SearchStats,
+    Solution,
     State,
-    read_puzzle_file,
+    read_board,
     is_solvable,
     manhattan_distance,
     state_to_str,
@@ -13,7 +21,26 @@ from searches.dfs import dfs
 from searches.bpp import bpp
 from searches.hill_climbing import hill_climbing
 from searches.astar import astar
+from searches.idastar import idastar
 from searches.genetic import genetic_simple
+from searches.exact import exact
+from searches.bidirectional import bidirectional_bfs, bidirectional_mm
+
+
+# Cada cuántos nodos generados la búsqueda informa su progreso y revisa la cancelación
+PROGRESS_EVERY = 2000
+# Intervalo de consulta del progreso desde el hilo de la interfaz (ms)
+POLL_MS = 100
+# Pausa entre pasos al animar la trayectoria (ms)
+ANIM_MS = 400
+
+# Heurísticas seleccionables (etiqueta → nombre en puzzle.HEURISTICS)
+HEURISTIC_LABELS = {
+    'Manhattan': 'manhattan',
+    'Fichas fuera de lugar': 'misplaced',
+    'Manhattan + conflicto lineal': 'linear_conflict',
+    'Distancia caminante': 'walking_distance',
+}
 
 
 class Puzzle8GUI:
@@ -23,8 +50,27 @@ class Puzzle8GUI:
 
         self.start_state: Optional[State] = None
         self.goal_state: Optional[State] = None
+        self.start_geom: Optional[Geometry] = None
+        self.goal_geom: Optional[Geometry] = None
+
+        # Estado de la búsqueda en curso (hilo de trabajo)
+        self._worker: Optional[threading.Thread] = None
+        self._cancel_event: Optional[threading.Event] = None
+        self._outcome = None
+        self._progress = (0, 0, 0.0)
+        self._run_info = None
+
+        # Trayectoria mostrada: solo se dibuja la ventana visible de pasos
+        self._path: Sequence[State] = []
+        self._moves: List[str] = []
+        self._path_geom: Optional[Geometry] = None
+        self._path_complete = True
+        self._path_first = 0
+        self._path_pos = 0
+        self._anim_job = None
 
         self._build_ui()
+        root.protocol('WM_DELETE_WINDOW', self._on_close)
 
     def _build_ui(self) -> None:
         frm = ttk.Frame(self.root, padding=10)
@@ -47,7 +93,17 @@ class Puzzle8GUI:
             opt_bar,
             textvariable=self.method_var,
             state='readonly',
-            values=['DFS (Profundidad)', 'BPP (Profundidad)', 'Ascenso de Colina', 'A*', 'Genético (Simple)'],
+            values=[
+                'DFS (Profundidad)',
+                'BPP (Profundidad)',
+                'Ascenso de Colina',
+                'A*',
+                'IDA*',
+                'Genético (Simple)',
+                'Exacta (BD distancias)',
+                'Bidireccional (BFS)',
+                'Bidireccional (MM)',
+            ],
         )
         self.method_combo.grid(row=0, column=1, padx=(0, 12))
         self.method_combo.bind('<<ComboboxSelected>>', self._on_method_change)
@@ -78,10 +134,38 @@ class Puzzle8GUI:
         self.ga_elite_var = tk.StringVar(value='2')
         self.ga_elite_entry = ttk.Entry(opt_bar, textvariable=self.ga_elite_var, width=6)
 
-        ttk.Button(opt_bar, text="Resolver", command=self.solve).grid(row=0, column=12)
+        self.solve_btn = ttk.Button(opt_bar, text="Resolver", command=self.solve)
+        self.solve_btn.grid(row=0, column=12)
+        self.cancel_btn = ttk.Button(opt_bar, text="Cancelar", command=self.cancel, state='disabled')
+        self.cancel_btn.grid(row=0, column=13, padx=(6, 0))
+
+    # Presupuestos (ver puzzle.Budget): al superarlos se muestra el mejor estado alcanzado (vacío = sin límite)
+        budget_bar = ttk.Frame(opt_bar)
+        budget_bar.grid(row=2, column=0, columnspan=12, sticky='w', pady=(6, 0))
+        ttk.Label(budget_bar, text="Máx. nodos:").grid(row=0, column=0, padx=(0, 6))
+        self.nodes_var = tk.StringVar(value='5000000')
+        ttk.Entry(budget_bar, textvariable=self.nodes_var, width=10).grid(row=0, column=1, padx=(0, 12))
+        ttk.Label(budget_bar, text="Memoria máx. (MB):").grid(row=0, column=2, padx=(0, 6))
+        self.mem_var = tk.StringVar(value='1024')
+        ttk.Entry(budget_bar, textvariable=self.mem_var, width=8).grid(row=0, column=3, padx=(0, 12))
+        ttk.Label(budget_bar, text="Tiempo máx. (s):").grid(row=0, column=4, padx=(0, 6))
+        self.time_var = tk.StringVar(value='')
+        ttk.Entry(budget_bar, textvariable=self.time_var, width=8).grid(row=0, column=5, padx=(0, 12))
+
+    # Heurística para los métodos informados (A*, IDA*, Ascenso de Colina, Genético y MM)
+        self.heur_lbl = ttk.Label(opt_bar, text="Heurística:")
+        self.heur_var = tk.StringVar(value='Manhattan')
+        self.heur_combo = ttk.Combobox(
+            opt_bar,
+            textvariable=self.heur_var,
+            state='readonly',
+            values=list(HEURISTIC_LABELS),
+            width=28,
+        )
 
     # Configurar la visibilidad inicial de los parámetros GA
         self._update_ga_params_visibility()
+        self._update_heuristic_visibility()
 
     # Visualización de los tableros
         boards = ttk.Frame(frm)
@@ -106,6 +190,7 @@ class Puzzle8GUI:
             text=(
                 "Nodos generados: 0\n"
                 "Nodos expandidos: 0\n"
+                "Nodos/s: -\n"
                 "Dist. Manhattan (inicial→meta): -\n"
                 "Profundidad de la solución: -"
             ),
@@ -124,16 +209,37 @@ class Puzzle8GUI:
         center.rowconfigure(1, weight=1)
         center.columnconfigure(0, weight=1)
 
+        # Solo se dibujan los pasos que caben en la vista; la barra recorre la trayectoria completa
         self.path_txt = tk.Text(text_frame, height=20, wrap='none')
-        self.v_scroll = ttk.Scrollbar(text_frame, orient='vertical', command=self.path_txt.yview)
-        self.path_txt.configure(yscrollcommand=self.v_scroll.set)
+        self.v_scroll = ttk.Scrollbar(text_frame, orient='vertical', command=self._on_path_scroll)
         self.path_txt.grid(row=0, column=0, sticky='nsew')
         self.v_scroll.grid(row=0, column=1, sticky='ns')
+        self.path_txt.tag_configure('current', background='#dbe9ff')
+        self.path_txt.bind('<Configure>', lambda e: self._render_path())
+        self.path_txt.bind('<MouseWheel>', self._on_path_wheel)
+        self.path_txt.bind('<Button-4>', self._on_path_wheel)
+        self.path_txt.bind('<Button-5>', self._on_path_wheel)
 
         text_frame.rowconfigure(0, weight=1)
         text_frame.columnconfigure(0, weight=1)
         self.path_txt.configure(state='disabled')
 
+    # Reproductor: avanzar/retroceder paso a paso, animación y salto a un paso
+        player = ttk.Frame(center)
+        player.grid(row=2, column=0, sticky='w', pady=(6, 0))
+        ttk.Button(player, text="◀", width=3, command=lambda: self._show_step(self._path_pos - 1)).grid(row=0, column=0)
+        self.play_btn = ttk.Button(player, text="Reproducir", command=self._toggle_animation)
+        self.play_btn.grid(row=0, column=1, padx=4)
+        ttk.Button(player, text="▶", width=3, command=lambda: self._show_step(self._path_pos + 1)).grid(row=0, column=2)
+        ttk.Label(player, text="Ir al paso:").grid(row=0, column=3, padx=(12, 6))
+        self.step_var = tk.StringVar(value='0')
+        step_entry = ttk.Entry(player, textvariable=self.step_var, width=8)
+        step_entry.grid(row=0, column=4)
+        step_entry.bind('<Return>', lambda e: self._jump_to_step())
+        ttk.Button(player, text="Ir", command=self._jump_to_step).grid(row=0, column=5, padx=(4, 0))
+        self.step_count_lbl = ttk.Label(player, text="de 0")
+        self.step_count_lbl.grid(row=0, column=6, padx=(6, 0))
+
     def load_start(self) -> None:
         path = filedialog.askopenfilename(
             title='Seleccione archivo de puzzle inicial',
@@ -142,9 +248,10 @@ class Puzzle8GUI:
         if not path:
             return
         try:
-            st = read_puzzle_file(path)
+            st, geom = read_board(path)
             self.start_state = st
-            self.start_lbl.config(text=f"Inicial:\n{state_to_str(st)}")
+            self.start_geom = geom
+            self.start_lbl.config(text=f"Inicial:\n{state_to_str(st, geom)}")
         except Exception as e:
             messagebox.showerror('Error', f'No se pudo leer el puzzle inicial:\n{e}')
 
@@ -156,18 +263,29 @@ class Puzzle8GUI:
         if not path:
             return
         try:
-            st = read_puzzle_file(path)
+            st, geom = read_board(path)
             self.goal_state = st
-            self.goal_lbl.config(text=f"Meta:\n{state_to_str(st)}")
+            self.goal_geom = geom
+            self.goal_lbl.config(text=f"Meta:\n{state_to_str(st, geom)}")
         except Exception as e:
             messagebox.showerror('Error', f'No se pudo leer el puzzle meta:\n{e}')
 
     def solve(self) -> None:
+        if self._worker is not None:
+            return
         if self.start_state is None or self.goal_state is None:
             messagebox.showwarning('Faltan datos', 'Cargue los puzzles inicial y meta (archivos de texto).')
             return
 
-        if not is_solvable(self.start_state, self.goal_state):
+        if self.start_geom != self.goal_geom:
+            messagebox.showerror(
+                'Tableros distintos',
+                'Los puzzles inicial y meta deben tener las mismas dimensiones.',
+            )
+            return
+        geom = self.start_geom
+
+        if not is_solvable(self.start_state, self.goal_state, geom):
             messagebox.showerror(
                 'No resoluble',
                 'El par (inicial, meta) no es resoluble (paridad distinta de inversiones).',
@@ -175,8 +293,8 @@ class Puzzle8GUI:
             return
 
         method = self.method_var.get()
+        heuristic = HEURISTIC_LABELS[self.heur_var.get()]
         max_depth = None
-        max_nodes = None
         if self.depth_var.get().strip():
             try:
                 max_depth = int(self.depth_var.get().strip())
@@ -186,92 +304,316 @@ class Puzzle8GUI:
                 messagebox.showerror('Parámetro inválido', 'Límite de profundidad debe ser un entero ≥ 0.')
                 return
 
-    # Ejecutar el algoritmo de resolución deseado
+    # Presupuestos de la búsqueda (vacío = sin límite)
         try:
-            if method.startswith('DFS'):
-                sol = dfs(self.start_state, self.goal_state, max_depth=max_depth, max_nodes=max_nodes)
-            elif method.startswith('BPP'):
-                if max_depth is None:
-                    messagebox.showerror('Parámetro requerido', 'Para BPP debe indicar el límite de profundidad (nProf).')
-                    return
-                sol = bpp(self.start_state, self.goal_state, nProf=max_depth, max_nodes=max_nodes)
-            elif method.startswith('Ascenso'):
-                sol = hill_climbing(self.start_state, self.goal_state, max_nodes=max_nodes)
-            elif method == 'A*':
-                sol = astar(self.start_state, self.goal_state)
-            elif method.startswith('Genético'):
-                # Leer parámetros GA
-                try:
-                    pop = int(self.ga_pop_var.get().strip())
-                    length = int(self.ga_len_var.get().strip())
-                    gens = int(self.ga_gen_var.get().strip())
-                    mevery = int(self.ga_mevery_var.get().strip())
-                    elite = int(self.ga_elite_var.get().strip())
-                    if pop <= 0 or length <= 0 or gens <= 0 or mevery < 0 or elite < 0 or elite > pop:
-                        raise ValueError
-                except Exception:
-                    messagebox.showerror('Parámetros GA inválidos', 'Use enteros positivos para Población, Longitud, Generaciones, Mutar cada m (>=0) y Elitismo (0..Población).')
-                    return
-                sol = genetic_simple(
-                    self.start_state,
-                    self.goal_state,
-                    pop_size=pop,
-                    chrom_len=length,
-                    generations=gens,
-                    mutate_every=mevery,
-                    elitism=elite,
-                )
-            else:
-                messagebox.showerror('Método no soportado', f'Método no soportado: {method}')
+            max_nodes = int(self.nodes_var.get().strip()) if self.nodes_var.get().strip() else None
+            max_mem_mb = float(self.mem_var.get().strip()) if self.mem_var.get().strip() else None
+            max_time = float(self.time_var.get().strip()) if self.time_var.get().strip() else None
+            if any(v is not None and v <= 0 for v in (max_nodes, max_mem_mb, max_time)):
+                raise ValueError
+        except Exception:
+            messagebox.showerror('Parámetro inválido', 'Los límites de nodos, memoria y tiempo deben ser números positivos.')
+            return
+
+        start, goal = self.start_state, self.goal_state
+    # Preparar la llamada al algoritmo de resolución deseado (se ejecuta en el hilo de trabajo)
+        if method.startswith('DFS'):
+            call = lambda st, hk, bd: dfs(start, goal, max_depth=max_depth, geom=geom, budget=bd, stats=st, hooks=hk)
+        elif method.startswith('BPP'):
+            if max_depth is None:
+                messagebox.showerror('Parámetro requerido', 'Para BPP debe indicar el límite de profundidad (nProf).')
                 return
-        except Exception as e:
-            messagebox.showerror('Error en búsqueda', str(e))
+            call = lambda st, hk, bd: bpp(start, goal, nProf=max_depth, geom=geom, budget=bd, stats=st, hooks=hk)
+        elif method.startswith('Ascenso'):
+            call = lambda st, hk, bd: hill_climbing(start, goal, geom=geom, heuristic=heuristic, budget=bd, stats=st, hooks=hk)
+        elif method == 'A*':
+            call = lambda st, hk, bd: astar(start, goal, geom=geom, heuristic=heuristic, budget=bd, stats=st, hooks=hk)
+        elif method == 'IDA*':
+            call = lambda st, hk, bd: idastar(start, goal, geom=geom, heuristic=heuristic, budget=bd, stats=st, hooks=hk)
+        elif method == 'Bidireccional (BFS)':
+            call = lambda st, hk, bd: bidirectional_bfs(start, goal, geom=geom, budget=bd, stats=st, hooks=hk)
+        elif method == 'Bidireccional (MM)':
+            call = lambda st, hk, bd: bidirectional_mm(start, goal, geom=geom, heuristic=heuristic, budget=bd, stats=st, hooks=hk)
+        elif method.startswith('Exacta'):
+            call = lambda st, hk, bd: exact(start, goal, geom=geom, budget=bd, stats=st, hooks=hk)
+        elif method.startswith('Genético'):
+            # Leer parámetros GA
+            try:
+                pop = int(self.ga_pop_var.get().strip())
+                length = int(self.ga_len_var.get().strip())
+                gens = int(self.ga_gen_var.get().strip())
+                mevery = int(self.ga_mevery_var.get().strip())
+                elite = int(self.ga_elite_var.get().strip())
+                if pop <= 0 or length <= 0 or gens <= 0 or mevery < 0 or elite < 0 or elite > pop:
+                    raise ValueError
+            except Exception:
+                messagebox.showerror('Parámetros GA inválidos', 'Use enteros positivos para Población, Longitud, Generaciones, Mutar cada m (>=0) y Elitismo (0..Población).')
+                return
+            call = lambda st, hk, bd: genetic_simple(
+                start,
+                goal,
+                pop_size=pop,
+                chrom_len=length,
+                generations=gens,
+                mutate_every=mevery,
+                elitism=elite,
+                geom=geom,
+                heuristic=heuristic,
+                budget=bd,
+                stats=st,
+                hooks=hk,
+            )
+        else:
+            messagebox.showerror('Método no soportado', f'Método no soportado: {method}')
             return
 
+        self._start_worker(call, method, geom, max_nodes, None if max_mem_mb is None else int(max_mem_mb * 2**20), max_time)
+
+    def _start_worker(
+        self, call, method: str, geom: Geometry, max_nodes: Optional[int], max_memory: Optional[int], max_time: Optional[float]
+    ) -> None:
+        # Ejecuta la búsqueda en un hilo; el hilo principal solo consulta el progreso con root.after
+        stats = SearchStats()
+        cancel = threading.Event()
+
+        def on_progress(st: SearchStats) -> None:
+            # Se llama desde el hilo de trabajo cada PROGRESS_EVERY nodos generados
+            self._progress = (st.nodes_generated, st.nodes_expanded, st.wall_time)
+            if cancel.is_set():
+                raise SearchCancelled('Búsqueda cancelada por el usuario.')
+
+        hooks = SearchHooks(on_progress=on_progress, every=PROGRESS_EVERY)
+
+        def work() -> None:
+            try:
+                budget = None
+                if max_nodes is not None or max_memory is not None or max_time is not None:
+                    budget = Budget(time_limit=max_time, max_nodes=max_nodes, max_memory=max_memory)
+                self._outcome = ('ok', call(stats, hooks, budget))
+            except SearchCancelled as e:
+                self._outcome = ('cancel', str(e))
+            except Exception as e:
+                self._outcome = ('error', str(e))
+
+        self._cancel_event = cancel
+        self._outcome = None
+        self._progress = (0, 0, 0.0)
+        self._run_info = (method, geom, stats)
+        self._worker = threading.Thread(target=work, daemon=True)
+        self.solve_btn.config(state='disabled')
+        self.cancel_btn.config(state='normal')
+        self._worker.start()
+        self.root.after(POLL_MS, self._poll_worker)
+
+    def cancel(self) -> None:
+        if self._cancel_event is not None:
+            self._cancel_event.set()
+
+    def _poll_worker(self) -> None:
+        # Muestra el progreso mientras el hilo sigue vivo; al terminar, muestra el resultado
+        if self._worker is not None and self._worker.is_alive():
+            generated, expanded, elapsed = self._progress
+            rate = generated / elapsed if elapsed > 0 else 0.0
+            self.stats_lbl.config(
+                text=(
+                    f"Nodos generados: {generated}\n"
+                    f"Nodos expandidos: {expanded}\n"
+                    f"Nodos/s: {rate:,.0f}\n"
+                    f"Resolviendo... {elapsed:.1f} s"
+                )
+            )
+            self.root.after(POLL_MS, self._poll_worker)
+            return
+        self._worker = None
+        self._cancel_event = None
+        self.solve_btn.config(state='normal')
+        self.cancel_btn.config(state='disabled')
+        method, geom, stats = self._run_info
+        kind, value = self._outcome
+        if kind == 'error':
+            messagebox.showerror('Error en búsqueda', value)
+            return
+        self._show_result(method, geom, stats, value if kind == 'ok' else None, value if kind == 'cancel' else None)
+
+    def _show_result(
+        self, method: str, geom: Geometry, stats: SearchStats, sol: Optional[Solution], stopped: Optional[str]
+    ) -> None:
     # La distancia Manhattan en las estadísticas solo aplica para métodos heurísticos
         mdist_text = (
-            'no aplica' if (method.startswith('DFS') or method.startswith('BPP')) else str(manhattan_distance(self.start_state, self.goal_state))
+            'no aplica' if (method.startswith('DFS') or method.startswith('BPP')) else str(manhattan_distance(self.start_state, self.goal_state, geom))
         )
+        rate = stats.nodes_generated / stats.wall_time if stats.wall_time > 0 else 0.0
 
         if sol is None:
             self.stats_lbl.config(
                 text=(
-                    f"Nodos generados: -\n"
-                    f"Nodos expandidos: -\n"
+                    f"Nodos generados: {stats.nodes_generated}\n"
+                    f"Nodos expandidos: {stats.nodes_expanded}\n"
+                    f"Nodos/s: {rate:,.0f} ({stats.wall_time:.2f} s)\n"
                     f"Dist. Manhattan (inicial → meta): {mdist_text}\n"
                     f"Profundidad de la solución: -"
                 )
             )
-            self._set_path([self.start_state], [])
-            messagebox.showinfo('Resultado', 'Fracaso: no se encontró solución.')
+            self._set_path([self.start_state], [], geom)
+            if stopped is not None:
+                messagebox.showinfo('Búsqueda detenida', stopped)
+            else:
+                messagebox.showinfo('Resultado', 'Fracaso: no se encontró solución.')
             return
 
         self.stats_lbl.config(
             text=(
                 f"Nodos generados: {sol.nodes_generated}\n"
                 f"Nodos expandidos: {sol.nodes_expanded}\n"
+                f"Nodos/s: {rate:,.0f} ({stats.wall_time:.2f} s)\n"
+            )
+            + (
                 f"Dist. Manhattan (inicial→meta): {mdist_text}\n"
-                f"Profundidad de la solución: {len(sol.moves)}"
+                f"Profundidad de la solución: {sol.depth}"
+                if sol.complete
+                else f"Mejor estado alcanzado: h = {sol.best_h} a {sol.depth} movimientos"
             )
         )
-        self._set_path(sol.path, sol.moves)
-        messagebox.showinfo('Resultado', f"Éxito: solución encontrada en {len(sol.moves)} movimientos.")
-
-    def _set_path(self, path: List[State], moves: List[str]) -> None:
+        self._set_path(sol.path, sol.moves, geom, sol.complete)
+        if not sol.complete:
+            messagebox.showinfo(
+                'Presupuesto agotado',
+                f"{sol.message}\nSe muestra el mejor estado alcanzado (h = {sol.best_h}, {sol.depth} movimientos).",
+            )
+            return
+        messagebox.showinfo('Resultado', f"Éxito: solución encontrada en {sol.depth} movimientos.")
+
+    def _set_path(self, path: Sequence[State], moves: List[str], geom: Optional[Geometry] = None, complete: bool = True) -> None:
+        # Guarda la trayectoria (sin copiarla; la de una solución se calcula solo en los pasos que se
+        # dibujan) y muestra el primer tramo; el costo no depende de su largo.
+        # complete=False: la trayectoria termina en el mejor estado de una búsqueda que agotó su presupuesto
+        self._stop_animation()
+        self._path = path
+        self._moves = moves
+        self._path_complete = complete
+        self._path_geom = geom
+        self._path_first = 0
+        self._path_pos = 0
+        self.step_var.set('0')
+        self.step_count_lbl.config(text=f"de {len(path) - 1}")
+        self._render_path()
+
+    def _step_title(self, i: int) -> str:
+        if i == 0:
+            return f"Paso {i}: Estado inicial"
+        if i == len(self._path) - 1:
+            return f"Paso {i}: Estado final - solución" if self._path_complete else f"Paso {i}: Mejor estado alcanzado"
+        return f"Paso {i}: {self._moves[i-1]}"
+
+    def _visible_steps(self) -> int:
+        # Pasos que caben en la altura actual del texto (título + filas del tablero + línea en blanco)
+        rows = self._path_geom.rows if self._path_geom is not None else 3
+        height = self.path_txt.winfo_height()
+        if height <= 1:
+            lines = int(self.path_txt.cget('height'))
+        else:
+            lines = height // tkfont.nametofont(self.path_txt.cget('font')).metrics('linespace')
+        return max(1, lines // (rows + 2)) + 1
+
+    def _render_path(self) -> None:
+        # Dibuja únicamente la ventana [primer paso, primer paso + visibles) y ajusta la barra
+        n = len(self._path)
+        visible = self._visible_steps()
+        self._path_first = max(0, min(self._path_first, n - visible + 1))
+        last = min(n, self._path_first + visible)
         self.path_txt.configure(state='normal')
         self.path_txt.delete('1.0', tk.END)
-        for i, st in enumerate(path):
-            if i == 0:
-                step_title = f"Paso {i}: Estado inicial"
-            elif i == len(path) - 1:
-                step_title = f"Paso {i}: Estado final - solución"
-            else:
-                step_title = f"Paso {i}: {moves[i-1]}"
-            self.path_txt.insert(tk.END, f"{step_title}\n{state_to_str(st)}\n\n")
+        for i in range(self._path_first, last):
+            begin = self.path_txt.index('end-1c')
+            self.path_txt.insert(tk.END, f"{self._step_title(i)}\n{state_to_str(self._path[i], self._path_geom)}\n\n")
+            if i == self._path_pos:
+                self.path_txt.tag_add('current', begin, self.path_txt.index('end-2c'))
         self.path_txt.configure(state='disabled')
+        if n:
+            self.v_scroll.set(self._path_first / n, last / n)
+        else:
+            self.v_scroll.set(0.0, 1.0)
+
+    def _scroll_path_to(self, first: int) -> None:
+        self._path_first = max(0, first)
+        self._render_path()
+
+    def _on_path_scroll(self, *args) -> None:
+        # Comandos de la barra de desplazamiento: ('moveto', fracción) o ('scroll', n, 'units'/'pages')
+        if args[0] == 'moveto':
+            self._scroll_path_to(int(float(args[1]) * len(self._path)))
+        elif args[0] == 'scroll':
+            step = int(args[1]) * (self._visible_steps() - 1 if args[2] == 'pages' else 1)
+            self._scroll_path_to(self._path_first + step)
+
+    def _on_path_wheel(self, event) -> str:
+        if event.num == 4 or event.delta > 0:
+            self._scroll_path_to(self._path_first - 1)
+        else:
+            self._scroll_path_to(self._path_first + 1)
+        return 'break'
+
+    def _show_step(self, i: int) -> None:
+        # Marca el paso i y desplaza la vista lo mínimo para que quede visible
+        if not self._path:
+            return
+        i = max(0, min(i, len(self._path) - 1))
+        self._path_pos = i
+        self.step_var.set(str(i))
+        visible = self._visible_steps() - 1
+        if i < self._path_first:
+            self._path_first = i
+        elif i >= self._path_first + visible:
+            self._path_first = i - visible + 1
+        self._render_path()
+
+    def _jump_to_step(self) -> None:
+        try:
+            i = int(self.step_var.get().strip())
+            if i < 0 or i >= len(self._path):
+                raise ValueError
+        except Exception:
+            messagebox.showerror('Paso inválido', f'Indique un paso entre 0 y {max(0, len(self._path) - 1)}.')
+            return
+        self._stop_animation()
+        self._show_step(i)
+
+    def _toggle_animation(self) -> None:
+        if self._anim_job is not None:
+            self._stop_animation()
+            return
+        if self._path_pos >= len(self._path) - 1:
+            self._show_step(0)
+        self.play_btn.config(text="Pausa")
+        self._anim_job = self.root.after(ANIM_MS, self._animate_step)
+
+    def _animate_step(self) -> None:
+        self._show_step(self._path_pos + 1)
+        if self._path_pos >= len(self._path) - 1:
+            self._anim_job = None
+            self.play_btn.config(text="Reproducir")
+        else:
+            self._anim_job = self.root.after(ANIM_MS, self._animate_step)
+
+    def _stop_animation(self) -> None:
+        if self._anim_job is not None:
+            self.root.after_cancel(self._anim_job)
+            self._anim_job = None
+        self.play_btn.config(text="Reproducir")
 
     def _on_method_change(self, event=None):
         self._update_ga_params_visibility()
+        self._update_heuristic_visibility()
+
+    def _update_heuristic_visibility(self):
+        method = self.method_var.get()
+        show = method in ('A*', 'IDA*', 'Ascenso de Colina', 'Genético (Simple)', 'Bidireccional (MM)')
+        if show:
+            self.heur_lbl.grid(row=1, column=0, padx=(0, 6), pady=(6, 0), sticky='w')
+            self.heur_combo.grid(row=1, column=1, columnspan=3, padx=(0, 12), pady=(6, 0), sticky='w')
+        else:
+            self.heur_lbl.grid_remove()
+            self.heur_combo.grid_remove()
 
     def _update_ga_params_visibility(self):
         method = self.method_var.get()
@@ -297,3 +639,8 @@ class Puzzle8GUI:
                 self.ga_elite_lbl, self.ga_elite_entry,
             ]:
                 w.grid_remove()
+
+    def _on_close(self) -> None:
+        # Detiene la búsqueda en curso (si la hay) antes de cerrar la ventana
+        self.cancel()
+        self.root.destroy()
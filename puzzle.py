@@ -1,116 +1,1299 @@
-from typing import List, Tuple, Optional, Dict
+import os
+import struct
+import sys
+import time
+import tracemalloc
+from array import array
+from collections.abc import Sequence
+from functools import lru_cache
+from itertools import islice
+from math import isqrt
+from typing import Any, Callable, Generator, Iterator, List, Tuple, Optional, Dict, Type, Union
 
-State = Tuple[int, ...]  # Tupla de longitud 9 que representa el tablero, 0 indica el espacio vacío
+State = Tuple[int, ...]  # Tupla de longitud filas*columnas que representa el tablero, 0 indica el espacio vacío
+# Codificación compacta opcional: un entero con tile_bits bits por ficha (celda i en los bits
+# i*tile_bits..) y el índice del espacio vacío guardado encima de las fichas para no tener que buscarlo.
+PackedState = int
+AnyState = Union[State, PackedState]
 
+# Código numérico de cada movimiento, para guardar los movimientos de muchos nodos en un bytearray,
+# y su letra para guardarlos como texto (ver encode_moves)
+MOVE_NAMES: Tuple[str, ...] = ('Arriba', 'Abajo', 'Derecha', 'Izquierda')
+MOVE_INDEX: Dict[str, int] = {m: i for i, m in enumerate(MOVE_NAMES)}
+MOVE_LETTERS = 'UDRL'
 
-def read_puzzle_file(path: str) -> State:
-    # Lee un archivo de texto y retorna el estado del puzzle como una tupla de 9 enteros
+
+class Geometry:
+    """
+    Dimensiones de un tablero deslizante de filas x columnas (3x3 para el puzzle-8, 4x4 para el
+    15-puzzle, 5x5 para el 24-puzzle o tableros rectangulares).
+    Guarda la tabla de movimientos por posición del vacío y los parámetros de la codificación empaquetada.
+    """
+
+    def __init__(self, rows: int, cols: int):
+        if rows < 2 or cols < 2:
+            raise ValueError(f"El tablero debe tener al menos 2 filas y 2 columnas: {rows}x{cols}")
+        self.rows = rows
+        self.cols = cols
+        self.size = rows * cols
+        self.tile_bits = max(4, (self.size - 1).bit_length())
+        self.tile_mask = (1 << self.tile_bits) - 1
+        self.blank_shift = self.size * self.tile_bits
+        self.clear_blank = ~(self.tile_mask << self.blank_shift)
+        self.moves = self._move_table()
+        # Para cada posición del vacío y código de movimiento: celda con la que se intercambia (-1 = inválido)
+        self.move_cells = tuple(
+            tuple(next((j for m, j in options if m == name), -1) for name in MOVE_NAMES) for options in self.moves
+        )
+
+    def _move_table(self) -> Tuple[Tuple[Tuple[str, int], ...], ...]:
+        # Para cada posición del vacío: movimientos posibles como (movimiento, celda con la que se intercambia)
+        rows, cols = self.rows, self.cols
+        table: List[Tuple[Tuple[str, int], ...]] = []
+        for idx in range(self.size):
+            r, c = divmod(idx, cols)
+            moves: List[Tuple[str, int]] = []
+            # Orden: Arriba, Abajo, Derecha, Izquierda
+            if r > 0:
+                moves.append(('Arriba', idx - cols))
+            if r < rows - 1:
+                moves.append(('Abajo', idx + cols))
+            if c < cols - 1:
+                moves.append(('Derecha', idx + 1))
+            if c > 0:
+                moves.append(('Izquierda', idx - 1))
+            table.append(tuple(moves))
+        return tuple(table)
+
+    @property
+    def goal(self) -> State:
+        # Meta convencional: fichas 1..n-1 en orden de lectura y el vacío al final
+        return tuple(range(1, self.size)) + (0,)
+
+    def encode(self, state: State) -> PackedState:
+        # Empaqueta una tupla de fichas en un entero (tile_bits bits por ficha + índice del vacío)
+        bits = self.tile_bits
+        packed = 0
+        for i, v in enumerate(state):
+            packed |= v << (i * bits)
+        return packed | (state.index(0) << self.blank_shift)
+
+    def decode(self, packed: PackedState) -> State:
+        # Desempaqueta un entero generado por encode a la tupla de fichas
+        bits, mask = self.tile_bits, self.tile_mask
+        return tuple((packed >> (i * bits)) & mask for i in range(self.size))
+
+    def neighbors(self, state: AnyState) -> List[Tuple[str, AnyState]]:
+        # Retorna los estados vecinos posibles a partir de un estado dado (en su misma representación)
+        if isinstance(state, int):
+            # Mueve la ficha j al hueco idx con operaciones de bits
+            bits, mask = self.tile_bits, self.tile_mask
+            idx = state >> self.blank_shift
+            base = state & self.clear_blank
+            packed_nbrs: List[Tuple[str, AnyState]] = []
+            for move, j in self.moves[idx]:
+                shift = j * bits
+                tile = (base >> shift) & mask
+                nb = (base & ~(mask << shift)) | (tile << (idx * bits)) | (j << self.blank_shift)
+                packed_nbrs.append((move, nb))
+            return packed_nbrs
+        idx = state.index(0)
+        nbrs: List[Tuple[str, AnyState]] = []
+        for move, j in self.moves[idx]:
+            lst = list(state)
+            lst[idx], lst[j] = lst[j], lst[idx]
+            nbrs.append((move, tuple(lst)))
+        return nbrs
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, Geometry) and (self.rows, self.cols) == (other.rows, other.cols)
+
+    def __hash__(self) -> int:
+        return hash((self.rows, self.cols))
+
+    def __reduce__(self) -> Tuple[Callable[..., 'Geometry'], Tuple[int, int]]:
+        # Al serializar (pickle, procesos) solo viajan las dimensiones; las tablas se reconstruyen
+        return geometry, (self.rows, self.cols)
+
+    def __repr__(self) -> str:
+        return f"Geometry({self.rows}, {self.cols})"
+
+
+@lru_cache(maxsize=None)
+def geometry(rows: int, cols: Optional[int] = None) -> Geometry:
+    # Geometría compartida de filas x columnas (cuadrada si no se indican las columnas)
+    return Geometry(rows, rows if cols is None else cols)
+
+
+GEOMETRY_3X3 = geometry(3)
+
+
+def parse_geometry(text: str) -> Geometry:
+    # Geometría a partir de un texto 'FxC' (p. ej. 4x4, 3x4) o de un solo número para tableros cuadrados
+    rows, _, cols = text.lower().partition('x')
+    try:
+        r, c = int(rows), int(cols or rows)
+    except ValueError:
+        raise ValueError(f"Dimensiones inválidas: {text} (use FxC, p. ej. 4x4).")
+    return geometry(r, c)
+
+
+def resolve_geometry(state: AnyState, geom: Optional[Geometry] = None, ctx: Optional['GoalContext'] = None) -> Geometry:
+    # Geometría explícita, o la del contexto, o deducida del estado (tablero cuadrado; 3x3 si está empaquetado)
+    if geom is not None:
+        return geom
+    if ctx is not None:
+        return ctx.geom
+    if isinstance(state, int):
+        return GEOMETRY_3X3
+    side = isqrt(len(state))
+    if side * side != len(state):
+        raise ValueError(f"No se puede deducir la geometría de un tablero de {len(state)} celdas; indique geom.")
+    return geometry(side)
+
+
+def read_board(path: str, packed: bool = False, geom: Optional[Geometry] = None) -> Tuple[AnyState, Geometry]:
+    """
+    Lee un archivo de texto con una fila del tablero por línea y retorna (estado, geometría).
+    Sin geom, la geometría se deduce de las filas del archivo (o de la cantidad de números si
+    forman un cuadrado); con geom, se leen exactamente geom.size números.
+    """
+    rows: List[List[int]] = []
     numbers: List[int] = []
     with open(path, 'r', encoding='utf-8') as f:
         for line in f:
             line = line.strip()
             if not line:
                 continue
-            parts = line.split()
-            for p in parts:
-                if p.strip():
-                    numbers.append(int(p))
-            if len(numbers) >= 9:
+            row = [int(p) for p in line.split() if p.strip()]
+            rows.append(row)
+            numbers.extend(row)
+            if geom is not None and len(numbers) >= geom.size:
                 break
-    if len(numbers) != 9:
-        raise ValueError("El archivo debe contener exactamente 9 números (0..8).")
-    if set(numbers) != set(range(9)):
-        raise ValueError("El archivo debe contener los dígitos 0..8 sin repetir.")
-    return tuple(numbers)
+    if geom is None:
+        if len(rows) >= 2 and len(rows[0]) >= 2 and all(len(r) == len(rows[0]) for r in rows):
+            geom = geometry(len(rows), len(rows[0]))
+        else:
+            side = isqrt(len(numbers))
+            if side < 2 or side * side != len(numbers):
+                raise ValueError("El archivo debe contener una fila del tablero por línea, todas del mismo largo.")
+            geom = geometry(side)
+    n = geom.size
+    if len(numbers) != n:
+        raise ValueError(f"El archivo debe contener exactamente {n} números (0..{n - 1}).")
+    if set(numbers) != set(range(n)):
+        raise ValueError(f"El archivo debe contener los números 0..{n - 1} sin repetir.")
+    state = tuple(numbers)
+    return (geom.encode(state) if packed else state), geom
+
+
+def read_puzzle_file(path: str, packed: bool = False, geom: Optional[Geometry] = None) -> AnyState:
+    # Lee un archivo de texto y retorna el estado del puzzle como una tupla de enteros (o empaquetado si packed=True)
+    return read_board(path, packed, geom)[0]
+
+
+def encode_state(state: State, geom: Optional[Geometry] = None) -> PackedState:
+    # Empaqueta una tupla de fichas en un entero (ver Geometry.encode)
+    return resolve_geometry(state, geom).encode(state)
+
+
+def decode_state(packed: PackedState, geom: Optional[Geometry] = None) -> State:
+    # Desempaqueta un entero generado por encode_state (3x3 si no se indica la geometría)
+    return (geom or GEOMETRY_3X3).decode(packed)
+
+
+def to_tuple(state: AnyState, geom: Optional[Geometry] = None) -> State:
+    # Retorna el estado como tupla, sin importar su representación
+    return decode_state(state, geom) if isinstance(state, int) else state
+
+
+def like(state: AnyState, reference: AnyState, geom: Optional[Geometry] = None) -> AnyState:
+    # Convierte state a la misma representación (tupla o empaquetada) que reference
+    if isinstance(reference, int):
+        return state if isinstance(state, int) else encode_state(state, geom)
+    return to_tuple(state, geom)
+
+
+def neighbors(state: AnyState, geom: Optional[Geometry] = None) -> List[Tuple[str, AnyState]]:
+    # Retorna los estados vecinos posibles a partir de un estado dado (en su misma representación)
+    return resolve_geometry(state, geom).neighbors(state)
+
+
+class GoalContext:
+    """
+    Tablas precalculadas para una meta: la tabla de movimientos por posición del vacío y la
+    distancia Manhattan de cada ficha a su celda meta desde cada celda (dist[ficha][celda]).
+    Permite actualizar la heurística de un sucesor en O(1) a partir de la del padre.
+    """
+
+    # True si la h de un sucesor puede obtenerse con move_delta (las subclases con otra heurística lo desactivan)
+    incremental = True
+
+    def __init__(self, goal: AnyState, geom: Optional[Geometry] = None):
+        self.geom = resolve_geometry(goal, geom)
+        self.goal: State = to_tuple(goal, self.geom)
+        if len(self.goal) != self.geom.size:
+            raise ValueError(f"La meta no corresponde a un tablero {self.geom.rows}x{self.geom.cols}.")
+        self.moves = self.geom.moves
+        size, cols = self.geom.size, self.geom.cols
+        pos_goal = [0] * size
+        for i, v in enumerate(self.goal):
+            pos_goal[v] = i
+        dist: List[Tuple[int, ...]] = []
+        for tile in range(size):
+            gr, gc = divmod(pos_goal[tile], cols)
+            # El vacío no aporta a la heurística
+            dist.append(tuple(0 if tile == 0 else abs(i // cols - gr) + abs(i % cols - gc) for i in range(size)))
+        self.dist = tuple(dist)
+
+    def h(self, state: AnyState) -> int:
+        # Distancia Manhattan completa del estado a la meta
+        dist = self.dist
+        if isinstance(state, int):
+            bits, mask = self.geom.tile_bits, self.geom.tile_mask
+            return sum(dist[(state >> (i * bits)) & mask][i] for i in range(self.geom.size))
+        return sum(dist[v][i] for i, v in enumerate(state))
+
+    def move_delta(self, tile: int, src: int, dst: int) -> int:
+        # Cambio de la heurística al mover la ficha tile de la celda src a la celda dst
+        d = self.dist[tile]
+        return d[dst] - d[src]
+
+    def successors(self, state: AnyState, h: int) -> List[Tuple[str, AnyState, int]]:
+        # Vecinos como (movimiento, estado, h) con h actualizada solo con la ficha que se mueve
+        dist = self.dist
+        out: List[Tuple[str, AnyState, int]] = []
+        if isinstance(state, int):
+            geom = self.geom
+            bits, mask, blank_shift = geom.tile_bits, geom.tile_mask, geom.blank_shift
+            idx = state >> blank_shift
+            base = state & geom.clear_blank
+            for move, j in self.moves[idx]:
+                shift = j * bits
+                tile = (base >> shift) & mask
+                nb = (base & ~(mask << shift)) | (tile << (idx * bits)) | (j << blank_shift)
+                d = dist[tile]
+                out.append((move, nb, h - d[j] + d[idx]))
+            return out
+        idx = state.index(0)
+        for move, j in self.moves[idx]:
+            tile = state[j]
+            lst = list(state)
+            lst[idx], lst[j] = tile, 0
+            d = dist[tile]
+            out.append((move, tuple(lst), h - d[j] + d[idx]))
+        return out
+
+
+class MisplacedTilesContext(GoalContext):
+    """
+    Heurística de fichas fuera de lugar: cuenta las fichas (sin el vacío) que no están en su celda meta.
+    Reutiliza la maquinaria incremental de GoalContext con una tabla 0/1 en lugar de distancias.
+    """
+
+    def __init__(self, goal: AnyState, geom: Optional[Geometry] = None):
+        super().__init__(goal, geom)
+        size = self.geom.size
+        self.dist = tuple(
+            tuple(0 if tile == 0 or i == self.goal.index(tile) else 1 for i in range(size)) for tile in range(size)
+        )
+
+
+class LinearConflictContext(GoalContext):
+    """
+    Manhattan más conflictos lineales: si en una fila (o columna) hay fichas que pertenecen a esa
+    misma fila en la meta pero en orden invertido, al menos una debe salir de la línea y volver,
+    lo que suma 2 movimientos por ficha a retirar. Por línea se retira el mínimo de fichas que deja
+    las restantes en orden (longitud menos la subsecuencia creciente más larga).
+    La penalización de cada contenido de línea se memoriza por meta; al mover una ficha solo
+    cambian las dos líneas que atraviesa, por lo que los sucesores se actualizan de forma incremental.
+    """
 
+    # La h de un sucesor no depende solo de la ficha movida (ver successors)
+    incremental = False
 
-def manhattan_distance(state: State, goal: State) -> int:
+    def __init__(self, goal: AnyState, geom: Optional[Geometry] = None):
+        super().__init__(goal, geom)
+        rows, cols, size = self.geom.rows, self.geom.cols, self.geom.size
+        goal_row = [0] * size
+        goal_col = [0] * size
+        for i, v in enumerate(self.goal):
+            goal_row[v], goal_col[v] = divmod(i, cols)
+        # Líneas: (celdas, línea meta de cada ficha, coordenada de orden de cada ficha); primero filas, luego columnas
+        lines: List[Tuple[Tuple[int, ...], List[int], List[int]]] = []
+        for r in range(rows):
+            lines.append((tuple(range(r * cols, (r + 1) * cols)), goal_row, goal_col))
+        for c in range(cols):
+            lines.append((tuple(range(c, size, cols)), goal_col, goal_row))
+        self._lines = lines
+        # affected[vacío, celda de la ficha]: líneas cuyo contenido cambia con ese movimiento
+        affected: Dict[Tuple[int, int], Tuple[int, ...]] = {}
+        for idx in range(size):
+            for _, j in self.moves[idx]:
+                if idx // cols == j // cols:  # Movimiento horizontal: cambian las dos columnas
+                    affected[idx, j] = (rows + idx % cols, rows + j % cols)
+                else:  # Movimiento vertical: cambian las dos filas
+                    affected[idx, j] = (idx // cols, j // cols)
+        self._affected = affected
+        self._memo: Dict[Tuple[int, State], int] = {}
+
+    def _penalty(self, k: int, cells: State) -> int:
+        # Penalización (2 por ficha a retirar) de la línea k con el contenido actual del tablero
+        line_cells, line_of, order_of = self._lines[k]
+        content = tuple(cells[i] for i in line_cells)
+        key = (k, content)
+        p = self._memo.get(key)
+        if p is None:
+            target = k if k < self.geom.rows else k - self.geom.rows
+            seq = [order_of[v] for v in content if v != 0 and line_of[v] == target]
+            # Subsecuencia creciente más larga (las líneas son cortas, basta O(n²))
+            best = [1] * len(seq)
+            for a in range(len(seq)):
+                for b in range(a):
+                    if seq[b] < seq[a] and best[b] + 1 > best[a]:
+                        best[a] = best[b] + 1
+            p = 2 * (len(seq) - max(best, default=0))
+            self._memo[key] = p
+        return p
+
+    def h(self, state: AnyState) -> int:
+        cells = to_tuple(state, self.geom)
+        return super().h(cells) + sum(self._penalty(k, cells) for k in range(len(self._lines)))
+
+    def successors(self, state: AnyState, h: int) -> List[Tuple[str, AnyState, int]]:
+        # Manhattan incremental (GoalContext) más el cambio de penalización de las dos líneas afectadas
+        cells = to_tuple(state, self.geom)
+        idx = cells.index(0)
+        out: List[Tuple[str, AnyState, int]] = []
+        for (move, nb, h_nb), (_, j) in zip(super().successors(state, h), self.moves[idx]):
+            lst = list(cells)
+            lst[idx], lst[j] = lst[j], 0
+            after = tuple(lst)
+            for k in self._affected[idx, j]:
+                h_nb += self._penalty(k, after) - self._penalty(k, cells)
+            out.append((move, nb, h_nb))
+        return out
+
+
+@lru_cache(maxsize=None)
+def _walking_table(lines: int, width: int, blank_line: int) -> Dict[Tuple[Tuple[int, ...], int], int]:
+    """
+    Tabla de distancia caminante (walking distance, Takahashi) en una dirección: el estado abstracto
+    es la matriz count[línea][línea meta] con la cantidad de fichas de cada línea que pertenecen a
+    cada línea meta, más la línea del vacío. Un movimiento lleva una ficha de una línea adyacente a
+    la línea del vacío. Se construye por BFS desde la meta y depende solo de las dimensiones y de la
+    línea del vacío en la meta, por lo que se comparte entre metas.
+    """
+    counts = [0] * (lines * lines)
+    for r in range(lines):
+        counts[r * lines + r] = width - (1 if r == blank_line else 0)
+    start = (tuple(counts), blank_line)
+    table: Dict[Tuple[Tuple[int, ...], int], int] = {start: 0}
+    frontier = [start]
+    depth = 0
+    while frontier:
+        depth += 1
+        nxt = []
+        for cnt, b in frontier:
+            for src in (b - 1, b + 1):
+                if not 0 <= src < lines:
+                    continue
+                for g in range(lines):
+                    if cnt[src * lines + g] == 0:
+                        continue
+                    lst = list(cnt)
+                    lst[src * lines + g] -= 1
+                    lst[b * lines + g] += 1
+                    key = (tuple(lst), src)
+                    if key not in table:
+                        table[key] = depth
+                        nxt.append(key)
+        frontier = nxt
+    return table
+
+
+class WalkingDistanceContext(GoalContext):
+    """
+    Distancia caminante: suma de la distancia vertical y horizontal en las tablas abstractas de
+    _walking_table. Domina a Manhattan porque considera que las fichas de una misma línea se
+    estorban al pasar por el vacío. Las tablas se construyen una vez por dimensiones (4x4: ~25 000
+    estados por dirección); en tableros de 5x5 o mayores la construcción puede tardar.
+    """
+
+    incremental = False
+
+    def __init__(self, goal: AnyState, geom: Optional[Geometry] = None):
+        super().__init__(goal, geom)
+        rows, cols = self.geom.rows, self.geom.cols
+        self._goal_row = [0] * self.geom.size
+        self._goal_col = [0] * self.geom.size
+        for i, v in enumerate(self.goal):
+            self._goal_row[v], self._goal_col[v] = divmod(i, cols)
+        b_row, b_col = divmod(self.goal.index(0), cols)
+        self._vertical = _walking_table(rows, cols, b_row)
+        self._horizontal = _walking_table(cols, rows, b_col)
+
+    def h(self, state: AnyState) -> int:
+        rows, cols = self.geom.rows, self.geom.cols
+        v_count = [0] * (rows * rows)
+        h_count = [0] * (cols * cols)
+        blank = 0
+        for i, v in enumerate(to_tuple(state, self.geom)):
+            if v == 0:
+                blank = i
+                continue
+            r, c = divmod(i, cols)
+            v_count[r * rows + self._goal_row[v]] += 1
+            h_count[c * cols + self._goal_col[v]] += 1
+        return (self._vertical[tuple(v_count), blank // cols]
+                + self._horizontal[tuple(h_count), blank % cols])
+
+    def successors(self, state: AnyState, h: int) -> List[Tuple[str, AnyState, int]]:
+        return [(mv, nb, self.h(nb)) for mv, nb in self.geom.neighbors(state)]
+
+
+# Registro de heurísticas: nombre → clase de contexto de meta (todas admisibles)
+HEURISTICS: Dict[str, Type[GoalContext]] = {
+    'manhattan': GoalContext,
+    'misplaced': MisplacedTilesContext,
+    'linear_conflict': LinearConflictContext,
+    'walking_distance': WalkingDistanceContext,
+}
+DEFAULT_HEURISTIC = 'manhattan'
+
+
+def heuristic_class(name: str) -> Type[GoalContext]:
+    if name not in HEURISTICS:
+        raise ValueError(f"Heurística no soportada: {name} (use {', '.join(HEURISTICS)}).")
+    return HEURISTICS[name]
+
+
+@lru_cache(maxsize=64)
+def _cached_context(goal: AnyState, geom: Geometry, heuristic: str = DEFAULT_HEURISTIC) -> GoalContext:
+    return heuristic_class(heuristic)(goal, geom)
+
+
+def goal_context(
+    goal: AnyState,
+    ctx: Optional[GoalContext] = None,
+    geom: Optional[Geometry] = None,
+    heuristic: Optional[str] = None,
+) -> GoalContext:
+    # Retorna ctx si se proporcionó (validando que sea de la misma meta) o el contexto en caché de la
+    # meta con la heurística pedida (Manhattan por defecto)
+    if ctx is None:
+        return _cached_context(goal, resolve_geometry(goal, geom), heuristic or DEFAULT_HEURISTIC)
+    if heuristic is not None and type(ctx) is not heuristic_class(heuristic):
+        raise ValueError(f"El contexto proporcionado no usa la heurística '{heuristic}'.")
+    if geom is not None and geom != ctx.geom:
+        raise ValueError("El contexto proporcionado corresponde a otra geometría.")
+    if ctx.goal != to_tuple(goal, ctx.geom):
+        raise ValueError("El contexto proporcionado corresponde a otra meta.")
+    return ctx
+
+
+def manhattan_distance(state: AnyState, goal: AnyState, geom: Optional[Geometry] = None) -> int:
     # Calcula la distancia Manhattan entre dos estados del puzzle
-    pos_goal: Dict[int, Tuple[int, int]] = {v: (i // 3, i % 3) for i, v in enumerate(goal)}
-    dist = 0
-    for i, v in enumerate(state):
-        if v == 0:
-            continue
-        r, c = i // 3, i % 3
-        gr, gc = pos_goal[v]
-        dist += abs(r - gr) + abs(c - gc)
-    return dist
-
-
-def is_solvable(start: State, goal: State) -> bool:
-    # Determina si el estado inicial puede llegar al estado meta (paridad de inversiones)
-    def inversions(arr: List[int]) -> int:
-        a = [x for x in arr if x != 0]
-        inv = 0
-        for i in range(len(a)):
-            for j in range(i + 1, len(a)):
-                if a[i] > a[j]:
-                    inv += 1
-        return inv
-
-    return inversions(list(start)) % 2 == inversions(list(goal)) % 2
-
-
-def neighbors(state: State) -> List[Tuple[str, State]]:
-    # Retorna los estados vecinos posibles a partir de un estado dado
-    idx = state.index(0)
-    r, c = divmod(idx, 3)
-    nbrs: List[Tuple[str, State]] = []
-
-    def swap(pos_r: int, pos_c: int, move: str):
-        j = pos_r * 3 + pos_c
-        lst = list(state)
-        lst[idx], lst[j] = lst[j], lst[idx]
-        nbrs.append((move, tuple(lst)))
-
-    # Orden: Arriba, Abajo, Derecha, Izquierda
-    if r > 0:
-        swap(r - 1, c, 'Arriba')
-    if r < 2:
-        swap(r + 1, c, 'Abajo')
-    if c < 2:
-        swap(r, c + 1, 'Derecha')
-    if c > 0:
-        swap(r, c - 1, 'Izquierda')
-
-    return nbrs
-
-
-def state_to_str(state: State) -> str:
+    return goal_context(goal, geom=geom).h(state)
+
+
+def solvability_parity(state: AnyState, geom: Optional[Geometry] = None) -> int:
+    """
+    Paridad que conservan todos los movimientos: la de las inversiones entre fichas (sin el vacío),
+    más la fila del vacío si el ancho es par (cada movimiento vertical cambia ambas).
+    Se calcula en O(n) con los ciclos de la permutación: sus inversiones totales tienen la paridad de
+    n - ciclos, y el vacío (el menor valor) aporta una inversión por cada celda anterior a la suya.
+    """
+    geom = resolve_geometry(state, geom)
+    state = to_tuple(state, geom)
+    n = len(state)
+    seen = bytearray(n)
+    cycles = 0
+    for i in range(n):
+        if not seen[i]:
+            cycles += 1
+            j = i
+            while not seen[j]:
+                seen[j] = 1
+                j = state[j]
+    blank = state.index(0)
+    parity = (n - cycles + blank) % 2
+    if geom.cols % 2 == 0:
+        parity ^= (blank // geom.cols) % 2
+    return parity
+
+
+def is_solvable(start: AnyState, goal: AnyState, geom: Optional[Geometry] = None) -> bool:
+    """
+    Determina si el estado inicial puede llegar al estado meta.
+    Con ancho impar basta comparar la paridad de inversiones; con ancho par cada movimiento vertical
+    cambia la paridad de inversiones y la fila del vacío, así que se compara la paridad de su suma
+    (ver solvability_parity; para muchos estados a la vez, validation.check_states).
+    """
+    geom = resolve_geometry(start, geom)
+    return solvability_parity(start, geom) == solvability_parity(goal, geom)
+
+
+def state_to_str(state: AnyState, geom: Optional[Geometry] = None) -> str:
     # Convierte un estado del puzzle a una cadena de texto legible
+    geom = resolve_geometry(state, geom)
+    state = to_tuple(state, geom)
+    width = len(str(geom.size - 1))
     rows = []
-    for r in range(3):
-        row = state[r*3:(r+1)*3]
-        rows.append(' '.join('_' if x == 0 else str(x) for x in row))
+    for r in range(geom.rows):
+        row = state[r*geom.cols:(r+1)*geom.cols]
+        rows.append(' '.join(('_' if x == 0 else str(x)).rjust(width) for x in row))
     return '\n'.join(rows)
 
 
+# Umbral de progreso cuando no hay on_progress: nunca se alcanza
+NO_TICK = sys.maxsize
+
+
+class SearchStats:
+    """
+    Estadísticas de una ejecución de búsqueda, exitosa o no: tiempo real y de CPU, nodos generados
+    y expandidos, tamaño máximo de la frontera (ABIERTO) y del conjunto de cerrados, re-expansiones
+    (estados expandidos más de una vez), duplicados (sucesores descartados por estar ya vistos),
+    aciertos y fallos de la caché interna del algoritmo si la tiene (p. ej. la de prefijos del
+    genético) y, con trace_memory=True, el pico de memoria medido con tracemalloc (en bytes).
+    Para obtenerlas también cuando el algoritmo fracasa (retorna None), se pasa un objeto propio en
+    el parámetro stats; si no, cada Solution trae el suyo en solution.stats.
+    """
+
+    def __init__(self, trace_memory: bool = False):
+        self.trace_memory = trace_memory
+        self.wall_time = 0.0
+        self.cpu_time = 0.0
+        self.nodes_generated = 0
+        self.nodes_expanded = 0
+        self.peak_frontier = 0
+        self.peak_closed = 0
+        self.reexpansions = 0
+        self.duplicate_hits = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.peak_memory: Optional[int] = None
+        self._t0 = 0.0
+        self._c0 = 0.0
+        self._own_trace = False
+
+    def begin(self) -> 'SearchStats':
+        # Reinicia los contadores y arranca los relojes (y tracemalloc si se pidió)
+        self.__init__(self.trace_memory)
+        if self.trace_memory:
+            if tracemalloc.is_tracing():
+                tracemalloc.reset_peak()
+            else:
+                tracemalloc.start()
+                self._own_trace = True
+        self._t0 = time.perf_counter()
+        self._c0 = time.process_time()
+        return self
+
+    def finish(
+        self,
+        nodes_generated: int,
+        nodes_expanded: int,
+        peak_frontier: int = 0,
+        peak_closed: int = 0,
+        reexpansions: int = 0,
+        duplicate_hits: int = 0,
+        cache_hits: int = 0,
+        cache_misses: int = 0,
+    ) -> 'SearchStats':
+        # Vuelca los contadores locales del algoritmo y detiene los relojes
+        self.wall_time = time.perf_counter() - self._t0
+        self.cpu_time = time.process_time() - self._c0
+        self.nodes_generated = nodes_generated
+        self.nodes_expanded = nodes_expanded
+        self.peak_frontier = max(self.peak_frontier, peak_frontier)
+        self.peak_closed = max(self.peak_closed, peak_closed)
+        self.reexpansions = reexpansions
+        self.duplicate_hits = duplicate_hits
+        self.cache_hits = cache_hits
+        self.cache_misses = cache_misses
+        if self.trace_memory and tracemalloc.is_tracing():
+            self.peak_memory = tracemalloc.get_traced_memory()[1]
+            if self._own_trace:
+                tracemalloc.stop()
+                self._own_trace = False
+        return self
+
+    def progress(
+        self, hooks: 'SearchHooks', nodes_generated: int, nodes_expanded: int, frontier: int = 0, closed: int = 0
+    ) -> int:
+        # Actualiza los contadores parciales, llama a on_progress y retorna el próximo umbral
+        self.wall_time = time.perf_counter() - self._t0
+        self.nodes_generated = nodes_generated
+        self.nodes_expanded = nodes_expanded
+        self.peak_frontier = max(self.peak_frontier, frontier)
+        self.peak_closed = max(self.peak_closed, closed)
+        hooks.on_progress(self)
+        return nodes_generated + hooks.every
+
+    @property
+    def cache_hit_rate(self) -> float:
+        total = self.cache_hits + self.cache_misses
+        return self.cache_hits / total if total else 0.0
+
+    def as_dict(self) -> Dict[str, Union[int, float, None]]:
+        return {
+            'wall_time': self.wall_time,
+            'cpu_time': self.cpu_time,
+            'nodes_generated': self.nodes_generated,
+            'nodes_expanded': self.nodes_expanded,
+            'peak_frontier': self.peak_frontier,
+            'peak_closed': self.peak_closed,
+            'reexpansions': self.reexpansions,
+            'duplicate_hits': self.duplicate_hits,
+            'cache_hits': self.cache_hits,
+            'cache_misses': self.cache_misses,
+            'cache_hit_rate': self.cache_hit_rate,
+            'peak_memory': self.peak_memory,
+        }
+
+
+class SearchHooks:
+    """
+    Callbacks opcionales de instrumentación, comunes a todos los algoritmos de searches/:
+    - on_expand(estado, g): al expandir un estado (g = profundidad o costo desde el inicio)
+    - on_generate(estado, g): al generar cada sucesor
+    - on_progress(stats): cada every nodos generados, con stats parcialmente actualizado
+    Sin hooks (o con callbacks en None) el costo por nodo es una comparación.
+    """
+
+    def __init__(
+        self,
+        on_expand: Optional[Callable[[AnyState, int], None]] = None,
+        on_generate: Optional[Callable[[AnyState, int], None]] = None,
+        on_progress: Optional[Callable[[SearchStats], None]] = None,
+        every: int = 10000,
+    ):
+        self.on_expand = on_expand
+        self.on_generate = on_generate
+        self.on_progress = on_progress
+        self.every = every
+
+
+class SearchCancelled(Exception):
+    """
+    Lanzada desde un hook (normalmente on_progress) para detener una búsqueda en curso: por
+    cancelación del usuario o por agotar un presupuesto. Las estadísticas quedan completas.
+    """
+
+
+def process_memory() -> Optional[int]:
+    """
+    Memoria residente actual del proceso en bytes (aproximada), o None si la plataforma no
+    permite consultarla. Es barata: se puede llamar cada pocos miles de nodos.
+    """
+    try:
+        if sys.platform.startswith('linux'):
+            with open('/proc/self/statm', 'r') as f:
+                return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+        if sys.platform == 'win32':
+            import ctypes
+            from ctypes import wintypes
+
+            class _Counters(ctypes.Structure):
+                _fields_ = [
+                    ('cb', wintypes.DWORD),
+                    ('PageFaultCount', wintypes.DWORD),
+                    ('PeakWorkingSetSize', ctypes.c_size_t),
+                    ('WorkingSetSize', ctypes.c_size_t),
+                    ('QuotaPeakPagedPoolUsage', ctypes.c_size_t),
+                    ('QuotaPagedPoolUsage', ctypes.c_size_t),
+                    ('QuotaPeakNonPagedPoolUsage', ctypes.c_size_t),
+                    ('QuotaNonPagedPoolUsage', ctypes.c_size_t),
+                    ('PagefileUsage', ctypes.c_size_t),
+                    ('PeakPagefileUsage', ctypes.c_size_t),
+                ]
+
+            counters = _Counters()
+            counters.cb = ctypes.sizeof(counters)
+            handle = ctypes.windll.kernel32.GetCurrentProcess()
+            if ctypes.windll.psapi.GetProcessMemoryInfo(handle, ctypes.byref(counters), counters.cb):
+                return counters.WorkingSetSize
+            return None
+        import resource
+        # Otros Unix: ru_maxrss es el pico (no el valor actual), en bytes en macOS y en KiB en el resto
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * (1 if sys.platform == 'darwin' else 1024)
+    except (OSError, ValueError, AttributeError, ImportError):
+        return None
+
+
+class BudgetExhausted(SearchCancelled):
+    """
+    Lanzada al agotarse un límite de Budget; reason es 'time', 'nodes' o 'memory'. Los algoritmos
+    de searches/ la capturan y retornan un PartialSolution con el mejor progreso alcanzado.
+    """
+
+    def __init__(self, reason: str, message: str):
+        super().__init__(message)
+        self.reason = reason
+
+
+class Budget:
+    """
+    Presupuesto común a todos los algoritmos de searches/ (parámetro budget): plazo en segundos,
+    máximo de nodos generados y memoria máxima aproximada, medida como el crecimiento de la memoria
+    del proceso desde que empieza la búsqueda (ver process_memory), que es sobre todo la de ABIERTO
+    y CERRADO. Cualquier límite en None no se controla.
+    El plazo corre desde que se crea el objeto (o es el instante deadline de time.perf_counter): un
+    mismo Budget pasado a varias búsquedas acota la latencia total; los nodos y la memoria se
+    cuentan por búsqueda.
+    Se revisa en los avisos de progreso (ver SearchHooks), a lo sumo cada check_every nodos
+    generados y justo al superar max_nodes, así que sin presupuesto no hay costo adicional. Al
+    agotarse, la búsqueda retorna un PartialSolution en lugar de None.
+    """
+
+    def __init__(
+        self,
+        time_limit: Optional[float] = None,
+        max_nodes: Optional[int] = None,
+        max_memory: Optional[int] = None,
+        deadline: Optional[float] = None,
+        check_every: int = 1000,
+    ):
+        if (time_limit is not None and time_limit < 0) or (max_nodes is not None and max_nodes < 0):
+            raise ValueError("time_limit y max_nodes no pueden ser negativos.")
+        if (max_memory is not None and max_memory <= 0) or check_every <= 0:
+            raise ValueError("max_memory y check_every deben ser positivos.")
+        if deadline is None and time_limit is not None:
+            deadline = time.perf_counter() + time_limit
+        self.deadline = deadline
+        self.max_nodes = max_nodes
+        self.max_memory = max_memory
+        self.check_every = check_every
+
+    def remaining(self) -> Optional[float]:
+        # Segundos que quedan hasta el plazo (None si no hay plazo)
+        return None if self.deadline is None else max(0.0, self.deadline - time.perf_counter())
+
+    def check(self, nodes_generated: int, memory_base: Optional[int] = None) -> None:
+        # Lanza BudgetExhausted si algún límite se superó (la memoria, respecto de memory_base)
+        if self.deadline is not None and time.perf_counter() >= self.deadline:
+            raise BudgetExhausted('time', 'Se agotó el tiempo de la búsqueda.')
+        if self.max_nodes is not None and nodes_generated > self.max_nodes:
+            raise BudgetExhausted('nodes', f'Se alcanzó el límite de {self.max_nodes} nodos generados.')
+        if self.max_memory is not None and memory_base is not None:
+            mem = process_memory()
+            if mem is not None and mem - memory_base > self.max_memory:
+                raise BudgetExhausted('memory', f'Se alcanzó el límite de memoria ({(mem - memory_base) / 2**20:.0f} MB).')
+
+    def hooks(self, hooks: Optional[SearchHooks] = None) -> SearchHooks:
+        # Hooks de una búsqueda que además controlan el presupuesto (los de hooks se siguen llamando)
+        return _BudgetHooks(self, hooks)
+
+
+class _BudgetHooks(SearchHooks):
+    # on_progress revisa el presupuesto y llama al on_progress original con su propia frecuencia;
+    # every se ajusta en cada aviso para que el siguiente llegue al próximo control pendiente
+
+    def __init__(self, budget: Budget, hooks: Optional[SearchHooks]):
+        inner = hooks if hooks is not None else SearchHooks()
+        super().__init__(inner.on_expand, inner.on_generate, self._on_progress, budget.check_every)
+        self._budget = budget
+        self._inner = inner
+        self._memory_base = process_memory() if budget.max_memory is not None else None
+        self._next_inner = inner.every if inner.on_progress is not None and inner.every > 0 else NO_TICK
+        self._schedule(0)
+
+    def _schedule(self, nodes_generated: int) -> None:
+        target = min(nodes_generated + self._budget.check_every, self._next_inner)
+        if self._budget.max_nodes is not None:
+            target = min(target, self._budget.max_nodes + 1)
+        self.every = max(1, target - nodes_generated)
+
+    def _on_progress(self, stats: SearchStats) -> None:
+        nodes_generated = stats.nodes_generated
+        self._budget.check(nodes_generated, self._memory_base)
+        if nodes_generated >= self._next_inner:
+            self._inner.on_progress(stats)
+            self._next_inner = nodes_generated + self._inner.every
+        self._schedule(nodes_generated)
+
+
+def budget_hooks(hooks: Optional[SearchHooks], budget: Optional[Budget]) -> Optional[SearchHooks]:
+    # Los hooks de la búsqueda con el control del presupuesto, o los mismos si no hay presupuesto
+    return hooks if budget is None else budget.hooks(hooks)
+
+
+def begin_search(stats: Optional[SearchStats] = None) -> SearchStats:
+    # Estadísticas de la ejecución (las del llamador o nuevas) con los relojes en marcha
+    return (stats if stats is not None else SearchStats()).begin()
+
+
+def hook_callbacks(
+    hooks: Optional[SearchHooks],
+) -> Tuple[Optional[Callable[[AnyState, int], None]], Optional[Callable[[AnyState, int], None]], int]:
+    # (on_expand, on_generate, primer umbral de progreso) listos para guardarse en variables locales
+    if hooks is None:
+        return None, None, NO_TICK
+    tick = hooks.every if hooks.on_progress is not None and hooks.every > 0 else NO_TICK
+    return hooks.on_expand, hooks.on_generate, tick
+
+
+# Movimientos del camino guardados entre dos puntos de control de SolutionPath
+_CHECKPOINT = 64
+
+# Conversión de códigos de movimiento a letras y viceversa (ver encode_moves)
+_TO_LETTERS = bytes.maketrans(bytes(range(len(MOVE_LETTERS))), MOVE_LETTERS.encode('ascii'))
+_FROM_LETTERS = bytes.maketrans(MOVE_LETTERS.encode('ascii'), bytes(range(len(MOVE_LETTERS))))
+
+# Formato binario de una Solution (ver Solution.to_bytes): versión, opciones (1 = inicio empaquetado,
+# 2 = parcial), filas, columnas, nodos generados, nodos expandidos y número de movimientos; le siguen
+# las fichas del inicio (un byte por celda), los datos del resultado parcial si corresponde y los
+# movimientos a 2 bits cada uno
+_FORMAT_VERSION = 1
+_HEADER = struct.Struct('<BBBBQQI')
+_PARTIAL = struct.Struct('<iBH')
+_REASONS = ('time', 'nodes', 'memory')
+_UNPACK = [bytes((b & 3, (b >> 2) & 3, (b >> 4) & 3, b >> 6)) for b in range(256)]
+
+
+def encode_moves(codes: Union[bytes, bytearray]) -> str:
+    # Códigos de movimiento como texto, una letra de MOVE_LETTERS por movimiento
+    return bytes(codes).translate(_TO_LETTERS).decode('ascii')
+
+
+def decode_moves(text: str) -> bytes:
+    # Inversa de encode_moves
+    if set(text) - set(MOVE_LETTERS):
+        raise ValueError(f"Movimientos inválidos: use solo las letras {MOVE_LETTERS}.")
+    return text.encode('ascii').translate(_FROM_LETTERS)
+
+
+class SolutionPath(Sequence):
+    """
+    Trayectoria de estados de una Solution (desde el inicial) sin guardarla completa. Al iterarla se
+    aplican los movimientos uno a uno; path[i] parte del punto de control más cercano (se guarda un
+    estado cada _CHECKPOINT movimientos, calculados en el primer acceso por índice) y aplica a lo sumo
+    _CHECKPOINT - 1 movimientos. list(path) la materializa.
+    """
+
+    def __init__(self, start: AnyState, codes: bytes, geom: Geometry):
+        self.start = start
+        self.codes = codes
+        self.geom = geom
+        self._checkpoints: Optional[List[AnyState]] = None
+
+    def __len__(self) -> int:
+        return len(self.codes) + 1
+
+    def __iter__(self) -> Iterator[AnyState]:
+        return walk_codes(self.start, self.codes, self.geom)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[k] for k in range(*i.indices(len(self)))]
+        n = len(self)
+        if i < 0:
+            i += n
+        if not 0 <= i < n:
+            raise IndexError("Índice fuera de la trayectoria.")
+        if self._checkpoints is None:
+            self._checkpoints = list(islice(walk_codes(self.start, self.codes, self.geom), 0, None, _CHECKPOINT))
+        base = i - i % _CHECKPOINT
+        st = self._checkpoints[base // _CHECKPOINT]
+        for st in walk_codes(st, self.codes[base:i], self.geom):
+            pass
+        return st
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, (list, tuple, SolutionPath)):
+            return NotImplemented
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+
+    def __repr__(self) -> str:
+        return f"SolutionPath({len(self)} estados)"
+
+
 class Solution:
-    def __init__(self, path: List[State], moves: List[str], nodes_generated: int, nodes_expanded: int):
-        # Representa una solución encontrada por los algoritmos de búsqueda
-        self.path = path
-        self.moves = moves
+    """
+    Solución encontrada por un algoritmo de búsqueda. Solo se guardan el estado inicial (start) y los
+    movimientos del vacío como códigos de un byte (codes, ver MOVE_NAMES). moves (los nombres) se arma
+    al pedirlo y path es una SolutionPath que reconstruye los estados a demanda; depth es el número de
+    movimientos. moves puede darse como nombres o como códigos.
+    to_bytes / from_bytes y as_dict / from_dict la serializan en forma compacta (2 bits por movimiento
+    en binario, una letra de MOVE_LETTERS en JSON), sin las estadísticas.
+    cached: True si la solución se obtuvo de una caché.SolutionCache en lugar de buscarla.
+    island: en el genético de islas, el índice de la isla que encontró la solución (None en otro caso).
+    iterations: en IDA*, la lista de (cota, nodos expandidos) de cada iteración (None en otro caso).
+    """
+
+    # Las búsquedas que agotan su presupuesto retornan un PartialSolution (complete = False)
+    complete = True
+
+    def __init__(
+        self,
+        start: AnyState,
+        moves: Union[Sequence[str], bytes, bytearray],
+        nodes_generated: int,
+        nodes_expanded: int,
+        stats: Optional[SearchStats] = None,
+        geom: Optional[Geometry] = None,
+    ):
+        self.start = start
+        self.geom = resolve_geometry(start, geom)
+        self.codes = bytes(moves) if isinstance(moves, (bytes, bytearray)) else bytes(map(MOVE_INDEX.__getitem__, moves))
         self.nodes_generated = nodes_generated
         self.nodes_expanded = nodes_expanded
+        if stats is None:
+            stats = SearchStats()
+            stats.nodes_generated = nodes_generated
+            stats.nodes_expanded = nodes_expanded
+        self.stats = stats
+        self.cached = False
+        self.island: Optional[int] = None
+        self.iterations: Optional[List[Tuple[int, int]]] = None
+        self._path: Optional[SolutionPath] = None
+
+    @property
+    def moves(self) -> List[str]:
+        return [MOVE_NAMES[c] for c in self.codes]
+
+    @property
+    def depth(self) -> int:
+        return len(self.codes)
+
+    @property
+    def path(self) -> SolutionPath:
+        if self._path is None:
+            self._path = SolutionPath(self.start, self.codes, self.geom)
+        return self._path
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Los puntos de control del camino no se copian a otros procesos
+        state = dict(self.__dict__)
+        state['_path'] = None
+        return state
+
+    def to_bytes(self) -> bytes:
+        # Forma binaria compacta (ver _HEADER): unos 30 bytes más un byte cada 4 movimientos
+        geom = self.geom
+        if geom.size > 256:
+            raise ValueError("El formato binario admite tableros de hasta 256 celdas.")
+        flags = (1 if isinstance(self.start, int) else 0) | (0 if self.complete else 2)
+        n = len(self.codes)
+        parts = [
+            _HEADER.pack(_FORMAT_VERSION, flags, geom.rows, geom.cols, self.nodes_generated, self.nodes_expanded, n),
+            bytes(to_tuple(self.start, geom)),
+        ]
+        if not self.complete:
+            message = self.message.encode('utf-8')
+            parts.append(_PARTIAL.pack(self.best_h, _REASONS.index(self.reason), len(message)) + message)
+        c = self.codes + bytes(-n % 4)
+        parts.append(bytes(c[i] | (c[i + 1] << 2) | (c[i + 2] << 4) | (c[i + 3] << 6) for i in range(0, len(c), 4)))
+        return b''.join(parts)
+
+    @staticmethod
+    def from_bytes(data: bytes) -> 'Solution':
+        # Inversa de to_bytes (retorna un PartialSolution si la solución era parcial)
+        try:
+            version, flags, rows, cols, nodes_generated, nodes_expanded, n = _HEADER.unpack_from(data)
+            if version != _FORMAT_VERSION:
+                raise ValueError(f"Versión de formato no soportada: {version}.")
+            geom = geometry(rows, cols)
+            pos = _HEADER.size + geom.size
+            start: AnyState = tuple(data[_HEADER.size:pos])
+            if flags & 2:
+                best_h, reason, length = _PARTIAL.unpack_from(data, pos)
+                pos += _PARTIAL.size
+                message = data[pos:pos + length].decode('utf-8')
+                pos += length
+                reason = _REASONS[reason]
+        except (struct.error, IndexError, UnicodeDecodeError):
+            raise ValueError("Datos de solución incompletos o corruptos.")
+        if len(data) != pos + (n + 3) // 4:
+            raise ValueError("Datos de solución incompletos o corruptos.")
+        if flags & 1:
+            start = geom.encode(start)
+        codes = b''.join([_UNPACK[b] for b in data[pos:pos + (n + 3) // 4]])[:n]
+        if flags & 2:
+            return PartialSolution(start, codes, best_h, reason, message, nodes_generated, nodes_expanded, geom=geom)
+        return Solution(start, codes, nodes_generated, nodes_expanded, geom=geom)
+
+    def as_dict(self) -> Dict[str, Any]:
+        # Forma JSON: dimensiones, fichas del inicio, movimientos como letras y contadores de nodos
+        data: Dict[str, Any] = {
+            'rows': self.geom.rows,
+            'cols': self.geom.cols,
+            'start': list(to_tuple(self.start, self.geom)),
+            'packed': isinstance(self.start, int),
+            'moves': encode_moves(self.codes),
+            'nodes_generated': self.nodes_generated,
+            'nodes_expanded': self.nodes_expanded,
+            'complete': self.complete,
+        }
+        if not self.complete:
+            data.update(best_h=self.best_h, reason=self.reason, message=self.message)
+        return data
+
+    @staticmethod
+    def from_dict(data: Dict[str, Any]) -> 'Solution':
+        # Inversa de as_dict
+        geom = geometry(data['rows'], data['cols'])
+        start: AnyState = tuple(data['start'])
+        if data.get('packed'):
+            start = geom.encode(start)
+        codes = decode_moves(data['moves'])
+        if not data.get('complete', True):
+            return PartialSolution(
+                start, codes, data['best_h'], data['reason'], data['message'], data['nodes_generated'], data['nodes_expanded'], geom=geom
+            )
+        return Solution(start, codes, data['nodes_generated'], data['nodes_expanded'], geom=geom)
+
+
+class PartialSolution(Solution):
+    """
+    Resultado de una búsqueda que agotó su presupuesto (ver Budget): el mejor progreso alcanzado,
+    es decir el estado de menor heurística entre los expandidos (best_h; Manhattan en los métodos no
+    informados), con path y moves desde el inicio hasta él. reason ('time', 'nodes' o 'memory') y
+    message indican qué límite se agotó. complete es False (True en Solution).
+    """
+
+    complete = False
+
+    def __init__(
+        self,
+        start: AnyState,
+        moves: Union[Sequence[str], bytes, bytearray],
+        best_h: int,
+        reason: str,
+        message: str,
+        nodes_generated: int,
+        nodes_expanded: int,
+        stats: Optional[SearchStats] = None,
+        geom: Optional[Geometry] = None,
+    ):
+        super().__init__(start, moves, nodes_generated, nodes_expanded, stats, geom)
+        self.best_h = best_h
+        self.reason = reason
+        self.message = message
+
+
+def partial_solution(
+    exhausted: BudgetExhausted,
+    start: AnyState,
+    moves: Union[Sequence[str], bytes, bytearray],
+    best_h: int,
+    nodes_generated: int,
+    nodes_expanded: int,
+    stats: Optional[SearchStats] = None,
+    geom: Optional[Geometry] = None,
+) -> PartialSolution:
+    # PartialSolution de start según moves (nombres o códigos), omitiendo los movimientos inválidos
+    geom = resolve_geometry(start, geom)
+    cells = geom.move_cells
+    blank = start >> geom.blank_shift if isinstance(start, int) else start.index(0)
+    kept = bytearray()
+    for c in (moves if isinstance(moves, (bytes, bytearray)) else map(MOVE_INDEX.__getitem__, moves)):
+        j = cells[blank][c]
+        if j >= 0:
+            kept.append(c)
+            blank = j
+    return PartialSolution(start, kept, best_h, exhausted.reason, str(exhausted), nodes_generated, nodes_expanded, stats, geom)
+
+
+# Forma incremental de un algoritmo: generador que se suspende en cada aviso de progreso (ver
+# SearchHooks) y retorna, como valor de StopIteration, el resultado de la versión normal
+SearchSteps = Generator[None, None, Optional[Solution]]
+
+
+def run_steps(steps: SearchSteps) -> Optional[Solution]:
+    # Ejecuta hasta el final la forma incremental de un algoritmo y retorna su resultado
+    while True:
+        try:
+            next(steps)
+        except StopIteration as stop:
+            return stop.value
+
+
+class SearchEvent:
+    """
+    Aviso de search_events. kind es 'slice' al completarse un tramo de slice_nodes nodos generados y
+    'solution' al terminar la búsqueda, con solution (Solution, PartialSolution o None).
+    nodes_generated / nodes_expanded son los totales al momento del aviso; stats es el objeto de
+    estadísticas de la búsqueda, que sigue cambiando (es el final en el último aviso). Con
+    record=True, expanded y generated traen los pares (estado, g) expandidos y generados desde el
+    aviso anterior.
+    """
+
+    def __init__(
+        self,
+        kind: str,
+        stats: SearchStats,
+        expanded: List[Tuple[AnyState, int]],
+        generated: List[Tuple[AnyState, int]],
+        solution: Optional[Solution] = None,
+    ):
+        self.kind = kind
+        self.nodes_generated = stats.nodes_generated
+        self.nodes_expanded = stats.nodes_expanded
+        self.stats = stats
+        self.expanded = expanded
+        self.generated = generated
+        self.solution = solution
+
+
+class _SliceHooks(SearchHooks):
+    # Un aviso de progreso al menos cada slice_nodes nodos generados (due marca el fin del tramo), el
+    # on_progress original con su propia frecuencia y, con record, los estados del tramo
+
+    def __init__(self, hooks: Optional[SearchHooks], slice_nodes: int, record: bool):
+        inner = hooks if hooks is not None else SearchHooks()
+        self.expanded: List[Tuple[AnyState, int]] = []
+        self.generated: List[Tuple[AnyState, int]] = []
+        on_expand, on_generate = inner.on_expand, inner.on_generate
+        if record:
+            on_expand = _recorder(self.expanded, on_expand)
+            on_generate = _recorder(self.generated, on_generate)
+        super().__init__(on_expand, on_generate, self._on_progress, slice_nodes)
+        self.due = False
+        self._slice = slice_nodes
+        self._next_slice = slice_nodes
+        self._inner = inner
+        self._next_inner = inner.every if inner.on_progress is not None and inner.every > 0 else NO_TICK
+
+    def _on_progress(self, stats: SearchStats) -> None:
+        nodes_generated = stats.nodes_generated
+        if nodes_generated >= self._next_inner:
+            self._inner.on_progress(stats)
+            self._next_inner = nodes_generated + self._inner.every
+        if nodes_generated >= self._next_slice:
+            self.due = True
+            self._next_slice = nodes_generated + self._slice
+        self.every = max(1, min(self._next_slice, self._next_inner) - nodes_generated)
+
+    def event(self, kind: str, stats: SearchStats, solution: Optional[Solution] = None) -> SearchEvent:
+        # Aviso con los estados registrados desde el anterior
+        expanded, generated = self.expanded[:], self.generated[:]
+        self.expanded.clear()
+        self.generated.clear()
+        return SearchEvent(kind, stats, expanded, generated, solution)
 
 
-def apply_move(state: State, move: str) -> State:
+def _recorder(
+    events: List[Tuple[AnyState, int]], callback: Optional[Callable[[AnyState, int], None]]
+) -> Callable[[AnyState, int], None]:
+    # Callback que guarda (estado, g) en events y luego llama a callback, si hay
+    if callback is None:
+        return lambda state, g: events.append((state, g))
+
+    def record(state: AnyState, g: int) -> None:
+        events.append((state, g))
+        callback(state, g)
+
+    return record
+
+
+def search_events(
+    steps: Callable[..., SearchSteps],
+    start: AnyState,
+    goal: AnyState,
+    slice_nodes: int = 1000,
+    record: bool = False,
+    stats: Optional[SearchStats] = None,
+    hooks: Optional[SearchHooks] = None,
+    **params: Any,
+) -> Iterator[SearchEvent]:
+    """
+    Ejecuta por tramos la forma incremental de un algoritmo (p. ej. searches.astar.astar_steps u
+    otra de searches.registry.STEPS) con sus parámetros params. Se detiene al cabo de cada tramo de
+    unos slice_nodes nodos generados (los métodos que generan por lotes, como los genéticos, se
+    detienen entre lotes) y entrega un SearchEvent 'slice'. Al terminar entrega un 'solution'.
+    Entre un aviso y el siguiente la búsqueda queda en pausa: sirve para intercalar varias búsquedas
+    en un mismo hilo (o en un bucle de asyncio), pausarlas y reanudarlas, o dibujar su avance sin
+    hilos. El tiempo real de stats incluye las pausas. Cerrar el iterador detiene la búsqueda.
+    record: guarda en cada aviso los estados expandidos y generados del tramo (on_expand /
+    on_generate); tiene costo por nodo.
+    """
+    if slice_nodes <= 0:
+        raise ValueError("slice_nodes debe ser un entero positivo.")
+    stats = stats if stats is not None else SearchStats()
+    slicer = _SliceHooks(hooks, slice_nodes, record)
+    gen = steps(start, goal, stats=stats, hooks=slicer, **params)
+    try:
+        while True:
+            try:
+                next(gen)
+            except StopIteration as stop:
+                yield slicer.event('solution', stats, stop.value)
+                return
+            if slicer.due:
+                slicer.due = False
+                yield slicer.event('slice', stats)
+    finally:
+        gen.close()
+
+
+def trace_codes(parents: array, codes: bytearray, idx: int) -> bytearray:
+    """
+    Códigos de los movimientos desde la raíz hasta el nodo idx siguiendo los arreglos paralelos de
+    padres (-1 en la raíz) y códigos de movimiento (ver MOVE_NAMES).
+    """
+    out = bytearray()
+    while parents[idx] >= 0:
+        out.append(codes[idx])
+        idx = parents[idx]
+    out.reverse()
+    return out
+
+
+def trace_moves(parents: array, codes: bytearray, idx: int) -> List[str]:
+    # Como trace_codes, con los nombres de los movimientos
+    return [MOVE_NAMES[c] for c in trace_codes(parents, codes, idx)]
+
+
+def apply_move(state: AnyState, move: str, geom: Optional[Geometry] = None) -> AnyState:
     """
     Aplica un movimiento a un estado si es válido; si no, retorna el mismo estado.
     """
-    for mv, st in neighbors(state):
+    for mv, st in neighbors(state, geom):
         if mv == move:
             return st
     return state
 
 
-def apply_moves(state: State, moves: List[str]) -> Tuple[State, List[State]]:
+def walk_codes(state: AnyState, codes: Union[bytes, bytearray], geom: Optional[Geometry] = None) -> Iterator[AnyState]:
     """
-    Aplica una secuencia de movimientos, retornando el estado final y la trayectoria de estados (incluyendo el inicial).
+    Genera la trayectoria de estados (el inicial y uno por movimiento) al aplicar los códigos de
+    movimiento codes; un movimiento inválido deja el estado igual. Solo se construye el estado del
+    movimiento elegido (ver Geometry.move_cells).
     """
-    path = [state]
+    geom = resolve_geometry(state, geom)
+    cells_of = geom.move_cells
+    yield state
+    if isinstance(state, int):
+        bits, mask, blank_shift = geom.tile_bits, geom.tile_mask, geom.blank_shift
+        blank = state >> blank_shift
+        base = state & geom.clear_blank
+        for c in codes:
+            j = cells_of[blank][c]
+            if j >= 0:
+                shift = j * bits
+                base = (base & ~(mask << shift)) | (((base >> shift) & mask) << (blank * bits))
+                blank = j
+            yield base | (blank << blank_shift)
+        return
+    cells = list(state)
+    blank = cells.index(0)
     cur = state
-    for mv in moves:
-        cur = apply_move(cur, mv)
-        path.append(cur)
-    return cur, path
\ No newline at end of file
+    for c in codes:
+        j = cells_of[blank][c]
+        if j >= 0:
+            cells[blank] = cells[j]
+            cells[j] = 0
+            blank = j
+            cur = tuple(cells)
+        yield cur
+
+
+def apply_moves(state: AnyState, moves: Sequence[str], geom: Optional[Geometry] = None) -> Tuple[AnyState, List[AnyState]]:
+    """
+    Aplica una secuencia de movimientos, retornando el estado final y la trayectoria de estados (incluyendo el inicial).
+    """
+    path = list(walk_codes(state, bytes(map(MOVE_INDEX.__getitem__, moves)), geom))
+    return path[-1], path
@@ -1,70 +1,171 @@
+import heapq
+from itertools import count
 from typing import Dict, List, Optional, Tuple
-from puzzle import State, Solution, neighbors, manhattan_distance
+from puzzle import (
+    AnyState,
+    Budget,
+    BudgetExhausted,
+    Geometry,
+    GoalContext,
+    SearchHooks,
+    SearchStats,
+    SearchSteps,
+    Solution,
+    begin_search,
+    budget_hooks,
+    goal_context,
+    hook_callbacks,
+    like,
+    partial_solution,
+    resolve_geometry,
+    run_steps,
+)
 
 
-def astar(start: State, goal: State) -> Optional[Solution]:
-    """
-    Algoritmo A* con heurística de Manhattan (h), donde el costo de cada movimiento es 1.
-    Utiliza listas ABIERTO y CERRADO, acumula el costo g+h, mantiene la mejor trayectoria a cada estado
-    y ordena ABIERTO de forma ascendente por f.
-    """
+# Políticas de desempate entre nodos con igual f:
+# - 'min_g': menor g primero y, a igualdad, el más antiguo (orden histórico de ABIERTO)
+# - 'max_g': mayor g primero (más profundo) y, a igualdad, el más antiguo
+# - 'lifo': mayor g primero y, a igualdad, el más reciente
+TIE_BREAKS = ('min_g', 'max_g', 'lifo')
+
+
+def _trace(parent: Dict[AnyState, Tuple[Optional[AnyState], Optional[str]]], st: AnyState) -> List[str]:
+    # Reconstruye los movimientos hasta st desde el diccionario parent
+    moves: List[str] = []
+    p, mv = parent[st]
+    while p is not None:
+        moves.append(mv)
+        p, mv = parent[p]
+    moves.reverse()
+    return moves
+
+
+def astar_steps(
+    start: AnyState,
+    goal: AnyState,
+    tie_break: str = 'min_g',
+    ctx: Optional[GoalContext] = None,
+    geom: Optional[Geometry] = None,
+    heuristic: Optional[str] = None,
+    budget: Optional[Budget] = None,
+    stats: Optional[SearchStats] = None,
+    hooks: Optional[SearchHooks] = None,
+) -> SearchSteps:
+    # Forma incremental de astar (mismos parámetros): se suspende en cada aviso de progreso
+    if tie_break not in TIE_BREAKS:
+        raise ValueError(f"Política de desempate no soportada: {tie_break} (use {', '.join(TIE_BREAKS)}).")
+    stats = begin_search(stats)
+    geom = resolve_geometry(start, geom, ctx)
+    goal = like(goal, start, geom)  # La meta en la misma representación (tupla o empaquetada) que el inicio
     if start == goal:
-        return Solution([start], [], nodes_generated=0, nodes_expanded=0)
+        return Solution(start, [], nodes_generated=0, nodes_expanded=0, stats=stats.finish(0, 0), geom=geom)
+    ctx = goal_context(goal, ctx, geom, heuristic)
 
     # g: costo desde el estado inicial, f = g + h
-    g_score: Dict[State, int] = {start: 0}
-    parent: Dict[State, Tuple[Optional[State], Optional[str]]] = {start: (None, None)}
+    g_score: Dict[AnyState, int] = {start: 0}
+    parent: Dict[AnyState, Tuple[Optional[AnyState], Optional[str]]] = {start: (None, None)}
 
-    # ABIERTO: lista de tuplas (f, g, state)
-    def f_of(state: State) -> int:
-        # Calcula el valor f para un estado
-        return g_score[state] + manhattan_distance(state, goal)
+    # Signo aplicado a g y al contador de inserción dentro de la clave del montículo
+    g_sign = 1 if tie_break == 'min_g' else -1
+    seq_sign = -1 if tie_break == 'lifo' else 1
+    seq = count()
 
-    abierto: List[Tuple[int, int, State]] = [(f_of(start), 0, start)]
-    cerrado: Dict[State, bool] = {}  # Estados ya explorados
+    # ABIERTO: montículo de tuplas (f, ±g, ±orden de inserción, g, h, state)
+    h_start = ctx.h(start)
+    abierto: List[Tuple[int, int, int, int, int, AnyState]] = [
+        (h_start, 0, seq_sign * next(seq), 0, h_start, start)
+    ]
+    cerrado: Dict[AnyState, bool] = {}  # Estados ya explorados
 
     nodes_generated = 0
     nodes_expanded = 0
+    reexpansions = 0
+    duplicate_hits = 0
+    peak_frontier = 1
+    best_state, best_h = start, h_start  # Mejor progreso, por si se agota el presupuesto
+    hooks = budget_hooks(hooks, budget)
+    on_expand, on_generate, next_tick = hook_callbacks(hooks)
 
-    while abierto:
-        # Ordena ABIERTO ascendentemente por f y luego por g (estable)
-        abierto.sort(key=lambda x: (x[0], x[1]))
-        f_current, g_current, current = abierto.pop(0)
-
-        if current in cerrado:
-            continue
-        cerrado[current] = True  # Marca el estado como explorado
-
-        # Expande el estado actual
-        nodes_expanded += 1
-
-        if current == goal:
-            # Reconstruye la trayectoria desde el diccionario parent
-            path: List[State] = []
-            moves: List[str] = []
-            st = current
-            while st is not None:
-                p, mv = parent[st]
-                path.append(st)
-                if mv is not None:
-                    moves.append(mv)
-                st = p
-            path.reverse()
-            moves.reverse()
-            return Solution(path, moves, nodes_generated, nodes_expanded)
-
-        for mv, nb in neighbors(current):
-            tentative_g = g_current + 1
-            nodes_generated += 1
+    try:
+        while abierto:
+            _, _, _, g_current, h_current, current = heapq.heappop(abierto)
 
-            if nb in cerrado:
+            # Entrada obsoleta: el estado ya se cerró o se encontró luego un camino mejor
+            if current in cerrado or g_current > g_score[current]:
                 continue
+            cerrado[current] = True  # Marca el estado como explorado
+
+            # Expande el estado actual
+            nodes_expanded += 1
+            if on_expand is not None:
+                on_expand(current, g_current)
 
-            # Si esta trayectoria es mejor (menor g), actualiza los valores
-            if (nb not in g_score) or (tentative_g < g_score[nb]):
-                g_score[nb] = tentative_g
-                parent[nb] = (current, mv)
-                abierto.append((tentative_g + manhattan_distance(nb, goal), tentative_g, nb))
+            if current == goal:
+                return Solution(start, _trace(parent, current), nodes_generated, nodes_expanded, stats, geom)
+            if h_current < best_h:
+                best_state, best_h = current, h_current
 
-    # Si no se encuentra solución, retorna None
-    return None
\ No newline at end of file
+            tentative_g = g_current + 1
+            for mv, nb, h_nb in ctx.successors(current, h_current):
+                nodes_generated += 1
+                if on_generate is not None:
+                    on_generate(nb, tentative_g)
+                if nodes_generated >= next_tick:
+                    next_tick = stats.progress(hooks, nodes_generated, nodes_expanded, len(abierto), len(cerrado))
+                    yield
+
+                if nb in cerrado:
+                    if tentative_g >= g_score[nb]:
+                        duplicate_hits += 1
+                        continue
+                    # Solo con heurísticas inconsistentes (p. ej. las PDB): se reabre con el g mejor
+                    del cerrado[nb]
+                    reexpansions += 1
+
+                # Si esta trayectoria es mejor (menor g), actualiza los valores
+                if (nb not in g_score) or (tentative_g < g_score[nb]):
+                    g_score[nb] = tentative_g
+                    parent[nb] = (current, mv)
+                    heapq.heappush(
+                        abierto,
+                        (tentative_g + h_nb, g_sign * tentative_g, seq_sign * next(seq), tentative_g, h_nb, nb),
+                    )
+                else:
+                    duplicate_hits += 1
+            if len(abierto) > peak_frontier:
+                peak_frontier = len(abierto)
+
+        # Si no se encuentra solución, retorna None
+        return None
+    except BudgetExhausted as e:
+        return partial_solution(e, start, _trace(parent, best_state), best_h, nodes_generated, nodes_expanded, stats, geom)
+    finally:
+        stats.finish(nodes_generated, nodes_expanded, peak_frontier, len(cerrado), reexpansions, duplicate_hits)
+
+
+def astar(
+    start: AnyState,
+    goal: AnyState,
+    tie_break: str = 'min_g',
+    ctx: Optional[GoalContext] = None,
+    geom: Optional[Geometry] = None,
+    heuristic: Optional[str] = None,
+    budget: Optional[Budget] = None,
+    stats: Optional[SearchStats] = None,
+    hooks: Optional[SearchHooks] = None,
+) -> Optional[Solution]:
+    """
+    Algoritmo A* con heurística admisible h (Manhattan por defecto), donde el costo de cada movimiento es 1.
+    Utiliza listas ABIERTO y CERRADO, acumula el costo g+h y mantiene la mejor trayectoria a cada estado.
+    ABIERTO es una cola de prioridad (montículo) ordenada por (f, desempate); las entradas obsoletas
+    (estados ya cerrados o con un g mejorado después de insertarlas) se descartan al extraerlas.
+    Un estado cerrado alcanzado luego con menor g se reabre, lo que mantiene la solución óptima con
+    heurísticas admisibles pero inconsistentes (no ocurre con las de puzzle.HEURISTICS).
+    ctx: contexto precalculado de la meta (ver puzzle.GoalContext); la h de cada sucesor se
+    actualiza en O(1) a partir de la del padre.
+    heuristic: nombre de la heurística del registro puzzle.HEURISTICS cuando no se pasa ctx.
+    budget: límites de tiempo, nodos y memoria (ver puzzle.Budget); al agotarse se retorna un
+    PartialSolution hasta el estado expandido de menor h.
+    stats / hooks: estadísticas de la ejecución y callbacks de instrumentación (ver puzzle.SearchStats).
+    """
+    return run_steps(astar_steps(start, goal, tie_break, ctx, geom, heuristic, budget, stats, hooks))
@@ -0,0 +1,307 @@
+import heapq
+from itertools import count
+from typing import Dict, List, Optional, Set, Tuple
+from puzzle import (
+    AnyState,
+    Budget,
+    BudgetExhausted,
+    Geometry,
+    GoalContext,
+    SearchHooks,
+    SearchStats,
+    SearchSteps,
+    Solution,
+    begin_search,
+    budget_hooks,
+    goal_context,
+    hook_callbacks,
+    like,
+    partial_solution,
+    resolve_geometry,
+    run_steps,
+)
+
+
+# Movimiento inverso: deshace el movimiento del vacío (los movimientos son reversibles)
+INVERSE_MOVE = {'Arriba': 'Abajo', 'Abajo': 'Arriba', 'Derecha': 'Izquierda', 'Izquierda': 'Derecha'}
+
+# Enlace de un estado en una de las búsquedas: (estado vecino hacia el origen, movimiento, g)
+Link = Tuple[Optional[AnyState], Optional[str], int]
+
+
+def _join(meet: AnyState, forward: Dict[AnyState, Link], backward: Dict[AnyState, Link]) -> List[str]:
+    # Movimientos de la mitad inicio→meet (enlaces hacia atrás) seguidos de los de la mitad meet→meta
+    # (enlaces hacia adelante)
+    moves = _moves_to(meet, forward)
+    st, mv, _ = backward[meet]
+    while st is not None:
+        moves.append(mv)
+        st, mv, _ = backward[st]
+    return moves
+
+
+def _moves_to(st: AnyState, forward: Dict[AnyState, Link]) -> List[str]:
+    # Movimientos desde el inicio hasta st siguiendo los enlaces de la búsqueda hacia adelante
+    moves: List[str] = []
+    p, mv, _ = forward[st]
+    while p is not None:
+        moves.append(mv)
+        p, mv, _ = forward[p]
+    moves.reverse()
+    return moves
+
+
+def bidirectional_bfs_steps(
+    start: AnyState,
+    goal: AnyState,
+    max_nodes: Optional[int] = None,
+    geom: Optional[Geometry] = None,
+    budget: Optional[Budget] = None,
+    stats: Optional[SearchStats] = None,
+    hooks: Optional[SearchHooks] = None,
+) -> SearchSteps:
+    # Forma incremental de bidirectional_bfs (mismos parámetros): se suspende en cada aviso de progreso
+    stats = begin_search(stats)
+    geom = resolve_geometry(start, geom)
+    goal = like(goal, start, geom)  # La meta en la misma representación (tupla o empaquetada) que el inicio
+    if start == goal:
+        return Solution(start, [], nodes_generated=0, nodes_expanded=0, stats=stats.finish(0, 0), geom=geom)
+
+    forward: Dict[AnyState, Link] = {start: (None, None, 0)}
+    backward: Dict[AnyState, Link] = {goal: (None, None, 0)}
+    front_f: List[AnyState] = [start]
+    front_b: List[AnyState] = [goal]
+    nodes_generated = 0
+    nodes_expanded = 0
+    duplicate_hits = 0
+    peak_frontier = 2
+    # Con presupuesto se sigue el estado expandido hacia adelante de menor distancia Manhattan
+    h_of = goal_context(goal, geom=geom).h if budget is not None else None
+    best_h = h_of(start) if h_of is not None else 0
+    best_state = start
+    hooks = budget_hooks(hooks, budget)
+    on_expand, on_generate, next_tick = hook_callbacks(hooks)
+
+    try:
+        while front_f and front_b:
+            is_forward = len(front_f) <= len(front_b)
+            if is_forward:
+                frontier, visited, other = front_f, forward, backward
+            else:
+                frontier, visited, other = front_b, backward, forward
+
+            best: Optional[AnyState] = None
+            best_cost = 0
+            nxt: List[AnyState] = []
+            for current in frontier:
+                nodes_expanded += 1
+                g_next = visited[current][2] + 1
+                if on_expand is not None:
+                    on_expand(current, g_next - 1)
+                if h_of is not None and is_forward:
+                    h = h_of(current)
+                    if h < best_h:
+                        best_h, best_state = h, current
+                for mv, nb in geom.neighbors(current):
+                    nodes_generated += 1
+                    if max_nodes is not None and nodes_generated > max_nodes:
+                        return None
+                    if on_generate is not None:
+                        on_generate(nb, g_next)
+                    if nodes_generated >= next_tick:
+                        next_tick = stats.progress(
+                            hooks, nodes_generated, nodes_expanded, len(front_f) + len(front_b), len(forward) + len(backward)
+                        )
+                        yield
+                    if nb in visited:
+                        duplicate_hits += 1
+                        continue
+                    visited[nb] = (current, mv if is_forward else INVERSE_MOVE[mv], g_next)
+                    nxt.append(nb)
+                    if nb in other:
+                        cost = g_next + other[nb][2]
+                        if best is None or cost < best_cost:
+                            best, best_cost = nb, cost
+
+            if best is not None:
+                return Solution(start, _join(best, forward, backward), nodes_generated, nodes_expanded, stats, geom)
+
+            if is_forward:
+                front_f = nxt
+            else:
+                front_b = nxt
+            if len(front_f) + len(front_b) > peak_frontier:
+                peak_frontier = len(front_f) + len(front_b)
+
+        # Alguna frontera se agotó sin encontrarse: el par no es resoluble
+        return None
+    except BudgetExhausted as e:
+        moves = _moves_to(best_state, forward)
+        return partial_solution(e, start, moves, best_h, nodes_generated, nodes_expanded, stats, geom)
+    finally:
+        stats.finish(nodes_generated, nodes_expanded, peak_frontier, len(forward) + len(backward), 0, duplicate_hits)
+
+
+def bidirectional_bfs(
+    start: AnyState,
+    goal: AnyState,
+    max_nodes: Optional[int] = None,
+    geom: Optional[Geometry] = None,
+    budget: Optional[Budget] = None,
+    stats: Optional[SearchStats] = None,
+    hooks: Optional[SearchHooks] = None,
+) -> Optional[Solution]:
+    """
+    Búsqueda en amplitud bidireccional: una búsqueda desde el inicio y otra desde la meta, cada una
+    con su frontera y su mapa de visitados. En cada paso se expande una capa completa de la
+    frontera más pequeña; al completar la capa en la que ambas búsquedas se encuentran se retorna
+    el camino más corto entre los puntos de encuentro (óptimo).
+    En la búsqueda hacia atrás se guarda el movimiento inverso, de modo que la trayectoria se lee
+    siempre de inicio a meta.
+    budget: límites de tiempo, nodos y memoria (ver puzzle.Budget); al agotarse se retorna un
+    PartialSolution hasta el estado de la búsqueda hacia adelante más cercano a la meta (Manhattan).
+    stats / hooks: estadísticas e instrumentación (ver puzzle.SearchStats); la frontera y los cerrados
+    suman ambas direcciones y g es la distancia al extremo (inicio o meta) de cada búsqueda.
+    """
+    return run_steps(bidirectional_bfs_steps(start, goal, max_nodes, geom, budget, stats, hooks))
+
+
+def _top_priority(heap: List[Tuple[int, int, int, int, AnyState]], g_score: Dict[AnyState, int], closed: Set[AnyState]) -> Optional[int]:
+    # Descarta entradas obsoletas del tope y retorna la prioridad mínima vigente (None si está vacío)
+    while heap:
+        _, g, _, _, st = heap[0]
+        if st in closed or g != g_score[st]:
+            heapq.heappop(heap)
+            continue
+        return heap[0][0]
+    return None
+
+
+def bidirectional_mm_steps(
+    start: AnyState,
+    goal: AnyState,
+    ctx: Optional[GoalContext] = None,
+    max_nodes: Optional[int] = None,
+    geom: Optional[Geometry] = None,
+    heuristic: Optional[str] = None,
+    budget: Optional[Budget] = None,
+    stats: Optional[SearchStats] = None,
+    hooks: Optional[SearchHooks] = None,
+) -> SearchSteps:
+    # Forma incremental de bidirectional_mm (mismos parámetros): se suspende en cada aviso de progreso
+    stats = begin_search(stats)
+    geom = resolve_geometry(start, geom, ctx)
+    goal = like(goal, start, geom)  # La meta en la misma representación (tupla o empaquetada) que el inicio
+    if start == goal:
+        return Solution(start, [], nodes_generated=0, nodes_expanded=0, stats=stats.finish(0, 0), geom=geom)
+    ctx_f = goal_context(goal, ctx, geom, heuristic)
+    ctx_b = goal_context(start, geom=geom, heuristic=heuristic)
+
+    seq = count()
+    links: Tuple[Dict[AnyState, Link], Dict[AnyState, Link]] = ({start: (None, None, 0)}, {goal: (None, None, 0)})
+    g_scores: Tuple[Dict[AnyState, int], Dict[AnyState, int]] = ({start: 0}, {goal: 0})
+    closed: Tuple[Set[AnyState], Set[AnyState]] = (set(), set())
+    # Montículos de tuplas (prioridad, g, orden de inserción, h, estado)
+    h_f = ctx_f.h(start)
+    h_b = ctx_b.h(goal)
+    heaps: Tuple[List[Tuple[int, int, int, int, AnyState]], ...] = (
+        [(h_f, 0, next(seq), h_f, start)],
+        [(h_b, 0, next(seq), h_b, goal)],
+    )
+    contexts = (ctx_f, ctx_b)
+
+    best: Optional[AnyState] = None
+    upper = float('inf')
+    nodes_generated = 0
+    nodes_expanded = 0
+    reexpansions = 0
+    duplicate_hits = 0
+    peak_frontier = 2
+    best_h, best_state = h_f, start  # Mejor progreso hacia adelante, por si se agota el presupuesto
+    hooks = budget_hooks(hooks, budget)
+    on_expand, on_generate, next_tick = hook_callbacks(hooks)
+
+    try:
+        while True:
+            pr_f = _top_priority(heaps[0], g_scores[0], closed[0])
+            pr_b = _top_priority(heaps[1], g_scores[1], closed[1])
+            if pr_f is None or pr_b is None:
+                break
+            if upper <= min(pr_f, pr_b):
+                break
+
+            side = 0 if pr_f <= pr_b else 1
+            other = 1 - side
+            _, g_current, _, h_current, current = heapq.heappop(heaps[side])
+            closed[side].add(current)
+            nodes_expanded += 1
+            if on_expand is not None:
+                on_expand(current, g_current)
+            if side == 0 and h_current < best_h:
+                best_h, best_state = h_current, current
+
+            g_next = g_current + 1
+            for mv, nb, h_nb in contexts[side].successors(current, h_current):
+                nodes_generated += 1
+                if max_nodes is not None and nodes_generated > max_nodes:
+                    return None
+                if on_generate is not None:
+                    on_generate(nb, g_next)
+                if nodes_generated >= next_tick:
+                    next_tick = stats.progress(
+                        hooks, nodes_generated, nodes_expanded, len(heaps[0]) + len(heaps[1]), len(closed[0]) + len(closed[1])
+                    )
+                    yield
+                g_old = g_scores[side].get(nb)
+                if g_old is not None and g_old <= g_next:
+                    duplicate_hits += 1
+                    continue
+                # Un camino mejor reabre el estado si ya estaba cerrado
+                if nb in closed[side]:
+                    reexpansions += 1
+                    closed[side].discard(nb)
+                g_scores[side][nb] = g_next
+                links[side][nb] = (current, mv if side == 0 else INVERSE_MOVE[mv], g_next)
+                heapq.heappush(heaps[side], (max(g_next + h_nb, 2 * g_next), g_next, next(seq), h_nb, nb))
+                g_other = g_scores[other].get(nb)
+                if g_other is not None and g_next + g_other < upper:
+                    upper = g_next + g_other
+                    best = nb
+            if len(heaps[0]) + len(heaps[1]) > peak_frontier:
+                peak_frontier = len(heaps[0]) + len(heaps[1])
+
+        if best is None:
+            return None
+        return Solution(start, _join(best, links[0], links[1]), nodes_generated, nodes_expanded, stats, geom)
+    except BudgetExhausted as e:
+        moves = _moves_to(best_state, links[0])
+        return partial_solution(e, start, moves, best_h, nodes_generated, nodes_expanded, stats, geom)
+    finally:
+        stats.finish(
+            nodes_generated, nodes_expanded, peak_frontier, len(closed[0]) + len(closed[1]), reexpansions, duplicate_hits
+        )
+
+
+def bidirectional_mm(
+    start: AnyState,
+    goal: AnyState,
+    ctx: Optional[GoalContext] = None,
+    max_nodes: Optional[int] = None,
+    geom: Optional[Geometry] = None,
+    heuristic: Optional[str] = None,
+    budget: Optional[Budget] = None,
+    stats: Optional[SearchStats] = None,
+    hooks: Optional[SearchHooks] = None,
+) -> Optional[Solution]:
+    """
+    Búsqueda heurística bidireccional MM ("meet in the middle", Holte et al.).
+    Cada dirección tiene su propia cola de prioridad y su mapa g; la prioridad de un nodo es
+    max(g + h, 2g), con h = Manhattan (o la heurística indicada en heuristic) a la meta (hacia
+    adelante, ctx) o al inicio (hacia atrás).
+    Siempre se expande la dirección con la menor prioridad y se termina cuando el mejor camino
+    encontrado (U) no supera esa prioridad mínima, lo que garantiza optimalidad.
+    stats / hooks: como en bidirectional_bfs; re-expansiones cuenta los estados cerrados que se
+    reabren al encontrarles un camino mejor.
+    budget: como en bidirectional_bfs (el mejor progreso es el de menor h hacia adelante).
+    """
+    return run_steps(bidirectional_mm_steps(start, goal, ctx, max_nodes, geom, heuristic, budget, stats, hooks))
@@ -1,58 +1,152 @@
-from typing import List, Tuple, Optional, Dict
-from puzzle import State, Solution, neighbors
+from array import array
+from typing import List, Optional, Dict, Union
+from puzzle import (
+    MOVE_INDEX,
+    AnyState,
+    Budget,
+    BudgetExhausted,
+    Geometry,
+    SearchHooks,
+    SearchStats,
+    SearchSteps,
+    Solution,
+    begin_search,
+    budget_hooks,
+    goal_context,
+    hook_callbacks,
+    like,
+    partial_solution,
+    resolve_geometry,
+    run_steps,
+    trace_codes,
+)
+from ranking import RankedDepths
 
 
-def dfs(start: State, goal: State, max_depth: Optional[int] = None, max_nodes: Optional[int] = None) -> Optional[Solution]:
-    # Búsqueda en profundidad (DFS)
+def dfs_steps(
+    start: AnyState,
+    goal: AnyState,
+    max_depth: Optional[int] = None,
+    max_nodes: Optional[int] = None,
+    geom: Optional[Geometry] = None,
+    budget: Optional[Budget] = None,
+    stats: Optional[SearchStats] = None,
+    hooks: Optional[SearchHooks] = None,
+    compact_visited: bool = False,
+) -> SearchSteps:
+    # Forma incremental de dfs (mismos parámetros): se suspende en cada aviso de progreso
+    stats = begin_search(stats)
+    geom = resolve_geometry(start, geom)
+    goal = like(goal, start, geom)  # La meta en la misma representación (tupla o empaquetada) que el inicio
     if start == goal:
-        return Solution([start], [], nodes_generated=0, nodes_expanded=0)
+        return Solution(start, [], nodes_generated=0, nodes_expanded=0, stats=stats.finish(0, 0), geom=geom)
 
-    abierto: List[Tuple[State, Optional[int], Optional[str], int]] = [(start, None, None, 0)]
-    visited_depth: Dict[State, int] = {}
+    # ABIERTO es una pila en dos arreglos paralelos: el estado y un enlace (índice del padre * 4 +
+    # código del movimiento). Los nodos explorados solo guardan padre, código y profundidad en
+    # arreglos compactos; el camino se reconstruye al final
+    abierto: List[AnyState] = [start]
+    ab_link = array('q', [-4])
+    parents = array('i')
+    codes = bytearray()
+    depths = array('i')
+    # compact_visited: profundidades en un arreglo indexado por rango en lugar de un diccionario
+    visited_depth: Union[Dict[AnyState, int], RankedDepths] = (
+        RankedDepths(geom, max_depth, isinstance(start, int)) if compact_visited else {}
+    )
     nodes_generated = 0
     nodes_expanded = 0
-    explored: List[Tuple[State, Optional[int], Optional[str], int]] = []
-
-    while abierto:
-        current, parent_idx, move, depth = abierto.pop()
-
-        # Si el estado ya fue visitado con menor profundidad, lo omitimos
-        if current in visited_depth and depth >= visited_depth[current]:
-            continue
-
-        idx_current = len(explored)
-        explored.append((current, parent_idx, move, depth))
-        visited_depth[current] = depth
-
-        if current == goal:
-            # Reconstruir la trayectoria y movimientos
-            path_states: List[State] = []
-            path_moves: List[str] = []
-            i = idx_current
-            while i is not None:
-                st, p_idx, mv, _ = explored[i]
-                path_states.append(st)
-                if mv is not None:
-                    path_moves.append(mv)
-                i = p_idx
-            path_states.reverse()
-            path_moves.reverse()
-            return Solution(path_states, path_moves, nodes_generated, nodes_expanded)
-
-        if max_depth is not None and depth >= max_depth:
-            continue
-
-        nodes_expanded += 1
-        succs = neighbors(current)
-
-        # Expandir sucesores
-        for mv, st in succs:
-            nodes_generated += 1
-            if max_nodes is not None and nodes_generated > max_nodes:
-                return None
+    reexpansions = 0
+    duplicate_hits = 0
+    peak_frontier = 1
+    # Con presupuesto se sigue el estado alcanzado de menor distancia Manhattan (mejor progreso)
+    h_of = goal_context(goal, geom=geom).h if budget is not None else None
+    best_h = h_of(start) if h_of is not None else 0
+    best_idx = 0
+    hooks = budget_hooks(hooks, budget)
+    on_expand, on_generate, next_tick = hook_callbacks(hooks)
+    push, push_link = abierto.append, ab_link.append
+    pop, pop_link = abierto.pop, ab_link.pop
+    move_index = MOVE_INDEX
+    neighbors = geom.neighbors
+
+    try:
+        while abierto:
+            current = pop()
+            link = pop_link()
+            parent_idx = link >> 2
+            depth = depths[parent_idx] + 1 if parent_idx >= 0 else 0
+
+            # Si el estado ya fue visitado con menor profundidad, lo omitimos
+            seen = visited_depth.get(current)
+            if seen is not None:
+                if depth >= seen:
+                    duplicate_hits += 1
+                    continue
+                reexpansions += 1
+
+            idx_current = len(parents)
+            parents.append(parent_idx)
+            codes.append(link & 3)
+            depths.append(depth)
+            visited_depth[current] = depth
+
+            if current == goal:
+                # Reconstruir los movimientos (la trayectoria se arma a demanda)
+                return Solution(start, trace_codes(parents, codes, idx_current), nodes_generated, nodes_expanded, stats, geom)
+            if h_of is not None:
+                h = h_of(current)
+                if h < best_h:
+                    best_h, best_idx = h, idx_current
+
+            if max_depth is not None and depth >= max_depth:
+                continue
+
+            nodes_expanded += 1
+            if on_expand is not None:
+                on_expand(current, depth)
+
+            # Expandir sucesores
             new_depth = depth + 1
-            if (st not in visited_depth) or (new_depth < visited_depth[st]):
-                abierto.append((st, idx_current, mv, new_depth))
+            base = idx_current << 2
+            for mv, st in neighbors(current):
+                nodes_generated += 1
+                if max_nodes is not None and nodes_generated > max_nodes:
+                    return None
+                if on_generate is not None:
+                    on_generate(st, new_depth)
+                if nodes_generated >= next_tick:
+                    next_tick = stats.progress(hooks, nodes_generated, nodes_expanded, len(abierto), len(visited_depth))
+                    yield
+                seen = visited_depth.get(st)
+                if seen is None or new_depth < seen:
+                    push(st)
+                    push_link(base | move_index[mv])
+                else:
+                    duplicate_hits += 1
+            if len(abierto) > peak_frontier:
+                peak_frontier = len(abierto)
+
+        # Si no se encuentra solución, retorna None
+        return None
+    except BudgetExhausted as e:
+        return partial_solution(e, start, trace_codes(parents, codes, best_idx), best_h, nodes_generated, nodes_expanded, stats, geom)
+    finally:
+        stats.finish(nodes_generated, nodes_expanded, peak_frontier, len(visited_depth), reexpansions, duplicate_hits)
+
 
-    # Si no se encuentra solución, retorna None
-    return None
\ No newline at end of file
+def dfs(
+    start: AnyState,
+    goal: AnyState,
+    max_depth: Optional[int] = None,
+    max_nodes: Optional[int] = None,
+    geom: Optional[Geometry] = None,
+    budget: Optional[Budget] = None,
+    stats: Optional[SearchStats] = None,
+    hooks: Optional[SearchHooks] = None,
+    compact_visited: bool = False,
+) -> Optional[Solution]:
+    # Búsqueda en profundidad (DFS); stats / hooks: estadísticas e instrumentación (ver puzzle.SearchStats)
+    # budget: límites de tiempo, nodos y memoria (ver puzzle.Budget); al agotarse retorna un PartialSolution
+    # compact_visited: visitados en ranking.RankedDepths (tableros de hasta 12 celdas; unos 700 KB en el 3x3
+    # sin max_depth y 177 KB con max_depth < 255) en vez de un diccionario de más de 200 bytes por estado
+    return run_steps(dfs_steps(start, goal, max_depth, max_nodes, geom, budget, stats, hooks, compact_visited))
@@ -0,0 +1,103 @@
+from typing import List, Optional
+from puzzle import (
+    GEOMETRY_3X3,
+    AnyState,
+    Budget,
+    BudgetExhausted,
+    Geometry,
+    SearchHooks,
+    SearchStats,
+    SearchSteps,
+    Solution,
+    begin_search,
+    budget_hooks,
+    hook_callbacks,
+    like,
+    manhattan_distance,
+    partial_solution,
+    run_steps,
+)
+from distance_db import UNREACHABLE, canonical_blank, distance_context, get_table
+
+
+def exact_steps(
+    start: AnyState,
+    goal: AnyState,
+    directory: Optional[str] = None,
+    geom: Optional[Geometry] = None,
+    budget: Optional[Budget] = None,
+    stats: Optional[SearchStats] = None,
+    hooks: Optional[SearchHooks] = None,
+) -> SearchSteps:
+    # Forma incremental de exact (mismos parámetros): se suspende en cada aviso de progreso
+    if geom is not None and geom != GEOMETRY_3X3:
+        raise ValueError("La base de datos de distancias solo cubre el tablero 3x3.")
+    stats = begin_search(stats)
+    goal = like(goal, start)  # La meta en la misma representación (tupla o empaquetada) que el inicio
+    if start == goal:
+        return Solution(start, [], nodes_generated=0, nodes_expanded=0, stats=stats.finish(0, 0), geom=geom)
+
+    if budget is not None:
+        # La construcción de la tabla (la primera vez, unos segundos) también respeta el plazo
+        try:
+            get_table(canonical_blank(goal), directory, lambda: budget.check(0))
+        except BudgetExhausted as e:
+            stats.finish(0, 0)
+            return partial_solution(e, start, [], manhattan_distance(start, goal), 0, 0, stats, geom)
+    ctx = distance_context(goal, directory)
+    d = ctx.h(start)
+    if d == UNREACHABLE:
+        stats.finish(0, 0)
+        return None
+
+    moves: List[str] = []
+    nodes_generated = 0
+    nodes_expanded = 0
+    current = start
+    hooks = budget_hooks(hooks, budget)
+    on_expand, on_generate, next_tick = hook_callbacks(hooks)
+    try:
+        while d > 0:
+            nodes_expanded += 1
+            if on_expand is not None:
+                on_expand(current, len(moves))
+            for mv, nb, d_nb in ctx.successors(current, d):
+                nodes_generated += 1
+                if on_generate is not None:
+                    on_generate(nb, len(moves) + 1)
+                if nodes_generated >= next_tick:
+                    next_tick = stats.progress(hooks, nodes_generated, nodes_expanded, 1)
+                    yield
+                if d_nb == d - 1:
+                    current, d = nb, d_nb
+                    moves.append(mv)
+                    break
+    except BudgetExhausted as e:
+        stats.finish(nodes_generated, nodes_expanded, 1)
+        return partial_solution(e, start, moves, d, nodes_generated, nodes_expanded, stats, geom)
+    return Solution(start, moves, nodes_generated, nodes_expanded, stats.finish(nodes_generated, nodes_expanded, 1), geom)
+
+
+def exact(
+    start: AnyState,
+    goal: AnyState,
+    directory: Optional[str] = None,
+    geom: Optional[Geometry] = None,
+    budget: Optional[Budget] = None,
+    stats: Optional[SearchStats] = None,
+    hooks: Optional[SearchHooks] = None,
+) -> Optional[Solution]:
+    """
+    Solución óptima consultando la base de datos de distancias exactas (ver distance_db).
+    Desde el estado inicial se desciende de forma voraz: en cada paso se elige el primer vecino
+    cuya distancia a la meta es una unidad menor, por lo que no hay búsqueda ni retroceso.
+    La primera consulta para una clase de meta construye la tabla y la guarda en disco.
+    Nodos generados: vecinos consultados en la tabla. Nodos expandidos: estados del camino.
+    Solo cubre el puzzle-8 (3x3).
+    budget: límites de tiempo, nodos y memoria (ver puzzle.Budget); al agotarse se retorna un
+    PartialSolution con el tramo de camino ya descendido. Si se agota el plazo mientras se construye la
+    tabla, el PartialSolution no tiene movimientos (best_h es la distancia Manhattan) y la tabla no se
+    guarda.
+    stats / hooks: estadísticas e instrumentación (ver puzzle.SearchStats).
+    """
+    return run_steps(exact_steps(start, goal, directory, geom, budget, stats, hooks))
@@ -1,6 +1,27 @@
 import random
 from typing import List, Optional, Tuple
-from puzzle import State, Solution, manhattan_distance, apply_moves
+from puzzle import (
+    MOVE_INDEX,
+    AnyState,
+    Budget,
+    BudgetExhausted,
+    Geometry,
+    GoalContext,
+    SearchHooks,
+    SearchStats,
+    SearchSteps,
+    Solution,
+    apply_moves,
+    begin_search,
+    budget_hooks,
+    goal_context,
+    hook_callbacks,
+    like,
+    partial_solution,
+    resolve_geometry,
+    run_steps,
+    walk_codes,
+)
 
 
 MOVES = ['Arriba', 'Abajo', 'Izquierda', 'Derecha']
@@ -11,31 +32,42 @@ def _random_chromosome(length: int) -> List[str]:
     return [random.choice(MOVES) for _ in range(length)]
 
 
-def _crossover(a: List[str], b: List[str]) -> Tuple[List[str], List[str]]:
-    # Realiza cruce de un punto entre dos cromosomas
+def _crossover(a: List[str], b: List[str]) -> Tuple[List[str], List[str], int]:
+    # Realiza cruce de un punto entre dos cromosomas; retorna también el punto de corte
     if len(a) != len(b) or len(a) == 0:
-        return a[:], b[:]
+        return a[:], b[:], len(a)
     point = random.randint(1, len(a) - 1)
-    return a[:point] + b[point:], b[:point] + a[point:]
+    return a[:point] + b[point:], b[:point] + a[point:], point
 
 
-def _mutate(ch: List[str], rate: float) -> None:
-    # Aplica mutación aleatoria a un cromosoma
+def _mutate(ch: List[str], rate: float) -> int:
+    # Aplica mutación aleatoria a un cromosoma; retorna la posición del primer gen mutado (o su largo)
+    first = len(ch)
     for i in range(len(ch)):
         if random.random() < rate:
             ch[i] = random.choice(MOVES)
+            if first == len(ch):
+                first = i
+    return first
 
 
-def _tournament(pop: List[List[str]], fitness: List[int], k: int) -> List[str]:
-    # Selección por torneo: elige el mejor de k individuos aleatorios
+def _tournament(pop: List[List[str]], fitness: List[int], k: int) -> int:
+    # Selección por torneo: retorna el índice del mejor de k individuos aleatorios
     idxs = random.sample(range(len(pop)), k=min(k, len(pop)))
-    best = min(idxs, key=lambda i: fitness[i])
-    return pop[best][:]
+    return min(idxs, key=lambda i: fitness[i])
 
 
-def genetic_simple(
-    start: State,
-    goal: State,
+def _extend_trail(trail: List[AnyState], ch: List[str], shared: int, geom: Geometry) -> List[AnyState]:
+    # Trayectoria de estados de ch (el inicial y uno por movimiento) cuando sus primeros shared
+    # movimientos coinciden con los del cromosoma de trail: se reutiliza ese tramo y solo se simula el resto
+    if shared >= len(ch):
+        return trail
+    return trail[:shared] + list(walk_codes(trail[shared], bytes(map(MOVE_INDEX.__getitem__, ch[shared:])), geom))
+
+
+def genetic_simple_steps(
+    start: AnyState,
+    goal: AnyState,
     pop_size: int = 100,
     chrom_len: int = 30,
     generations: int = 200,
@@ -43,86 +75,177 @@ def genetic_simple(
     mutation_rate: float = 0.1,
     tournament_k: int = 3,
     elitism: int = 2,
-) -> Optional[Solution]:
-    """
-    Algoritmo genético simple para el puzzle-8, donde cada cromosoma es una secuencia fija de movimientos.
-    La aptitud (fitness) es la distancia Manhattan entre el estado alcanzado y el estado meta tras aplicar la secuencia.
-    El algoritmo tiene éxito cuando la aptitud es 0 (se alcanza la meta).
-    Nodos generados: total de descendientes producidos.
-    Nodos expandidos: total de evaluaciones de aptitud realizadas (individuos evaluados).
-    """
+    prefix_cache: bool = True,
+    ctx: Optional[GoalContext] = None,
+    geom: Optional[Geometry] = None,
+    heuristic: Optional[str] = None,
+    budget: Optional[Budget] = None,
+    stats: Optional[SearchStats] = None,
+    hooks: Optional[SearchHooks] = None,
+) -> SearchSteps:
+    # Forma incremental de genetic_simple (mismos parámetros): se suspende en cada aviso de progreso
+    stats = begin_search(stats)
+    geom = resolve_geometry(start, geom, ctx)
+    goal = like(goal, start, geom)  # La meta en la misma representación (tupla o empaquetada) que el inicio
+    ctx = goal_context(goal, ctx, geom, heuristic)
     # Generar la población inicial de cromosomas aleatorios
     population: List[List[str]] = [_random_chromosome(chrom_len) for _ in range(pop_size)]
+    # Trayectoria de estados de cada individuo: un hijo hereda el tramo de su primer padre hasta el
+    # punto de cruce (o la primera mutación, si es anterior) y solo simula los movimientos siguientes
+    trails: List[List[AnyState]] = []
+    cache_hits = 0
+    cache_misses = 0
     nodes_generated = 0
     nodes_expanded = 0
-
-    # Evaluar la aptitud de la población inicial
-    fitness: List[int] = []
-    for ch in population:
-        end_state, _ = apply_moves(start, ch)
-        f = manhattan_distance(end_state, goal)
-        fitness.append(f)
-        nodes_expanded += 1
-
-    for gen in range(1, generations + 1):
-    # ¿Se encontró una solución?
-        best_idx = min(range(len(population)), key=lambda i: fitness[i])
-        if fitness[best_idx] == 0:
-            # Reconstruir la trayectoria con el mejor cromosoma
-            _, path_states = apply_moves(start, population[best_idx])
-            # Derivar la lista de movimientos hasta llegar a la meta (puede ser menor o igual a chrom_len si llega antes)
-            # Recortar los movimientos hasta el punto donde se alcanza el estado meta
-            moves: List[str] = []
-            for i in range(1, len(path_states)):
-                moves.append(population[best_idx][i - 1])
-                if path_states[i] == goal:
-                    path_states = path_states[: i + 1]
-                    break
-            return Solution(path_states, moves[: len(path_states) - 1], nodes_generated, nodes_expanded)
-
-    # Crear nueva generación aplicando elitismo
-        new_pop: List[List[str]] = []
-        new_fit: List[int] = []
-
-    # Elitismo: copiar los mejores individuos según el parámetro 'elitism'
-        if elitism > 0:
-            order = sorted(range(len(population)), key=lambda i: fitness[i])
-            for i in order[: min(elitism, pop_size)]:
-                new_pop.append(population[i][:])
-                new_fit.append(fitness[i])
-
-        while len(new_pop) < pop_size:
-            # Selección por torneo para padres
-            p1 = _tournament(population, fitness, tournament_k)
-            p2 = _tournament(population, fitness, tournament_k)
-
-            # Cruce de un punto entre los padres
-            c1, c2 = _crossover(p1, p2)
-
-            # Aplicar mutación cada m generaciones
-            if mutate_every > 0 and (gen % mutate_every == 0):
-                _mutate(c1, mutation_rate)
-                _mutate(c2, mutation_rate)
-
-            # Evaluar los descendientes y agregarlos a la nueva población
-            end1, _ = apply_moves(start, c1)
-            f1 = manhattan_distance(end1, goal)
-            nodes_generated += 1
+    hooks = budget_hooks(hooks, budget)
+    on_expand, on_generate, next_tick = hook_callbacks(hooks)
+
+    try:
+        # Evaluar la aptitud de la población inicial
+        fitness: List[int] = []
+        for ch in population:
+            trail = apply_moves(start, ch, geom)[1]
+            trails.append(trail)
+            end_state = trail[-1]
+            f = ctx.h(end_state)
+            fitness.append(f)
             nodes_expanded += 1
-            new_pop.append(c1)
-            new_fit.append(f1)
-
-            if len(new_pop) < pop_size:
-                end2, _ = apply_moves(start, c2)
-                f2 = manhattan_distance(end2, goal)
+            if on_expand is not None:
+                on_expand(end_state, 0)
+
+        for gen in range(1, generations + 1):
+        # ¿Se encontró una solución?
+            best_idx = min(range(len(population)), key=lambda i: fitness[i])
+            if fitness[best_idx] == 0:
+                # Recortar los movimientos del mejor cromosoma hasta el punto donde su trayectoria
+                # alcanza el estado meta (puede ser menor o igual a chrom_len si llega antes)
+                codes = bytes(MOVE_INDEX[mv] for mv in population[best_idx])
+                trail = trails[best_idx]
+                depth = trail.index(goal) if goal in trail else len(codes)
+                return Solution(start, codes[:depth], nodes_generated, nodes_expanded, stats, geom)
+
+        # Crear nueva generación aplicando elitismo
+            new_pop: List[List[str]] = []
+            new_fit: List[int] = []
+            new_trails: List[List[AnyState]] = []
+
+        # Elitismo: copiar los mejores individuos según el parámetro 'elitism'
+            if elitism > 0:
+                order = sorted(range(len(population)), key=lambda i: fitness[i])
+                for i in order[: min(elitism, pop_size)]:
+                    new_pop.append(population[i][:])
+                    new_fit.append(fitness[i])
+                    new_trails.append(trails[i])
+
+            while len(new_pop) < pop_size:
+                # Selección por torneo para padres
+                i1 = _tournament(population, fitness, tournament_k)
+                i2 = _tournament(population, fitness, tournament_k)
+
+                # Cruce de un punto entre los padres
+                c1, c2, point = _crossover(population[i1], population[i2])
+                shared1 = shared2 = point
+
+                # Aplicar mutación cada m generaciones
+                if mutate_every > 0 and (gen % mutate_every == 0):
+                    shared1 = min(shared1, _mutate(c1, mutation_rate))
+                    shared2 = min(shared2, _mutate(c2, mutation_rate))
+
+                # Evaluar los descendientes y agregarlos a la nueva población
+                if not prefix_cache:
+                    shared1 = shared2 = 0
+                trail1 = _extend_trail(trails[i1], c1, shared1, geom)
+                if shared1 > 0:
+                    cache_hits += 1
+                else:
+                    cache_misses += 1
+                end1 = trail1[-1]
+                f1 = ctx.h(end1)
                 nodes_generated += 1
                 nodes_expanded += 1
-                new_pop.append(c2)
-                new_fit.append(f2)
+                if on_generate is not None:
+                    on_generate(end1, gen)
+                if on_expand is not None:
+                    on_expand(end1, gen)
+                new_pop.append(c1)
+                new_fit.append(f1)
+                new_trails.append(trail1)
+
+                if len(new_pop) < pop_size:
+                    trail2 = _extend_trail(trails[i2], c2, shared2, geom)
+                    if shared2 > 0:
+                        cache_hits += 1
+                    else:
+                        cache_misses += 1
+                    end2 = trail2[-1]
+                    f2 = ctx.h(end2)
+                    nodes_generated += 1
+                    nodes_expanded += 1
+                    if on_generate is not None:
+                        on_generate(end2, gen)
+                    if on_expand is not None:
+                        on_expand(end2, gen)
+                    new_pop.append(c2)
+                    new_fit.append(f2)
+                    new_trails.append(trail2)
+
+                if nodes_generated >= next_tick:
+                    next_tick = stats.progress(hooks, nodes_generated, nodes_expanded, pop_size)
+                    yield
+
+            # Reemplazo generacional completo: la nueva población sustituye a la anterior
+            population = new_pop
+            fitness = new_fit
+            trails = new_trails
+
+        # Si no se encontró solución tras todas las generaciones, retorna None
+        return None
+    except BudgetExhausted as e:
+        best_idx = min(range(len(fitness)), key=lambda i: fitness[i])
+        return partial_solution(e, start, population[best_idx], fitness[best_idx], nodes_generated, nodes_expanded, stats, geom)
+    finally:
+        # La "frontera" del genético es la población
+        stats.finish(nodes_generated, nodes_expanded, pop_size, cache_hits=cache_hits, cache_misses=cache_misses)
 
-    # Reemplazo generacional completo: la nueva población sustituye a la anterior
-    population = new_pop
-    fitness = new_fit
 
-    # Si no se encontró solución tras todas las generaciones, retorna None
-    return None
\ No newline at end of file
+def genetic_simple(
+    start: AnyState,
+    goal: AnyState,
+    pop_size: int = 100,
+    chrom_len: int = 30,
+    generations: int = 200,
+    mutate_every: int = 1,
+    mutation_rate: float = 0.1,
+    tournament_k: int = 3,
+    elitism: int = 2,
+    prefix_cache: bool = True,
+    ctx: Optional[GoalContext] = None,
+    geom: Optional[Geometry] = None,
+    heuristic: Optional[str] = None,
+    budget: Optional[Budget] = None,
+    stats: Optional[SearchStats] = None,
+    hooks: Optional[SearchHooks] = None,
+) -> Optional[Solution]:
+    """
+    Algoritmo genético simple para el puzzle-8, donde cada cromosoma es una secuencia fija de movimientos.
+    La aptitud (fitness) es la heurística (Manhattan por defecto, ver heuristic) entre el estado alcanzado y el estado meta tras aplicar la secuencia.
+    El algoritmo tiene éxito cuando la aptitud es 0 (se alcanza la meta).
+    Nodos generados: total de descendientes producidos.
+    Nodos expandidos: total de evaluaciones de aptitud realizadas (individuos evaluados).
+    ctx: contexto precalculado de la meta (ver puzzle.GoalContext) reutilizado en cada evaluación.
+    prefix_cache: cada individuo guarda la trayectoria de estados de su cromosoma y un descendiente
+    reanuda la simulación desde el estado de su primer padre en el punto de cruce (o en la primera
+    mutación, si es anterior); False simula siempre desde start. La memoria queda acotada por
+    pop_size * (chrom_len + 1) estados. stats.cache_hits cuenta los descendientes que reutilizaron un
+    tramo y stats.cache_misses los que se simularon completos.
+    budget: límites de tiempo, nodos y memoria (ver puzzle.Budget); al agotarse se retorna un
+    PartialSolution con los movimientos del mejor individuo (best_h es su aptitud).
+    stats / hooks: estadísticas e instrumentación (ver puzzle.SearchStats); on_expand recibe el estado
+    alcanzado por cada individuo evaluado y on_generate el de cada descendiente, junto con la generación.
+    """
+    return run_steps(
+        genetic_simple_steps(
+            start, goal, pop_size, chrom_len, generations, mutate_every, mutation_rate, tournament_k, elitism,
+            prefix_cache, ctx, geom, heuristic, budget, stats, hooks,
+        )
+    )
@@ -0,0 +1,329 @@
+"""
+Algoritmo genético vectorizado con NumPy (opcional: solo este módulo lo necesita).
+
+La población es una matriz (población, longitud) de códigos de movimiento uint8 (ver
+puzzle.MOVE_NAMES) y se simula completa, una columna (gen) a la vez: una tabla de transiciones
+indexada por (posición del vacío, movimiento) da la nueva posición del vacío (la misma si el
+movimiento no es válido, como en apply_move), y la heurística se actualiza en el mismo paso con la
+tabla dist[ficha][celda] del contexto de la meta. Selección por torneo, cruce de un punto y mutación
+se aplican a toda la población con operaciones de arreglos, lo que hace prácticas poblaciones de
+decenas de miles de individuos.
+"""
+from typing import Callable, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # numpy es opcional
+    np = None
+
+from puzzle import (
+    MOVE_INDEX,
+    MOVE_NAMES,
+    AnyState,
+    Budget,
+    BudgetExhausted,
+    Geometry,
+    GoalContext,
+    SearchHooks,
+    SearchStats,
+    SearchSteps,
+    Solution,
+    begin_search,
+    budget_hooks,
+    goal_context,
+    hook_callbacks,
+    like,
+    partial_solution,
+    resolve_geometry,
+    run_steps,
+    to_tuple,
+)
+
+
+def transition_table(geom: Geometry) -> 'np.ndarray':
+    # nxt[vacío, movimiento] = nueva posición del vacío (la misma si el movimiento sale del tablero)
+    nxt = np.tile(np.arange(geom.size, dtype=np.intp)[:, None], (1, len(MOVE_NAMES)))
+    for idx, moves in enumerate(geom.moves):
+        for move, j in moves:
+            nxt[idx, MOVE_INDEX[move]] = j
+    return nxt
+
+
+def _simulate(
+    chrom: 'np.ndarray', board0: 'np.ndarray', blank0: int, h0: int, nxt: 'np.ndarray', dist: 'np.ndarray'
+) -> Tuple['np.ndarray', 'np.ndarray', 'np.ndarray']:
+    # Aplica todos los cromosomas a la vez desde el inicio. Retorna los tableros finales, la h de
+    # dist al final y el primer paso en que cada individuo alcanzó la meta (-1 si nunca).
+    # Los tableros van en un arreglo plano (fila * tamaño + celda): la indexación 1D es más rápida
+    count, length = chrom.shape
+    size = board0.size
+    offsets = np.arange(count, dtype=np.intp) * size
+    board = np.tile(board0, count)
+    blank = np.full(count, blank0, dtype=np.intp)
+    h = np.full(count, h0, dtype=np.int32)
+    first_hit = np.full(count, -1, dtype=np.int32)
+    genes = np.ascontiguousarray(chrom.T)
+    nxt_flat = nxt.ravel()
+    dist_flat = dist.ravel()
+    moves = nxt.shape[1]
+    for t in range(length):
+        nb = nxt_flat[blank * moves + genes[t]]
+        cell_nb = offsets + nb
+        tile = board[cell_nb]
+        # La ficha pasa de nb a la celda del vacío (tile = 0 y sin cambios si el movimiento no es válido)
+        row = tile.astype(np.intp) * size
+        h += dist_flat[row + blank] - dist_flat[row + nb]
+        board[offsets + blank] = tile
+        board[cell_nb] = 0
+        blank = nb
+        hit = h == 0
+        if hit.any():
+            hit &= first_hit < 0
+            first_hit[hit] = t + 1
+    return board.reshape(count, size), h, first_hit
+
+
+class NumpyPopulation:
+    """
+    Población del genético vectorizado: cromosomas (población, longitud) uint8, aptitud y primer
+    paso en la meta de cada individuo. step() produce la siguiente generación; best() e immigrate()
+    permiten intercambiar individuos entre poblaciones (modelo de islas, ver searches/islands.py).
+    Los contadores nodes_generated / nodes_expanded acumulan descendientes e individuos evaluados.
+    """
+
+    def __init__(
+        self,
+        start: AnyState,
+        goal: AnyState,
+        geom: Geometry,
+        ctx: GoalContext,
+        rng: 'np.random.Generator',
+        pop_size: int = 2000,
+        chrom_len: int = 40,
+        mutate_every: int = 1,
+        mutation_rate: float = 0.05,
+        tournament_k: int = 3,
+        elitism: int = 2,
+        on_expand: Optional[Callable[[AnyState, int], None]] = None,
+        on_generate: Optional[Callable[[AnyState, int], None]] = None,
+    ):
+        if np is None:
+            raise ImportError("El genético vectorizado requiere numpy (pip install numpy).")
+        if pop_size <= 0 or chrom_len <= 0 or not 0 <= elitism <= pop_size or tournament_k <= 0:
+            raise ValueError("pop_size, chrom_len y tournament_k deben ser positivos y elitism debe estar en 0..pop_size.")
+        self.start = start
+        self.geom = geom
+        self.ctx = ctx
+        self.rng = rng
+        self.pop_size = pop_size
+        self.chrom_len = chrom_len
+        self.mutate_every = mutate_every
+        self.mutation_rate = mutation_rate
+        self.tournament_k = tournament_k
+        self.elitism = elitism
+        self.on_expand = on_expand
+        self.on_generate = on_generate
+        self.n_children = pop_size - elitism
+        self.n_pairs = (self.n_children + 1) // 2
+
+        # La meta se detecta con una tabla aditiva que vale 0 solo en la meta: la del contexto si es
+        # incremental y, si no, la de Manhattan
+        table = ctx.dist if ctx.incremental else GoalContext(goal, geom).dist
+        self.dist = np.array(table, dtype=np.int32)
+        self.board0 = np.array(to_tuple(start, geom), dtype=np.uint8)
+        self.blank0 = int(np.flatnonzero(self.board0 == 0)[0])
+        self.h0 = int(self.dist[self.board0, np.arange(geom.size)].sum())
+        self.nxt = transition_table(geom)
+
+        self.generation = 0
+        self.nodes_generated = 0
+        self.nodes_expanded = 0
+        self.population = self.random_chromosomes(pop_size)
+        self.fitness, self.first_hit = self.evaluate(self.population)
+
+    def random_chromosomes(self, count: int) -> 'np.ndarray':
+        return self.rng.integers(0, len(MOVE_NAMES), size=(count, self.chrom_len), dtype=np.uint8)
+
+    def evaluate(self, chrom: 'np.ndarray') -> Tuple['np.ndarray', 'np.ndarray']:
+        # Aptitud y primer paso en la meta de cada cromosoma
+        board, h, first_hit = _simulate(chrom, self.board0, self.blank0, self.h0, self.nxt, self.dist)
+        self.nodes_expanded += len(chrom)
+        if not self.ctx.incremental:
+            unique, inverse = np.unique(board, axis=0, return_inverse=True)
+            h = np.array([self.ctx.h(tuple(int(v) for v in b)) for b in unique], dtype=np.int32)[inverse.ravel()]
+        if self.on_expand is not None or self.on_generate is not None:
+            for b in board:
+                st = tuple(int(v) for v in b)
+                if self.on_generate is not None and self.generation > 0:
+                    self.on_generate(st, self.generation)
+                if self.on_expand is not None:
+                    self.on_expand(st, self.generation)
+        return h, first_hit
+
+    def solution(self) -> Optional[List[str]]:
+        # Movimientos del individuo que llega a la meta en menos genes (sin los inválidos) o None
+        if not (self.first_hit >= 0).any():
+            return None
+        best = int(np.argmin(np.where(self.first_hit >= 0, self.first_hit, self.chrom_len + 1)))
+        blank = self.blank0
+        moves: List[str] = []
+        for code in self.population[best, : self.first_hit[best]]:
+            nb = int(self.nxt[blank, code])
+            if nb != blank:
+                moves.append(MOVE_NAMES[code])
+                blank = nb
+        return moves
+
+    def step(self) -> None:
+        # Produce la siguiente generación (élites + descendientes)
+        rng, pop_size, chrom_len = self.rng, self.pop_size, self.chrom_len
+        n_children, n_pairs, elitism = self.n_children, self.n_pairs, self.elitism
+        self.generation += 1
+        gen = self.generation
+        population, fitness = self.population, self.fitness
+
+    # Elitismo: los mejores pasan sin cambios (orden estable entre iguales)
+        elite = np.argsort(fitness, kind='stable')[:elitism]
+
+    # Selección por torneo: cada fila son tournament_k candidatos y gana el de menor aptitud
+        cand = rng.integers(0, pop_size, size=(2 * n_pairs, self.tournament_k))
+        winners = cand[np.arange(2 * n_pairs), np.argmin(fitness[cand], axis=1)]
+        p1 = population[winners[:n_pairs]]
+        p2 = population[winners[n_pairs:]]
+
+    # Cruce de un punto (con longitud 1 los hijos son copias de los padres)
+        if chrom_len > 1:
+            point = rng.integers(1, chrom_len, size=n_pairs)
+            mask = np.arange(chrom_len)[None, :] < point[:, None]
+            children = np.concatenate([np.where(mask, p1, p2), np.where(mask, p2, p1)])[:n_children]
+        else:
+            children = np.concatenate([p1, p2])[:n_children]
+
+    # Mutación cada m generaciones: cada gen cambia con probabilidad mutation_rate
+        if self.mutate_every > 0 and gen % self.mutate_every == 0:
+            mutated = rng.random(children.shape) < self.mutation_rate
+            children[mutated] = rng.integers(0, len(MOVE_NAMES), size=int(mutated.sum()), dtype=np.uint8)
+
+        child_fit, child_hit = self.evaluate(children)
+        self.nodes_generated += n_children
+        self.population = np.concatenate([population[elite], children])
+        self.fitness = np.concatenate([fitness[elite], child_fit])
+        # Los élites ya se revisaron en su generación: solo cuentan los nuevos descendientes
+        self.first_hit = np.concatenate([np.full(elitism, -1, dtype=np.int32), child_hit])
+
+    def best(self, count: int) -> 'np.ndarray':
+        # Copia de los count mejores cromosomas
+        return self.population[np.argsort(self.fitness, kind='stable')[:count]].copy()
+
+    def immigrate(self, chrom: 'np.ndarray') -> None:
+        # Reemplaza a los peores individuos por los inmigrantes, ajustados a la longitud propia
+        # (se recortan o se completan con genes al azar) y evaluados con la heurística propia
+        count = min(len(chrom), self.pop_size)
+        if count == 0:
+            return
+        chrom = chrom[:count, : self.chrom_len]
+        if chrom.shape[1] < self.chrom_len:
+            pad = self.rng.integers(0, len(MOVE_NAMES), size=(count, self.chrom_len - chrom.shape[1]), dtype=np.uint8)
+            chrom = np.concatenate([chrom, pad], axis=1)
+        fit, hit = self.evaluate(chrom)
+        worst = np.argsort(self.fitness, kind='stable')[self.pop_size - count:]
+        self.population[worst] = chrom
+        self.fitness[worst] = fit
+        self.first_hit[worst] = hit
+
+
+def genetic_numpy_steps(
+    start: AnyState,
+    goal: AnyState,
+    pop_size: int = 2000,
+    chrom_len: int = 40,
+    generations: int = 200,
+    mutate_every: int = 1,
+    mutation_rate: float = 0.05,
+    tournament_k: int = 3,
+    elitism: int = 2,
+    seed: Optional[int] = None,
+    ctx: Optional[GoalContext] = None,
+    geom: Optional[Geometry] = None,
+    heuristic: Optional[str] = None,
+    budget: Optional[Budget] = None,
+    stats: Optional[SearchStats] = None,
+    hooks: Optional[SearchHooks] = None,
+) -> SearchSteps:
+    # Forma incremental de genetic_numpy (mismos parámetros): se suspende en cada aviso de progreso
+    if np is None:
+        raise ImportError("genetic_numpy requiere numpy (pip install numpy).")
+    stats = begin_search(stats)
+    geom = resolve_geometry(start, geom, ctx)
+    goal = like(goal, start, geom)  # La meta en la misma representación (tupla o empaquetada) que el inicio
+    if start == goal:
+        return Solution(start, [], nodes_generated=0, nodes_expanded=0, stats=stats.finish(0, 0), geom=geom)
+    ctx = goal_context(goal, ctx, geom, heuristic)
+    hooks = budget_hooks(hooks, budget)
+    on_expand, on_generate, next_tick = hook_callbacks(hooks)
+    pop: Optional[NumpyPopulation] = None
+
+    try:
+        pop = NumpyPopulation(
+            start, goal, geom, ctx, np.random.default_rng(seed), pop_size, chrom_len,
+            mutate_every, mutation_rate, tournament_k, elitism, on_expand, on_generate,
+        )
+        while True:
+            moves = pop.solution()
+            if moves is not None:
+                return Solution(start, moves, pop.nodes_generated, pop.nodes_expanded, stats, geom)
+            if pop.generation >= generations or pop.n_children == 0:
+                return None
+            pop.step()
+            if pop.nodes_generated >= next_tick:
+                next_tick = stats.progress(hooks, pop.nodes_generated, pop.nodes_expanded, pop_size)
+                yield
+    except BudgetExhausted as e:
+        best_idx = int(np.argmin(pop.fitness))
+        moves = [MOVE_NAMES[c] for c in pop.population[best_idx]]
+        return partial_solution(e, start, moves, int(pop.fitness[best_idx]), pop.nodes_generated, pop.nodes_expanded, stats, geom)
+    finally:
+        # La "frontera" del genético es la población
+        if pop is None:
+            stats.finish(0, 0, pop_size)
+        else:
+            stats.finish(pop.nodes_generated, pop.nodes_expanded, pop_size)
+
+
+def genetic_numpy(
+    start: AnyState,
+    goal: AnyState,
+    pop_size: int = 2000,
+    chrom_len: int = 40,
+    generations: int = 200,
+    mutate_every: int = 1,
+    mutation_rate: float = 0.05,
+    tournament_k: int = 3,
+    elitism: int = 2,
+    seed: Optional[int] = None,
+    ctx: Optional[GoalContext] = None,
+    geom: Optional[Geometry] = None,
+    heuristic: Optional[str] = None,
+    budget: Optional[Budget] = None,
+    stats: Optional[SearchStats] = None,
+    hooks: Optional[SearchHooks] = None,
+) -> Optional[Solution]:
+    """
+    Genético con los mismos parámetros que genetic_simple, evaluado en bloque con NumPy.
+    La aptitud es la heurística del estado alcanzado (heuristic, ver puzzle.HEURISTICS); con las
+    heurísticas aditivas por ficha (Manhattan, fichas fuera de lugar) se calcula en forma
+    vectorizada durante la simulación, con las demás se evalúa sobre los tableros finales distintos.
+    Tiene éxito cuando algún individuo pasa por la meta en cualquier paso; la solución es la del
+    individuo que llega en menos genes, sin los movimientos inválidos (que no cambian el estado).
+    seed: semilla del generador de NumPy (None = al azar).
+    Nodos generados: descendientes producidos. Nodos expandidos: individuos evaluados.
+    budget: como en genetic_simple; se revisa al terminar cada generación.
+    stats / hooks: como en genetic_simple (los callbacks por individuo, si se indican, reciben el
+    estado alcanzado como tupla y anulan buena parte de la ventaja de la vectorización).
+    """
+    return run_steps(
+        genetic_numpy_steps(
+            start, goal, pop_size, chrom_len, generations, mutate_every, mutation_rate, tournament_k, elitism,
+            seed, ctx, geom, heuristic, budget, stats, hooks,
+        )
+    )
@@ -1,68 +1,154 @@
-from typing import List, Tuple, Optional, Dict
-from puzzle import State, Solution, neighbors, manhattan_distance
+from array import array
+from typing import List, Tuple, Optional, Set, Union
+from puzzle import (
+    MOVE_INDEX,
+    AnyState,
+    Budget,
+    BudgetExhausted,
+    Geometry,
+    GoalContext,
+    SearchHooks,
+    SearchStats,
+    SearchSteps,
+    Solution,
+    begin_search,
+    budget_hooks,
+    goal_context,
+    hook_callbacks,
+    like,
+    partial_solution,
+    resolve_geometry,
+    run_steps,
+    trace_codes,
+)
+from ranking import RankedSet
 
 
-def hill_climbing(start: State, goal: State, max_nodes: Optional[int] = None) -> Optional[Solution]:
-    """
-    Algoritmo de ascenso de colina para el puzzle-8 según el pseudocódigo visto en clase:
-    - Utiliza listas ABIERTO y CERRADO
-    - Quita el primer elemento de ABIERTO
-    - Si no está en CERRADO: lo agrega, expande, calcula heurísticas, ordena ascendente y mueve sucesores al inicio
-    Nota: Se utiliza la distancia de Manhattan como heurística.
-    """
+def hill_climbing_steps(
+    start: AnyState,
+    goal: AnyState,
+    max_nodes: Optional[int] = None,
+    ctx: Optional[GoalContext] = None,
+    geom: Optional[Geometry] = None,
+    heuristic: Optional[str] = None,
+    budget: Optional[Budget] = None,
+    stats: Optional[SearchStats] = None,
+    hooks: Optional[SearchHooks] = None,
+    compact_visited: bool = False,
+) -> SearchSteps:
+    # Forma incremental de hill_climbing (mismos parámetros): se suspende en cada aviso de progreso
+    stats = begin_search(stats)
+    geom = resolve_geometry(start, geom, ctx)
+    goal = like(goal, start, geom)  # La meta en la misma representación (tupla o empaquetada) que el inicio
     if start == goal:
-        return Solution([start], [], nodes_generated=0, nodes_expanded=0)
+        return Solution(start, [], nodes_generated=0, nodes_expanded=0, stats=stats.finish(0, 0), geom=geom)
+    ctx = goal_context(goal, ctx, geom, heuristic)
 
-    abierto: List[Tuple[State, Optional[int], Optional[str], int]] = [(start, None, None, 0)]
-    cerrado: Dict[State, int] = {}  # Guardamos la profundidad alcanzada solo como referencia
-    explored: List[Tuple[State, Optional[int], Optional[str], int]] = []
+    # ABIERTO se toma por el frente y los sucesores ordenados van al frente: equivale a una pila en la
+    # que se apilan en orden inverso. La pila son arreglos paralelos: el estado, un enlace (índice del
+    # padre * 4 + código del movimiento) y la heurística. Los nodos explorados solo guardan padre,
+    # código y profundidad en arreglos compactos; el camino se reconstruye al final
+    abierto: List[AnyState] = [start]
+    ab_link = array('q', [-4])
+    ab_h = array('i', [ctx.h(start)])
+    parents = array('i')
+    codes = bytearray()
+    depths = array('i')
+    # compact_visited: CERRADO como bitset indexado por rango en lugar de un conjunto
+    cerrado: Union[Set[AnyState], RankedSet] = RankedSet(geom, isinstance(start, int)) if compact_visited else set()
     nodes_generated = 0
     nodes_expanded = 0
+    duplicate_hits = 0
+    peak_frontier = 1
+    best_h, best_idx = ab_h[0], 0  # Mejor progreso, por si se agota el presupuesto
+    hooks = budget_hooks(hooks, budget)
+    on_expand, on_generate, next_tick = hook_callbacks(hooks)
+
+    try:
+        while abierto:
+            current = abierto.pop()
+            link = ab_link.pop()
+            h_current = ab_h.pop()
+            parent_idx = link >> 2
+            depth = depths[parent_idx] + 1 if parent_idx >= 0 else 0
 
-    while abierto:
-        current, parent_idx, move, depth = abierto.pop(0)
+            if current in cerrado:
+                duplicate_hits += 1
+                continue
 
-        if current in cerrado:
-            continue
+            idx_current = len(parents)
+            parents.append(parent_idx)
+            codes.append(link & 3)
+            depths.append(depth)
+            cerrado.add(current)
 
-        idx_current = len(explored)
-        explored.append((current, parent_idx, move, depth))
-        cerrado[current] = depth
+            if current == goal:
+                return Solution(start, trace_codes(parents, codes, idx_current), nodes_generated, nodes_expanded, stats, geom)
+            if h_current < best_h:
+                best_h, best_idx = h_current, idx_current
 
-        if current == goal:
-            path_states: List[State] = []
-            path_moves: List[str] = []
-            i = idx_current
-            while i is not None:
-                st, p_idx, mv, _ = explored[i]
-                path_states.append(st)
-                if mv is not None:
-                    path_moves.append(mv)
-                i = p_idx
-            path_states.reverse()
-            path_moves.reverse()
-            return Solution(path_states, path_moves, nodes_generated, nodes_expanded)
+            nodes_expanded += 1
+            if on_expand is not None:
+                on_expand(current, depth)
+            succs = ctx.successors(current, h_current)
+        # La heurística de cada sucesor ya viene calculada
+            scored: List[Tuple[int, Tuple[str, AnyState]]] = []
+            for mv, st, h in succs:
+                nodes_generated += 1
+                if max_nodes is not None and nodes_generated > max_nodes:
+                    return None
+                if on_generate is not None:
+                    on_generate(st, depth + 1)
+                if nodes_generated >= next_tick:
+                    next_tick = stats.progress(hooks, nodes_generated, nodes_expanded, len(abierto), len(cerrado))
+                    yield
+                scored.append((h, (mv, st)))
 
-        nodes_expanded += 1
-        succs = neighbors(current)
-    # Calcular la heurística para cada sucesor
-        scored: List[Tuple[int, Tuple[str, State]]] = []
-        for mv, st in succs:
-            nodes_generated += 1
-            if max_nodes is not None and nodes_generated > max_nodes:
-                return None
-            h = manhattan_distance(st, goal)
-            scored.append((h, (mv, st)))
+            if scored:
+                # Ordenar por heurística ascendente (orden estable) y apilar en orden inverso,
+                # de modo que el de menor heurística quede en el tope
+                scored.sort(key=lambda x: x[0])
+                base = idx_current << 2
+                for h, (mv, st) in reversed(scored):
+                    if st in cerrado:
+                        duplicate_hits += 1
+                        continue
+                    abierto.append(st)
+                    ab_link.append(base | MOVE_INDEX[mv])
+                    ab_h.append(h)
+                if len(abierto) > peak_frontier:
+                    peak_frontier = len(abierto)
 
-        if scored:
-            # Ordenar por heurística ascendente
-            scored.sort(key=lambda x: x[0])
-            # Convertir a lista de entradas y poner al inicio de ABIERTO
-            nuevos: List[Tuple[State, Optional[int], Optional[str], int]] = []
-            for _, (mv, st) in scored:
-                if st in cerrado:
-                    continue
-                nuevos.append((st, idx_current, mv, depth + 1))
-            abierto = nuevos + abierto
+        return None
+    except BudgetExhausted as e:
+        return partial_solution(e, start, trace_codes(parents, codes, best_idx), best_h, nodes_generated, nodes_expanded, stats, geom)
+    finally:
+        stats.finish(nodes_generated, nodes_expanded, peak_frontier, len(cerrado), 0, duplicate_hits)
 
-    return None
\ No newline at end of file
+
+def hill_climbing(
+    start: AnyState,
+    goal: AnyState,
+    max_nodes: Optional[int] = None,
+    ctx: Optional[GoalContext] = None,
+    geom: Optional[Geometry] = None,
+    heuristic: Optional[str] = None,
+    budget: Optional[Budget] = None,
+    stats: Optional[SearchStats] = None,
+    hooks: Optional[SearchHooks] = None,
+    compact_visited: bool = False,
+) -> Optional[Solution]:
+    """
+    Algoritmo de ascenso de colina para el puzzle-8 según el pseudocódigo visto en clase:
+    - Utiliza listas ABIERTO y CERRADO
+    - Quita el primer elemento de ABIERTO
+    - Si no está en CERRADO: lo agrega, expande, calcula heurísticas, ordena ascendente y mueve sucesores al inicio
+    Nota: Se utiliza la distancia de Manhattan como heurística (o la indicada en heuristic, ver
+    puzzle.HEURISTICS), actualizada de forma incremental con el contexto precalculado de la meta (ctx).
+    budget: límites de tiempo, nodos y memoria (ver puzzle.Budget); al agotarse se retorna un
+    PartialSolution hasta el estado expandido de menor heurística.
+    stats / hooks: estadísticas de la ejecución y callbacks de instrumentación (ver puzzle.SearchStats).
+    compact_visited: CERRADO como ranking.RankedSet, un bit por estado posible (23 KB en el 3x3;
+    tableros de hasta 12 celdas), para ejecuciones largas.
+    """
+    return run_steps(hill_climbing_steps(start, goal, max_nodes, ctx, geom, heuristic, budget, stats, hooks, compact_visited))
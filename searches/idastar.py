@@ -0,0 +1,186 @@
+from typing import Generator, Iterator, List, Optional, Tuple
+from puzzle import (
+    AnyState,
+    Budget,
+    BudgetExhausted,
+    Geometry,
+    GoalContext,
+    SearchHooks,
+    SearchStats,
+    SearchSteps,
+    Solution,
+    begin_search,
+    budget_hooks,
+    goal_context,
+    hook_callbacks,
+    is_solvable,
+    like,
+    partial_solution,
+    resolve_geometry,
+    run_steps,
+    to_tuple,
+)
+
+_FOUND = -1
+_ABORTED = -2
+
+
+def idastar_steps(
+    start: AnyState,
+    goal: AnyState,
+    ctx: Optional[GoalContext] = None,
+    max_nodes: Optional[int] = None,
+    geom: Optional[Geometry] = None,
+    heuristic: Optional[str] = None,
+    budget: Optional[Budget] = None,
+    stats: Optional[SearchStats] = None,
+    hooks: Optional[SearchHooks] = None,
+) -> SearchSteps:
+    # Forma incremental de idastar (mismos parámetros): se suspende en cada aviso de progreso
+    stats = begin_search(stats)
+    geom = resolve_geometry(start, geom, ctx)
+    goal = like(goal, start, geom)  # La meta en la misma representación (tupla o empaquetada) que el inicio
+    if start == goal:
+        return Solution(start, [], nodes_generated=0, nodes_expanded=0, stats=stats.finish(0, 0), geom=geom)
+    # Sin solución, las iteraciones nunca terminarían
+    if not is_solvable(start, goal, geom):
+        stats.finish(0, 0)
+        return None
+    ctx = goal_context(goal, ctx, geom, heuristic)
+
+    board: List[int] = list(to_tuple(start, geom))
+    goal_board: List[int] = list(ctx.goal)
+    table = ctx.moves
+    incremental = ctx.incremental
+    path_moves: List[str] = []
+    iterations: List[Tuple[int, int]] = []
+    nodes_generated = 0
+    nodes_expanded = 0
+    max_depth = 0
+    bound = 0
+    best_h = ctx.h(start)  # Mejor progreso (h y camino), por si se agota el presupuesto
+    best_moves: List[str] = []
+    hooks = budget_hooks(hooks, budget)
+    on_expand, on_generate, next_tick = hook_callbacks(hooks)
+
+    def search(blank: int, h: int) -> Generator[None, None, int]:
+        # DFS acotado por la cota desde el inicio, con una pila explícita para poder suspenderse en los
+        # avisos de progreso. Retorna _FOUND, _ABORTED o el menor f que excedió la cota
+        nonlocal nodes_generated, nodes_expanded, max_depth, next_tick, best_h, best_moves
+        if h > bound:
+            return h
+        if h == 0 and board == goal_board:
+            return _FOUND
+        # Pila de los ancestros: (vacío, vacío anterior, h, movimientos pendientes, menor f excedido)
+        stack: List[Tuple[int, int, int, Iterator[Tuple[str, int]], int]] = []
+        prev_blank, g, minimum = -1, 0, -1
+        if h < best_h:
+            best_h, best_moves = h, path_moves[:]
+        nodes_expanded += 1
+        if g >= max_depth:
+            max_depth = g + 1
+        if on_expand is not None:
+            on_expand(tuple(board), g)
+        pending = iter(table[blank])
+        while True:
+            for mv, j in pending:
+                # Evita deshacer el movimiento anterior
+                if j == prev_blank:
+                    continue
+                nodes_generated += 1
+                if max_nodes is not None and nodes_generated > max_nodes:
+                    return _ABORTED
+                if nodes_generated >= next_tick:
+                    next_tick = stats.progress(hooks, nodes_generated, nodes_expanded, g + 1)
+                    yield
+                tile = board[j]
+                board[blank] = tile
+                board[j] = 0
+                if on_generate is not None:
+                    on_generate(tuple(board), g + 1)
+                h_nb = h + ctx.move_delta(tile, j, blank) if incremental else ctx.h(tuple(board))
+                path_moves.append(mv)
+                f = g + 1 + h_nb
+                if f <= bound:
+                    if h_nb == 0 and board == goal_board:
+                        return _FOUND
+                    # Desciende al sucesor
+                    stack.append((blank, prev_blank, h, pending, minimum))
+                    blank, prev_blank, g, h, minimum = j, blank, g + 1, h_nb, -1
+                    if h < best_h:
+                        best_h, best_moves = h, path_moves[:]
+                    nodes_expanded += 1
+                    if g >= max_depth:
+                        max_depth = g + 1
+                    if on_expand is not None:
+                        on_expand(tuple(board), g)
+                    pending = iter(table[blank])
+                    break
+                path_moves.pop()
+                board[j] = tile
+                board[blank] = 0
+                if minimum < 0 or f < minimum:
+                    minimum = f
+            else:
+                # Sucesores agotados: vuelve al padre con el menor f excedido en el subárbol
+                if not stack:
+                    return minimum
+                t, j = minimum, blank
+                blank, prev_blank, h, pending, minimum = stack.pop()
+                g -= 1
+                path_moves.pop()
+                board[j] = board[blank]
+                board[blank] = 0
+                if minimum < 0 or t < minimum:
+                    minimum = t
+
+    h_start = best_h
+    bound = h_start
+    blank_start = board.index(0)
+    try:
+        while True:
+            expanded_before = nodes_expanded
+            t = yield from search(blank_start, h_start)
+            iterations.append((bound, nodes_expanded - expanded_before))
+            if t == _FOUND:
+                sol = Solution(start, path_moves, nodes_generated, nodes_expanded, stats, geom)
+                sol.iterations = iterations
+                return sol
+            if t == _ABORTED or t < 0:
+                return None
+            bound = t
+    except BudgetExhausted as e:
+        return partial_solution(e, start, best_moves, best_h, nodes_generated, nodes_expanded, stats, geom)
+    finally:
+        # Todo lo expandido antes de la última iteración se vuelve a expandir en la siguiente
+        last = iterations[-1][1] if iterations else 0
+        stats.finish(nodes_generated, nodes_expanded, max_depth, 0, nodes_expanded - last)
+
+
+def idastar(
+    start: AnyState,
+    goal: AnyState,
+    ctx: Optional[GoalContext] = None,
+    max_nodes: Optional[int] = None,
+    geom: Optional[Geometry] = None,
+    heuristic: Optional[str] = None,
+    budget: Optional[Budget] = None,
+    stats: Optional[SearchStats] = None,
+    hooks: Optional[SearchHooks] = None,
+) -> Optional[Solution]:
+    """
+    A* por profundización iterativa (IDA*): búsquedas en profundidad acotadas por f = g + h, donde
+    la cota de cada iteración es el menor f que superó la cota anterior.
+    Usa un único tablero mutable con movimientos aplicados y deshechos en el lugar, y nunca
+    devuelve el vacío a la celda de la que acaba de salir. Solo guarda el camino actual, por lo
+    que la memoria es O(profundidad de la solución) sin importar cuántos nodos se expanden.
+    La heurística es la misma que usa astar (ctx o heuristic); si admite actualización incremental se
+    actualiza en O(1) con la ficha movida.
+    El resultado trae en iterations la lista de (cota, nodos expandidos en la iteración).
+    budget: límites de tiempo, nodos y memoria (ver puzzle.Budget); al agotarse se retorna un
+    PartialSolution hasta el estado expandido de menor h (en cualquier iteración).
+    stats / hooks: estadísticas e instrumentación (ver puzzle.SearchStats); la frontera es el camino
+    actual, las re-expansiones son los nodos ya expandidos en iteraciones anteriores y los hooks
+    reciben el tablero como tupla.
+    """
+    return run_steps(idastar_steps(start, goal, ctx, max_nodes, geom, heuristic, budget, stats, hooks))
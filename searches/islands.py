@@ -0,0 +1,312 @@
+"""
+Algoritmo genético de islas: varias poblaciones del genético vectorizado (ver genetic_numpy)
+evolucionan en procesos separados, cada una con sus propios parámetros y su propia semilla, y cada
+migration_every generaciones envían sus migrants mejores individuos a la isla siguiente (anillo)
+por colas de multiprocessing, reemplazando a los peores de la receptora.
+
+La migración es síncrona (cada isla espera a los inmigrantes de la anterior), de modo que la
+evolución de cada isla depende solo de las semillas: con la misma seed el resultado es el mismo.
+La parada es global: la primera isla que alcanza la meta publica su generación y las demás se
+detienen al llegar a ella; gana la de menor generación (a igualdad, la de menor índice).
+"""
+import multiprocessing
+import queue
+import random
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # numpy es opcional
+    np = None
+
+from puzzle import (
+    AnyState,
+    Budget,
+    BudgetExhausted,
+    Geometry,
+    SearchHooks,
+    SearchStats,
+    SearchSteps,
+    Solution,
+    begin_search,
+    budget_hooks,
+    goal_context,
+    hook_callbacks,
+    like,
+    partial_solution,
+    process_memory,
+    resolve_geometry,
+    run_steps,
+)
+from searches.genetic_numpy import NumpyPopulation
+
+# Parámetros que cada isla puede cambiar (island_params)
+ISLAND_KEYS = ('pop_size', 'chrom_len', 'mutate_every', 'mutation_rate', 'tournament_k', 'elitism', 'heuristic')
+
+# Sin parada global pendiente
+_NO_STOP = 2**31 - 1
+
+# Espera máxima (s) por los informes de las islas tras agotarse el presupuesto
+_REPORT_GRACE = 0.5
+
+# Informe de una isla: (índice, generación, movimientos o None, nodos generados, nodos expandidos,
+# error o None, aptitud del mejor individuo, códigos de movimiento del mejor individuo)
+IslandReport = Tuple[int, int, Optional[List[str]], int, int, Optional[str], int, bytes]
+
+
+def _island(
+    index: int,
+    count: int,
+    start: AnyState,
+    goal: AnyState,
+    geom: Geometry,
+    params: Dict[str, Any],
+    seed: int,
+    generations: int,
+    migration_every: int,
+    migrants: int,
+    inboxes: Sequence[Any],
+    stop_gen: Any,
+    progress: Any,
+    results: Any,
+    track_memory: bool = False,
+) -> None:
+    # Proceso de una isla: evoluciona, migra y publica su resultado en results. En progress publica
+    # nodos generados, expandidos y, si track_memory, el crecimiento de su memoria desde que empezó
+    pop: Optional[NumpyPopulation] = None
+    memory_base = process_memory() if track_memory else None
+
+    def report(moves: Optional[List[str]], error: Optional[str] = None) -> None:
+        if pop is None:
+            results.put((index, 0, moves, 0, 0, error, _NO_STOP, b''))
+            return
+        best = int(np.argmin(pop.fitness))
+        best_codes = pop.population[best].tobytes()
+        results.put((index, pop.generation, moves, pop.nodes_generated, pop.nodes_expanded, error, int(pop.fitness[best]), best_codes))
+
+    try:
+        params = dict(params)
+        ctx = goal_context(goal, None, geom, params.pop('heuristic', None))
+        pop = NumpyPopulation(start, goal, geom, ctx, np.random.default_rng([seed, index]), **params)
+        migrate = count > 1 and migration_every > 0 and migrants > 0
+        while True:
+            progress[3 * index] = pop.nodes_generated
+            progress[3 * index + 1] = pop.nodes_expanded
+            if memory_base is not None:
+                mem = process_memory()
+                if mem is not None:
+                    progress[3 * index + 2] = max(0, mem - memory_base)
+            moves = pop.solution()
+            if moves is not None:
+                with stop_gen.get_lock():
+                    if pop.generation < stop_gen.value:
+                        stop_gen.value = pop.generation
+                report(moves)
+                return
+            if pop.generation >= generations or pop.generation >= stop_gen.value or pop.n_children == 0:
+                report(None)
+                return
+            pop.step()
+            if migrate and pop.generation % migration_every == 0:
+                inboxes[(index + 1) % count].put(pop.best(migrants))
+                # La isla anterior envía siempre que la parada global no sea anterior a esta generación
+                while True:
+                    try:
+                        chrom = inboxes[index].get(timeout=0.05)
+                        break
+                    except queue.Empty:
+                        if stop_gen.value < pop.generation:
+                            report(None)
+                            return
+                pop.immigrate(chrom)
+    except Exception as e:
+        with stop_gen.get_lock():
+            stop_gen.value = -1
+        report(None, f"{type(e).__name__}: {e}")
+
+
+def genetic_islands_steps(
+    start: AnyState,
+    goal: AnyState,
+    islands: int = 4,
+    island_params: Optional[Sequence[Dict[str, Any]]] = None,
+    pop_size: int = 2000,
+    chrom_len: int = 40,
+    generations: int = 200,
+    mutate_every: int = 1,
+    mutation_rate: float = 0.05,
+    tournament_k: int = 3,
+    elitism: int = 2,
+    migration_every: int = 10,
+    migrants: int = 5,
+    seed: Optional[int] = None,
+    geom: Optional[Geometry] = None,
+    heuristic: Optional[str] = None,
+    budget: Optional[Budget] = None,
+    stats: Optional[SearchStats] = None,
+    hooks: Optional[SearchHooks] = None,
+) -> SearchSteps:
+    # Forma incremental de genetic_islands (mismos parámetros): se suspende en cada aviso de progreso
+    if np is None:
+        raise ImportError("genetic_islands requiere numpy (pip install numpy).")
+    if island_params is not None:
+        islands = len(island_params)
+        for p in island_params:
+            unknown = sorted(set(p) - set(ISLAND_KEYS))
+            if unknown:
+                raise ValueError(f"Parámetros de isla no soportados: {', '.join(unknown)} (use {', '.join(ISLAND_KEYS)}).")
+    if islands <= 0:
+        raise ValueError("Debe haber al menos una isla.")
+    if migration_every < 0 or migrants < 0:
+        raise ValueError("migration_every y migrants no pueden ser negativos.")
+    stats = begin_search(stats)
+    geom = resolve_geometry(start, geom)
+    goal = like(goal, start, geom)  # La meta en la misma representación (tupla o empaquetada) que el inicio
+    if start == goal:
+        return Solution(start, [], nodes_generated=0, nodes_expanded=0, stats=stats.finish(0, 0), geom=geom)
+    if seed is None:
+        seed = random.randrange(2**32)
+
+    base = {
+        'pop_size': pop_size,
+        'chrom_len': chrom_len,
+        'mutate_every': mutate_every,
+        'mutation_rate': mutation_rate,
+        'tournament_k': tournament_k,
+        'elitism': elitism,
+        'heuristic': heuristic,
+    }
+    params = [dict(base, **(island_params[i] if island_params is not None else {})) for i in range(islands)]
+    total_pop = sum(p['pop_size'] for p in params)
+
+    mp = multiprocessing.get_context()
+    stop_gen = mp.Value('i', _NO_STOP)
+    progress = mp.Array('q', 3 * islands, lock=False)
+    track_memory = budget is not None and budget.max_memory is not None
+    results = mp.Queue()
+    inboxes = [mp.Queue() for _ in range(islands)]
+    procs = [
+        mp.Process(
+            target=_island,
+            args=(
+                i, islands, start, goal, geom, params[i], seed, generations, migration_every, migrants,
+                inboxes, stop_gen, progress, results, track_memory,
+            ),
+            daemon=True,
+        )
+        for i in range(islands)
+    ]
+    reports: Dict[int, IslandReport] = {}
+    nodes_generated = 0
+    nodes_expanded = 0
+    hooks = budget_hooks(hooks, budget)
+    _, _, next_tick = hook_callbacks(hooks)
+
+    try:
+        for p in procs:
+            p.start()
+        while len(reports) < islands:
+            try:
+                rep = results.get(timeout=0.1)
+                reports[rep[0]] = rep
+                continue
+            except queue.Empty:
+                pass
+            if any(not p.is_alive() and p.exitcode != 0 and i not in reports for i, p in enumerate(procs)):
+                raise RuntimeError("Una isla terminó inesperadamente.")
+            nodes_generated, nodes_expanded = sum(progress[0::3]), sum(progress[1::3])
+            if nodes_generated >= next_tick:
+                next_tick = stats.progress(hooks, nodes_generated, nodes_expanded, total_pop)
+                yield
+            if budget is not None:
+                budget.check(nodes_generated)
+                # La memoria es la de las islas (la del proceso principal casi no crece)
+                memory = sum(progress[2::3])
+                if track_memory and memory > budget.max_memory:
+                    raise BudgetExhausted('memory', f'Se alcanzó el límite de memoria de las islas ({memory / 2**20:.0f} MB).')
+
+        nodes_generated = sum(r[3] for r in reports.values())
+        nodes_expanded = sum(r[4] for r in reports.values())
+        errors = [r[5] for r in reports.values() if r[5] is not None]
+        if errors:
+            raise RuntimeError(f"Error en una isla: {errors[0]}")
+        solved = [r for r in reports.values() if r[2] is not None]
+        if not solved:
+            return None
+        winner = min(solved, key=lambda r: (r[1], r[0]))
+        sol = Solution(start, winner[2], nodes_generated, nodes_expanded, stats, geom)
+        sol.island = winner[0]
+        return sol
+    except BudgetExhausted as e:
+        # Detener las islas y reunir los informes que lleguen a tiempo
+        with stop_gen.get_lock():
+            stop_gen.value = -1
+        limit = time.perf_counter() + _REPORT_GRACE
+        while len(reports) < islands and time.perf_counter() < limit:
+            try:
+                rep = results.get(timeout=0.05)
+                reports[rep[0]] = rep
+            except queue.Empty:
+                pass
+        if reports:
+            nodes_generated = max(nodes_generated, sum(r[3] for r in reports.values()))
+            nodes_expanded = max(nodes_expanded, sum(r[4] for r in reports.values()))
+        best = min(reports.values(), key=lambda r: (r[6], r[0]), default=None)
+        if best is None or best[6] == _NO_STOP:
+            return partial_solution(e, start, b'', goal_context(goal, None, geom, heuristic).h(start), nodes_generated, nodes_expanded, stats, geom)
+        return partial_solution(e, start, best[7], best[6], nodes_generated, nodes_expanded, stats, geom)
+    finally:
+        # Detener las islas que sigan vivas (cancelación o error) y liberar los procesos
+        with stop_gen.get_lock():
+            stop_gen.value = -1
+        for p in procs:
+            if p.pid is None:
+                continue
+            p.join(timeout=2)
+            if p.is_alive():
+                p.terminate()
+                p.join()
+        stats.finish(nodes_generated, nodes_expanded, total_pop)
+
+
+def genetic_islands(
+    start: AnyState,
+    goal: AnyState,
+    islands: int = 4,
+    island_params: Optional[Sequence[Dict[str, Any]]] = None,
+    pop_size: int = 2000,
+    chrom_len: int = 40,
+    generations: int = 200,
+    mutate_every: int = 1,
+    mutation_rate: float = 0.05,
+    tournament_k: int = 3,
+    elitism: int = 2,
+    migration_every: int = 10,
+    migrants: int = 5,
+    seed: Optional[int] = None,
+    geom: Optional[Geometry] = None,
+    heuristic: Optional[str] = None,
+    budget: Optional[Budget] = None,
+    stats: Optional[SearchStats] = None,
+    hooks: Optional[SearchHooks] = None,
+) -> Optional[Solution]:
+    """
+    Genético de islas en procesos. Los parámetros del genético valen para todas las islas salvo los
+    que cambie island_params (una lista de diccionarios con claves de ISLAND_KEYS; si se indica, su
+    largo es el número de islas). La isla i usa la semilla (seed, i); seed None = al azar.
+    La solución trae island con el índice de la isla ganadora. Nodos generados / expandidos: suma de
+    todas las islas (incluye lo que las demás alcanzaron a hacer antes de detenerse).
+    stats / hooks: estadísticas (ver puzzle.SearchStats); los callbacks por nodo no se invocan (las
+    islas corren en otros procesos) y on_progress recibe los totales mientras se espera.
+    budget: límites de tiempo, nodos y memoria (ver puzzle.Budget), revisados mientras se espera; la
+    memoria es la suma de lo que creció cada isla desde que empezó (cada una la mide en cada
+    generación y la publica junto con sus nodos). Al agotarse se detienen las islas y se retorna un
+    PartialSolution con el mejor individuo de las que informan dentro de _REPORT_GRACE segundos.
+    """
+    return run_steps(
+        genetic_islands_steps(
+            start, goal, islands, island_params, pop_size, chrom_len, generations, mutate_every, mutation_rate,
+            tournament_k, elitism, migration_every, migrants, seed, geom, heuristic, budget, stats, hooks,
+        )
+    )
@@ -0,0 +1,566 @@
+"""
+Búsqueda local con memoria acotada: ascenso de colina de máxima pendiente con reinicios aleatorios,
+recocido simulado y búsqueda en haz de ancho k.
+
+A diferencia de hill_climbing (un DFS ordenado por heurística con lista CERRADO que crece sin
+límite), estos métodos guardan solo el estado actual (o la capa actual del haz) y el camino
+recorrido, por lo que la memoria depende de max_steps / width y no del tamaño del espacio de estados.
+No garantizan soluciones óptimas; el camino retornado no tiene ciclos (se eliminan al final).
+
+Los intentos (reinicios desde el inicio) son independientes y con semilla propia (derivada de seed y
+del número de intento), así que pueden ejecutarse en un multiprocessing.Pool (workers > 1). Los
+resultados se revisan en el orden de los intentos y al primer éxito (o al agotarse el presupuesto)
+se terminan los procesos, sin esperar a los intentos en curso: la solución es la misma que con
+workers=1.
+"""
+import math
+import multiprocessing
+import random
+from array import array
+from collections import deque
+from multiprocessing.pool import AsyncResult
+from typing import Any, Callable, Deque, Dict, Generator, List, Optional, Set, Tuple
+
+from puzzle import (
+    MOVE_INDEX,
+    NO_TICK,
+    AnyState,
+    Budget,
+    BudgetExhausted,
+    Geometry,
+    GoalContext,
+    PartialSolution,
+    SearchHooks,
+    SearchStats,
+    SearchSteps,
+    Solution,
+    apply_moves,
+    begin_search,
+    budget_hooks,
+    goal_context,
+    hook_callbacks,
+    like,
+    resolve_geometry,
+    run_steps,
+    trace_moves,
+)
+
+# Movimiento que deshace a cada movimiento del vacío
+_REVERSE = {'Arriba': 'Abajo', 'Abajo': 'Arriba', 'Derecha': 'Izquierda', 'Izquierda': 'Derecha'}
+
+# Resultado de un intento: (movimientos o None si no llegó a la meta, nodos generados, nodos expandidos,
+# menor heurística alcanzada, movimientos hasta ese estado)
+RestartResult = Tuple[Optional[List[str]], int, int, int, List[str]]
+
+# Aviso periódico de un intento en el proceso actual: tick(nodos generados, nodos expandidos, menor h,
+# movimientos, largo del prefijo que llega al estado de menor h) retorna el próximo umbral de nodos
+# generados. La lista de movimientos solo crece, así que el prefijo sigue siendo válido.
+Tick = Callable[[int, int, int, List[str], int], int]
+
+# Intento en forma incremental: se suspende tras cada aviso (tick) y retorna su RestartResult
+RestartSteps = Generator[None, None, RestartResult]
+
+
+def _drop_cycles(start: AnyState, moves: List[str], geom: Geometry) -> List[str]:
+    # Quita los ciclos del camino: al volver a un estado ya visitado se descarta el tramo intermedio.
+    # Retorna los movimientos del camino sin ciclos
+    _, path = apply_moves(start, moves, geom)
+    position: Dict[AnyState, int] = {}
+    kept_states: List[AnyState] = []
+    kept_moves: List[str] = []
+    for i, st in enumerate(path):
+        if st in position:
+            cut = position[st]
+            for dropped in kept_states[cut + 1:]:
+                del position[dropped]
+            del kept_states[cut + 1:]
+            del kept_moves[cut:]
+            continue
+        position[st] = len(kept_states)
+        kept_states.append(st)
+        if i > 0:
+            kept_moves.append(moves[i - 1])
+    return kept_moves
+
+
+def _restart_rng(seed: int, restart: int) -> random.Random:
+    # Generador propio de cada intento: reproducible e independiente del orden de ejecución
+    return random.Random(seed * 1000003 + restart)
+
+
+def _climb(
+    start: AnyState,
+    goal: AnyState,
+    ctx: GoalContext,
+    geom: Geometry,
+    rng: random.Random,
+    kick: int,
+    max_steps: int,
+    max_sideways: int,
+    on_expand: Optional[Callable[[AnyState, int], None]] = None,
+    on_generate: Optional[Callable[[AnyState, int], None]] = None,
+    tick: Optional[Tick] = None,
+) -> RestartSteps:
+    # Un intento de ascenso de máxima pendiente desde el inicio: en cada paso el sucesor de menor
+    # heurística (empates al azar, sin deshacer el último movimiento). En un mínimo local, o tras
+    # max_sideways pasos seguidos sin mejora, se reinicia desde una caminata aleatoria de kick
+    # movimientos. max_steps cuenta todos los movimientos (de ascenso y de caminata).
+    cur = start
+    h = ctx.h(cur)
+    moves: List[str] = []
+    nodes_generated = 0
+    nodes_expanded = 0
+    sideways = 0
+    best_h, best_len = h, 0
+    next_tick = tick(0, 0, best_h, moves, best_len) if tick is not None else NO_TICK
+    while len(moves) < max_steps:
+        if cur == goal:
+            return moves, nodes_generated, nodes_expanded, 0, moves
+        if h < best_h:
+            best_h, best_len = h, len(moves)
+        if nodes_generated >= next_tick:
+            next_tick = tick(nodes_generated, nodes_expanded, best_h, moves, best_len)
+            yield
+        nodes_expanded += 1
+        if on_expand is not None:
+            on_expand(cur, len(moves))
+        back = _REVERSE[moves[-1]] if moves else None
+        best: List[Tuple[str, AnyState, int]] = []
+        for mv, nb, h_nb in ctx.successors(cur, h):
+            nodes_generated += 1
+            if on_generate is not None:
+                on_generate(nb, len(moves) + 1)
+            if mv == back:
+                continue
+            if not best or h_nb < best[0][2]:
+                best = [(mv, nb, h_nb)]
+            elif h_nb == best[0][2]:
+                best.append((mv, nb, h_nb))
+        if not best or best[0][2] > h or (best[0][2] == h and sideways >= max_sideways):
+            # Mínimo local o meseta demasiado larga: reinicio aleatorio desde el estado actual
+            for _ in range(kick):
+                mv, cur = rng.choice(geom.neighbors(cur))
+                moves.append(mv)
+            h = ctx.h(cur)
+            sideways = 0
+            continue
+        sideways = sideways + 1 if best[0][2] == h else 0
+        mv, cur, h = rng.choice(best)
+        moves.append(mv)
+    if cur == goal:
+        return moves, nodes_generated, nodes_expanded, 0, moves
+    return None, nodes_generated, nodes_expanded, best_h, moves[:best_len]
+
+
+def _anneal(
+    start: AnyState,
+    goal: AnyState,
+    ctx: GoalContext,
+    geom: Geometry,
+    rng: random.Random,
+    max_steps: int,
+    t0: float,
+    cooling: float,
+    min_temp: float,
+    on_expand: Optional[Callable[[AnyState, int], None]] = None,
+    on_generate: Optional[Callable[[AnyState, int], None]] = None,
+    tick: Optional[Tick] = None,
+) -> RestartSteps:
+    # Un intento de recocido simulado: en cada paso un sucesor al azar; se acepta si no empeora la
+    # heurística o, si la empeora en delta, con probabilidad exp(-delta / T). T decrece
+    # geométricamente (T *= cooling) hasta min_temp.
+    cur = start
+    h = ctx.h(cur)
+    temp = t0
+    moves: List[str] = []
+    nodes_generated = 0
+    nodes_expanded = 0
+    best_h, best_len = h, 0
+    next_tick = tick(0, 0, best_h, moves, best_len) if tick is not None else NO_TICK
+    for _ in range(max_steps):
+        if cur == goal:
+            return moves, nodes_generated, nodes_expanded, 0, moves
+        if h < best_h:
+            best_h, best_len = h, len(moves)
+        if nodes_generated >= next_tick:
+            next_tick = tick(nodes_generated, nodes_expanded, best_h, moves, best_len)
+            yield
+        nodes_expanded += 1
+        if on_expand is not None:
+            on_expand(cur, len(moves))
+        mv, nb, h_nb = rng.choice(ctx.successors(cur, h))
+        nodes_generated += 1
+        if on_generate is not None:
+            on_generate(nb, len(moves) + 1)
+        delta = h_nb - h
+        if delta <= 0 or rng.random() < math.exp(-delta / temp):
+            cur, h = nb, h_nb
+            moves.append(mv)
+        temp = max(min_temp, temp * cooling)
+    if cur == goal:
+        return moves, nodes_generated, nodes_expanded, 0, moves
+    return None, nodes_generated, nodes_expanded, best_h, moves[:best_len]
+
+
+def _one_restart(
+    kind: str,
+    restart: int,
+    seed: int,
+    start: AnyState,
+    goal: AnyState,
+    ctx: GoalContext,
+    geom: Geometry,
+    params: Dict[str, Any],
+    on_expand: Optional[Callable[[AnyState, int], None]] = None,
+    on_generate: Optional[Callable[[AnyState, int], None]] = None,
+    tick: Optional[Tick] = None,
+) -> RestartSteps:
+    # Ejecuta el intento número restart con su propio generador aleatorio
+    rng = _restart_rng(seed, restart)
+    if kind == 'climb':
+        return _climb(start, goal, ctx, geom, rng, on_expand=on_expand, on_generate=on_generate, tick=tick, **params)
+    return _anneal(start, goal, ctx, geom, rng, on_expand=on_expand, on_generate=on_generate, tick=tick, **params)
+
+
+def _run_restart(
+    kind: str,
+    restart: int,
+    seed: int,
+    start: AnyState,
+    goal: AnyState,
+    geom: Geometry,
+    heuristic: Optional[str],
+    params: Dict[str, Any],
+) -> RestartResult:
+    # Punto de entrada de un intento en un proceso del pool (el contexto se reconstruye ahí)
+    ctx = goal_context(goal, None, geom, heuristic)
+    return run_steps(_one_restart(kind, restart, seed, start, goal, ctx, geom, params))
+
+
+def _wait(result: AsyncResult, budget: Optional[Budget], nodes_generated: int) -> RestartResult:
+    # Resultado de un intento en el pool; con plazo, lanza BudgetExhausted si se cumple antes
+    while True:
+        try:
+            return result.get(timeout=budget.remaining() if budget is not None else None)
+        except multiprocessing.TimeoutError:
+            budget.check(nodes_generated)
+
+
+def _restarts(
+    kind: str,
+    start: AnyState,
+    goal: AnyState,
+    restarts: int,
+    seed: Optional[int],
+    workers: int,
+    ctx: Optional[GoalContext],
+    geom: Optional[Geometry],
+    heuristic: Optional[str],
+    params: Dict[str, Any],
+    budget: Optional[Budget],
+    stats: Optional[SearchStats],
+    hooks: Optional[SearchHooks],
+) -> SearchSteps:
+    # Ejecuta los intentos en orden (o en paralelo) y retorna la solución del primero que llega a la meta
+    if restarts <= 0:
+        raise ValueError("restarts debe ser un entero positivo.")
+    if workers <= 0:
+        raise ValueError("workers debe ser un entero positivo.")
+    if ctx is not None and workers > 1:
+        raise ValueError("ctx no se puede enviar a otros procesos: use heuristic con workers > 1.")
+    stats = begin_search(stats)
+    geom = resolve_geometry(start, geom, ctx)
+    goal = like(goal, start, geom)  # La meta en la misma representación (tupla o empaquetada) que el inicio
+    if start == goal:
+        return Solution(start, [], nodes_generated=0, nodes_expanded=0, stats=stats.finish(0, 0), geom=geom)
+    if seed is None:
+        seed = random.randrange(2**32)
+    ctx = goal_context(goal, ctx, geom, heuristic)
+
+    nodes_generated = 0
+    nodes_expanded = 0
+    running = (0, 0)  # Nodos del intento en curso (en el proceso actual), aún no sumados
+    best_h, best_moves = ctx.h(start), []  # Mejor progreso de todos los intentos
+    hooks = budget_hooks(hooks, budget)
+    on_expand, on_generate, next_tick = hook_callbacks(hooks)
+
+    def tick(ng: int, ne: int, h: int, moves: List[str], length: int) -> int:
+        # Progreso dentro de un intento del proceso actual (umbral relativo al intento)
+        nonlocal next_tick, running, best_h, best_moves
+        running = (ng, ne)
+        if h < best_h:
+            best_h, best_moves = h, moves[:length]
+        if nodes_generated + ng >= next_tick:
+            next_tick = stats.progress(hooks, nodes_generated + ng, nodes_expanded + ne, 1)
+        return next_tick - nodes_generated
+
+    def done(result: RestartResult) -> Optional[Solution]:
+        nonlocal nodes_generated, nodes_expanded, next_tick, running, best_h, best_moves
+        moves, ng, ne, h, prefix = result
+        nodes_generated += ng
+        nodes_expanded += ne
+        running = (0, 0)
+        if h < best_h:
+            best_h, best_moves = h, prefix
+        if nodes_generated >= next_tick:
+            next_tick = stats.progress(hooks, nodes_generated, nodes_expanded, 1)
+        if moves is None:
+            return None
+        return Solution(start, _drop_cycles(start, moves, geom), nodes_generated, nodes_expanded, stats, geom)
+
+    try:
+        if workers == 1:
+            for r in range(restarts):
+                result = yield from _one_restart(kind, r, seed, start, goal, ctx, geom, params, on_expand, on_generate, tick)
+                sol = done(result)
+                if sol is not None:
+                    return sol
+            return None
+
+        # En paralelo: a lo sumo 2 intentos pendientes por proceso, revisados en orden. Al salir (éxito,
+        # fin de los intentos o presupuesto agotado) los procesos se terminan: los intentos en curso
+        # ya no se usan
+        pool = multiprocessing.get_context().Pool(processes=workers)
+        try:
+            pending: Deque[AsyncResult] = deque()
+            submitted = 0
+            while submitted < restarts or pending:
+                while submitted < restarts and len(pending) < 2 * workers:
+                    pending.append(
+                        pool.apply_async(_run_restart, (kind, submitted, seed, start, goal, geom, heuristic, params))
+                    )
+                    submitted += 1
+                sol = done(_wait(pending.popleft(), budget, nodes_generated))
+                yield
+                if sol is not None:
+                    return sol
+            return None
+        finally:
+            pool.terminate()
+            pool.join()
+    except BudgetExhausted as e:
+        nodes_generated += running[0]
+        nodes_expanded += running[1]
+        moves = _drop_cycles(start, best_moves, geom)
+        return PartialSolution(start, moves, best_h, e.reason, str(e), nodes_generated, nodes_expanded, stats, geom)
+    finally:
+        stats.finish(nodes_generated, nodes_expanded, 1)
+
+
+def steepest_ascent_steps(
+    start: AnyState,
+    goal: AnyState,
+    restarts: int = 10,
+    max_steps: int = 5000,
+    kick: int = 3,
+    max_sideways: int = 20,
+    seed: Optional[int] = None,
+    workers: int = 1,
+    ctx: Optional[GoalContext] = None,
+    geom: Optional[Geometry] = None,
+    heuristic: Optional[str] = None,
+    budget: Optional[Budget] = None,
+    stats: Optional[SearchStats] = None,
+    hooks: Optional[SearchHooks] = None,
+) -> SearchSteps:
+    # Forma incremental de steepest_ascent (mismos parámetros): se suspende en cada aviso de progreso
+    params = {'kick': kick, 'max_steps': max_steps, 'max_sideways': max_sideways}
+    return _restarts('climb', start, goal, restarts, seed, workers, ctx, geom, heuristic, params, budget, stats, hooks)
+
+
+def steepest_ascent(
+    start: AnyState,
+    goal: AnyState,
+    restarts: int = 10,
+    max_steps: int = 5000,
+    kick: int = 3,
+    max_sideways: int = 20,
+    seed: Optional[int] = None,
+    workers: int = 1,
+    ctx: Optional[GoalContext] = None,
+    geom: Optional[Geometry] = None,
+    heuristic: Optional[str] = None,
+    budget: Optional[Budget] = None,
+    stats: Optional[SearchStats] = None,
+    hooks: Optional[SearchHooks] = None,
+) -> Optional[Solution]:
+    """
+    Ascenso de colina de máxima pendiente con reinicios aleatorios. En el puzzle no se puede saltar
+    a un estado cualquiera (el camino debe ser continuo), así que al quedar en un mínimo local se
+    reinicia desde una caminata aleatoria de kick movimientos a partir del estado actual. Se hacen
+    hasta restarts intentos independientes desde el inicio, de max_steps movimientos cada uno.
+    seed: semilla base (None = al azar); workers > 1 ejecuta los intentos en procesos.
+    La heurística es la indicada en heuristic (ver puzzle.HEURISTICS) o ctx.
+    budget: límites de tiempo, nodos y memoria (ver puzzle.Budget); al agotarse se retorna un
+    PartialSolution hasta el estado de menor heurística alcanzado en cualquier intento. Con
+    workers > 1 los nodos y la memoria se revisan al terminar cada intento, el plazo al esperarlos, y
+    los procesos con intentos en curso se terminan.
+    stats / hooks: estadísticas e instrumentación (ver puzzle.SearchStats); con workers > 1 los
+    callbacks de nodos no se invocan y el progreso se informa al terminar cada intento.
+    """
+    return run_steps(
+        steepest_ascent_steps(
+            start, goal, restarts, max_steps, kick, max_sideways, seed, workers, ctx, geom, heuristic, budget,
+            stats, hooks,
+        )
+    )
+
+
+def simulated_annealing_steps(
+    start: AnyState,
+    goal: AnyState,
+    restarts: int = 5,
+    max_steps: int = 200000,
+    t0: float = 2.0,
+    cooling: float = 0.9999,
+    min_temp: float = 0.05,
+    seed: Optional[int] = None,
+    workers: int = 1,
+    ctx: Optional[GoalContext] = None,
+    geom: Optional[Geometry] = None,
+    heuristic: Optional[str] = None,
+    budget: Optional[Budget] = None,
+    stats: Optional[SearchStats] = None,
+    hooks: Optional[SearchHooks] = None,
+) -> SearchSteps:
+    # Forma incremental de simulated_annealing (mismos parámetros): se suspende en cada aviso de progreso
+    if t0 <= 0 or min_temp <= 0 or not 0 < cooling <= 1:
+        raise ValueError("t0 y min_temp deben ser positivos y cooling debe estar en (0, 1].")
+    params = {'max_steps': max_steps, 't0': t0, 'cooling': cooling, 'min_temp': min_temp}
+    return _restarts('anneal', start, goal, restarts, seed, workers, ctx, geom, heuristic, params, budget, stats, hooks)
+
+
+def simulated_annealing(
+    start: AnyState,
+    goal: AnyState,
+    restarts: int = 5,
+    max_steps: int = 200000,
+    t0: float = 2.0,
+    cooling: float = 0.9999,
+    min_temp: float = 0.05,
+    seed: Optional[int] = None,
+    workers: int = 1,
+    ctx: Optional[GoalContext] = None,
+    geom: Optional[Geometry] = None,
+    heuristic: Optional[str] = None,
+    budget: Optional[Budget] = None,
+    stats: Optional[SearchStats] = None,
+    hooks: Optional[SearchHooks] = None,
+) -> Optional[Solution]:
+    """
+    Recocido simulado con intentos independientes desde el inicio. Cada intento da hasta max_steps
+    pasos con temperatura inicial t0 que se multiplica por cooling en cada paso (mínimo min_temp).
+    seed / workers / ctx / heuristic / budget / stats / hooks: como en steepest_ascent.
+    """
+    return run_steps(
+        simulated_annealing_steps(
+            start, goal, restarts, max_steps, t0, cooling, min_temp, seed, workers, ctx, geom, heuristic,
+            budget, stats, hooks,
+        )
+    )
+
+
+def beam_search_steps(
+    start: AnyState,
+    goal: AnyState,
+    width: int = 100,
+    max_depth: int = 1000,
+    ctx: Optional[GoalContext] = None,
+    geom: Optional[Geometry] = None,
+    heuristic: Optional[str] = None,
+    budget: Optional[Budget] = None,
+    stats: Optional[SearchStats] = None,
+    hooks: Optional[SearchHooks] = None,
+) -> SearchSteps:
+    # Forma incremental de beam_search (mismos parámetros): se suspende en cada aviso de progreso
+    if width <= 0:
+        raise ValueError("width debe ser un entero positivo.")
+    stats = begin_search(stats)
+    geom = resolve_geometry(start, geom, ctx)
+    goal = like(goal, start, geom)  # La meta en la misma representación (tupla o empaquetada) que el inicio
+    if start == goal:
+        return Solution(start, [], nodes_generated=0, nodes_expanded=0, stats=stats.finish(0, 0), geom=geom)
+    ctx = goal_context(goal, ctx, geom, heuristic)
+
+    # Nodos de todas las capas en arreglos paralelos (índice del padre, código del movimiento);
+    # la capa actual guarda (estado, h, índice del nodo)
+    parents = array('i', [-1])
+    codes = bytearray(1)
+    layer: List[Tuple[AnyState, int, int]] = [(start, ctx.h(start), 0)]
+    previous: Set[AnyState] = set()
+    nodes_generated = 0
+    nodes_expanded = 0
+    duplicate_hits = 0
+    peak_frontier = 1
+    best_h, best_idx = layer[0][1], 0  # Mejor progreso, por si se agota el presupuesto
+    hooks = budget_hooks(hooks, budget)
+    on_expand, on_generate, next_tick = hook_callbacks(hooks)
+
+    try:
+        for depth in range(max_depth):
+            seen = {st for st, _, _ in layer}
+            candidates: List[Tuple[int, AnyState, int, int]] = []
+            for st, h, idx in layer:
+                nodes_expanded += 1
+                if on_expand is not None:
+                    on_expand(st, depth)
+                if h < best_h:
+                    best_h, best_idx = h, idx
+                for mv, nb, h_nb in ctx.successors(st, h):
+                    nodes_generated += 1
+                    if on_generate is not None:
+                        on_generate(nb, depth + 1)
+                    if nodes_generated >= next_tick:
+                        next_tick = stats.progress(hooks, nodes_generated, nodes_expanded, len(layer), len(previous))
+                        yield
+                    if nb == goal:
+                        # Un estado puede repetirse entre capas no consecutivas: se quitan los ciclos
+                        moves = _drop_cycles(start, trace_moves(parents, codes, idx) + [mv], geom)
+                        return Solution(start, moves, nodes_generated, nodes_expanded, stats, geom)
+                    if nb in seen or nb in previous:
+                        duplicate_hits += 1
+                        continue
+                    seen.add(nb)
+                    candidates.append((h_nb, nb, idx, MOVE_INDEX[mv]))
+            if not candidates:
+                return None
+            # sort es estable: a igual heurística se conserva el orden de generación
+            candidates.sort(key=lambda c: c[0])
+            previous = {st for st, _, _ in layer}
+            layer = []
+            for h_nb, nb, parent, code in candidates[:width]:
+                layer.append((nb, h_nb, len(parents)))
+                parents.append(parent)
+                codes.append(code)
+            if len(layer) > peak_frontier:
+                peak_frontier = len(layer)
+        return None
+    except BudgetExhausted as e:
+        moves = _drop_cycles(start, trace_moves(parents, codes, best_idx), geom)
+        return PartialSolution(start, moves, best_h, e.reason, str(e), nodes_generated, nodes_expanded, stats, geom)
+    finally:
+        stats.finish(nodes_generated, nodes_expanded, peak_frontier, len(previous), 0, duplicate_hits)
+
+
+def beam_search(
+    start: AnyState,
+    goal: AnyState,
+    width: int = 100,
+    max_depth: int = 1000,
+    ctx: Optional[GoalContext] = None,
+    geom: Optional[Geometry] = None,
+    heuristic: Optional[str] = None,
+    budget: Optional[Budget] = None,
+    stats: Optional[SearchStats] = None,
+    hooks: Optional[SearchHooks] = None,
+) -> Optional[Solution]:
+    """
+    Búsqueda en haz: amplitud por capas conservando en cada capa solo los width sucesores de menor
+    heurística (empates en orden de generación). Se descartan los sucesores repetidos en la capa o
+    presentes en la capa anterior. Memoria O(width * profundidad) para los enlaces al padre
+    (arreglos compactos) y O(width) estados. Determinista.
+    budget: límites de tiempo, nodos y memoria (ver puzzle.Budget); al agotarse se retorna un
+    PartialSolution hasta el estado expandido de menor heurística.
+    stats / hooks: estadísticas e instrumentación (ver puzzle.SearchStats).
+    """
+    return run_steps(beam_search_steps(start, goal, width, max_depth, ctx, geom, heuristic, budget, stats, hooks))
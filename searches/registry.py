@@ -0,0 +1,78 @@
+import inspect
+from typing import Any, Callable, Dict, Optional
+
+from puzzle import SearchSteps, Solution
+from searches.astar import astar, astar_steps
+from searches.bidirectional import bidirectional_bfs, bidirectional_bfs_steps, bidirectional_mm, bidirectional_mm_steps
+from searches.bpp import bpp, bpp_steps
+from searches.dfs import dfs, dfs_steps
+from searches.exact import exact, exact_steps
+from searches.genetic import genetic_simple, genetic_simple_steps
+from searches.genetic_numpy import genetic_numpy, genetic_numpy_steps
+from searches.hill_climbing import hill_climbing, hill_climbing_steps
+from searches.idastar import idastar, idastar_steps
+from searches.islands import genetic_islands, genetic_islands_steps
+from searches.local_search import (
+    beam_search,
+    beam_search_steps,
+    simulated_annealing,
+    simulated_annealing_steps,
+    steepest_ascent,
+    steepest_ascent_steps,
+)
+
+# Registro de algoritmos por nombre: todos reciben (start, goal, ..., geom=...) y retornan Solution o None
+# (un PartialSolution si se les pasa budget y se agota, ver puzzle.Budget)
+SOLVERS: Dict[str, Callable[..., Optional[Solution]]] = {
+    'dfs': dfs,
+    'bpp': bpp,
+    'hill_climbing': hill_climbing,
+    'astar': astar,
+    'idastar': idastar,
+    'genetic_simple': genetic_simple,
+    'genetic_numpy': genetic_numpy,
+    'genetic_islands': genetic_islands,
+    'exact': exact,
+    'bidirectional_bfs': bidirectional_bfs,
+    'bidirectional_mm': bidirectional_mm,
+    'steepest_ascent': steepest_ascent,
+    'simulated_annealing': simulated_annealing,
+    'beam_search': beam_search,
+}
+
+# Forma incremental de cada algoritmo, con los mismos parámetros (ver puzzle.search_events)
+STEPS: Dict[str, Callable[..., SearchSteps]] = {
+    'dfs': dfs_steps,
+    'bpp': bpp_steps,
+    'hill_climbing': hill_climbing_steps,
+    'astar': astar_steps,
+    'idastar': idastar_steps,
+    'genetic_simple': genetic_simple_steps,
+    'genetic_numpy': genetic_numpy_steps,
+    'genetic_islands': genetic_islands_steps,
+    'exact': exact_steps,
+    'bidirectional_bfs': bidirectional_bfs_steps,
+    'bidirectional_mm': bidirectional_mm_steps,
+    'steepest_ascent': steepest_ascent_steps,
+    'simulated_annealing': simulated_annealing_steps,
+    'beam_search': beam_search_steps,
+}
+
+
+def get_solver(name: str) -> Callable[..., Optional[Solution]]:
+    if name not in SOLVERS:
+        raise ValueError(f"Algoritmo no soportado: {name} (use {', '.join(SOLVERS)}).")
+    return SOLVERS[name]
+
+
+def get_steps(name: str) -> Callable[..., SearchSteps]:
+    get_solver(name)
+    return STEPS[name]
+
+
+def check_params(name: str, params: Dict[str, Any]) -> None:
+    # Valida que el algoritmo acepte los parámetros indicados (sin contar start, goal ni geom)
+    accepted = set(inspect.signature(get_solver(name)).parameters) - {'start', 'goal', 'geom'}
+    unknown = sorted(set(params) - accepted)
+    if unknown:
+        raise ValueError(f"Parámetros no soportados por {name}: {', '.join(unknown)} (use {', '.join(sorted(accepted))}).")
@@ -0,0 +1,273 @@
+"""
+Validación y resolubilidad en bloque para conjuntos grandes de instancias (opcional: requiere numpy).
+
+Los estados llegan como una matriz (estados, celdas) de enteros, o como un arreglo de estados
+empaquetados (puzzle.Geometry.encode, enteros sin signo de 64 bits) con packed=True. Se procesan por
+tramos de chunk_rows filas: cada fila se valida (números 0..n-1 sin repetir y, si está empaquetada,
+índice del vacío consistente) y se calcula su paridad de resolubilidad (ver
+puzzle.solvability_parity) con operaciones sobre columnas. La paridad se obtiene llevando cada
+permutación a la identidad con intercambios (a lo sumo n - 1, el mismo paso para todas las filas a
+la vez), por lo que el costo es O(n) por fila.
+
+Los archivos binarios de estados guardan un byte por celda (write_states_file) o, con packed, un
+entero de 64 bits little-endian por estado; se leen con memmap, de modo que un archivo de millones
+de instancias no se carga completo.
+
+Uso por línea de comandos:
+    python validation.py instancias.bin --size 3x3 -o resolubles.bin
+    python validation.py instancias.bin --size 3x4 --packed --goal meta.txt
+"""
+import argparse
+import sys
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # numpy es opcional
+    np = None
+
+from puzzle import AnyState, Geometry, geometry, parse_geometry, read_board, solvability_parity, to_tuple
+
+# Filas procesadas por tramo: acota la memoria temporal (unas decenas de MB en el 3x3)
+CHUNK_ROWS = 1 << 18
+
+# Errores detallados que se guardan como máximo en un BulkReport
+MAX_ERRORS = 100
+
+
+def _require_numpy() -> None:
+    if np is None:
+        raise ImportError("La validación en bloque requiere numpy (pip install numpy).")
+
+
+class BulkReport:
+    """
+    Resultado de check_states: máscaras booleanas por fila valid (estado bien formado) y solvable
+    (válido y resoluble hacia la meta), y errors con (fila, mensaje) de las primeras filas inválidas.
+    """
+
+    def __init__(self, valid: 'np.ndarray', solvable: 'np.ndarray', errors: List[Tuple[int, str]]):
+        self.valid = valid
+        self.solvable = solvable
+        self.errors = errors
+
+    @property
+    def total(self) -> int:
+        return len(self.valid)
+
+    @property
+    def invalid(self) -> int:
+        return self.total - int(np.count_nonzero(self.valid))
+
+    @property
+    def unsolvable(self) -> int:
+        # Válidos pero no resolubles
+        return int(np.count_nonzero(self.valid)) - int(np.count_nonzero(self.solvable))
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            'total': self.total,
+            'valid': self.total - self.invalid,
+            'invalid': self.invalid,
+            'solvable': int(np.count_nonzero(self.solvable)),
+            'unsolvable': self.unsolvable,
+            'errors': [{'row': row, 'error': msg} for row, msg in self.errors],
+        }
+
+
+def _resolve(states: 'np.ndarray', geom: Optional[Geometry], packed: bool) -> Geometry:
+    # Geometría explícita o deducida del ancho de la matriz (tablero cuadrado; 3x3 si está empaquetada)
+    if packed:
+        if states.ndim != 1:
+            raise ValueError("Los estados empaquetados deben venir en un arreglo de una dimensión.")
+        geom = geom if geom is not None else geometry(3)
+        if geom.blank_shift + geom.tile_bits > 64:
+            raise ValueError(f"Los estados de {geom.rows}x{geom.cols} no caben en 64 bits; use una matriz de fichas.")
+        return geom
+    if states.ndim != 2:
+        raise ValueError("Se esperaba una matriz (estados, celdas).")
+    if geom is None:
+        side = int(round(states.shape[1] ** 0.5))
+        if side < 2 or side * side != states.shape[1]:
+            raise ValueError(f"No se puede deducir la geometría de un tablero de {states.shape[1]} celdas; indique geom.")
+        return geometry(side)
+    if states.shape[1] != geom.size:
+        raise ValueError(f"Cada estado debe tener {geom.size} celdas ({geom.rows}x{geom.cols}), no {states.shape[1]}.")
+    return geom
+
+
+def unpack_states(packed: 'np.ndarray', geom: Optional[Geometry] = None) -> Tuple['np.ndarray', 'np.ndarray']:
+    # Estados empaquetados a (matriz de fichas, índice del vacío guardado en cada uno)
+    _require_numpy()
+    packed = np.asarray(packed).astype(np.uint64, copy=False)
+    geom = _resolve(packed, geom, True)
+    shifts = np.arange(geom.size, dtype=np.uint64) * np.uint64(geom.tile_bits)
+    mask = np.uint64(geom.tile_mask)
+    board = ((packed[:, None] >> shifts) & mask).astype(np.intp)
+    blank = ((packed >> np.uint64(geom.blank_shift)) & mask).astype(np.intp)
+    return board, blank
+
+
+def valid_mask(board: 'np.ndarray', n: int) -> 'np.ndarray':
+    # Filas de la matriz que contienen los números 0..n-1 sin repetir
+    board = np.asarray(board)
+    ok = ((board >= 0) & (board < n)).all(axis=1)
+    seen = np.zeros(board.shape, dtype=bool)
+    seen[np.arange(len(board))[:, None], np.clip(board, 0, n - 1)] = True
+    return ok & seen.all(axis=1)
+
+
+def parity(board: 'np.ndarray', geom: Geometry) -> 'np.ndarray':
+    """
+    solvability_parity de cada fila de una matriz de permutaciones válidas (uint8, 0 o 1).
+    En el paso i se lleva el valor i a la celda i en todas las filas a la vez; la cantidad de
+    intercambios tiene la paridad de la permutación.
+    """
+    s = np.array(board, dtype=np.intp)
+    m, n = s.shape
+    rows = np.arange(m)
+    pos = np.empty_like(s)
+    pos[rows[:, None], s] = np.arange(n)
+    blank = pos[:, 0].copy()
+    swaps = np.zeros(m, dtype=np.uint8)
+    for i in range(n - 1):
+        j = pos[:, i].copy()
+        v = s[:, i].copy()
+        swaps ^= (j != i).astype(np.uint8)
+        s[rows, j] = v
+        pos[rows, v] = j
+    # Las inversiones entre fichas difieren de las de la permutación en las celdas antes del vacío
+    result = swaps ^ (blank % 2).astype(np.uint8)
+    if geom.cols % 2 == 0:
+        result ^= ((blank // geom.cols) % 2).astype(np.uint8)
+    return result
+
+
+def _describe(row: 'np.ndarray', n: int, stored_blank: Optional[int]) -> str:
+    # Mensaje de error de una fila inválida
+    values = [int(v) for v in row]
+    outside = sorted({v for v in values if not 0 <= v < n})
+    if outside:
+        return f"Valores fuera de 0..{n - 1}: {', '.join(map(str, outside))}."
+    repeated = sorted({v for v in values if values.count(v) > 1})
+    if repeated:
+        missing = sorted(set(range(n)) - set(values))
+        return f"Números repetidos: {', '.join(map(str, repeated))}; faltan: {', '.join(map(str, missing))}."
+    return f"El índice del vacío guardado ({stored_blank}) no coincide con la celda del 0 ({values.index(0)})."
+
+
+def check_states(
+    states: Any,
+    goal: Optional[AnyState] = None,
+    geom: Optional[Geometry] = None,
+    packed: bool = False,
+    max_errors: int = MAX_ERRORS,
+    chunk_rows: int = CHUNK_ROWS,
+) -> BulkReport:
+    """
+    Valida en bloque una matriz (estados, celdas) de fichas, o con packed un arreglo de estados
+    empaquetados, y determina cuáles son resolubles hacia goal (por defecto la meta convencional de
+    geom). Sin geom, la geometría se deduce del ancho de la matriz (tablero cuadrado) o es 3x3 si
+    está empaquetada. La meta inválida levanta ValueError; las filas inválidas quedan en False en
+    ambas máscaras y las primeras max_errors se describen en errors.
+    """
+    _require_numpy()
+    states = np.asarray(states)
+    geom = _resolve(states, geom, packed)
+    n = geom.size
+    goal = geom.goal if goal is None else to_tuple(goal, geom)
+    if len(goal) != n or set(goal) != set(range(n)):
+        raise ValueError(f"La meta debe contener los números 0..{n - 1} sin repetir.")
+    target = solvability_parity(goal, geom)
+
+    total = len(states)
+    valid = np.zeros(total, dtype=bool)
+    solvable = np.zeros(total, dtype=bool)
+    errors: List[Tuple[int, str]] = []
+    for lo in range(0, total, chunk_rows):
+        chunk = states[lo:lo + chunk_rows]
+        stored: Optional['np.ndarray'] = None
+        if packed:
+            board, stored = unpack_states(chunk, geom)
+        else:
+            board = chunk.astype(np.intp)
+        ok = valid_mask(board, n)
+        if stored is not None:
+            ok &= (board == 0).argmax(axis=1) == stored
+        valid[lo:lo + len(ok)] = ok
+        if ok.any():
+            solvable[lo:lo + len(ok)][ok] = parity(board[ok], geom) == target
+        if len(errors) < max_errors:
+            for i in np.flatnonzero(~ok)[:max_errors - len(errors)]:
+                errors.append((lo + int(i), _describe(board[i], n, None if stored is None else int(stored[i]))))
+    return BulkReport(valid, solvable, errors)
+
+
+def read_states_file(path: str, geom: Geometry, packed: bool = False) -> 'np.ndarray':
+    # Mapea en memoria un archivo binario de estados: matriz (estados, celdas) de bytes o, con packed,
+    # arreglo de enteros de 64 bits
+    _require_numpy()
+    if packed:
+        return np.memmap(path, dtype='<u8', mode='r')
+    data = np.memmap(path, dtype=np.uint8, mode='r')
+    if data.size % geom.size:
+        raise ValueError(f"El tamaño de {path} no es múltiplo de {geom.size} bytes (un byte por celda).")
+    return data.reshape(-1, geom.size)
+
+
+def write_states_file(path: str, states: Any, packed: bool = False) -> None:
+    # Escribe estados en el formato de read_states_file
+    _require_numpy()
+    states = np.asarray(states)
+    if packed:
+        states.astype('<u8').tofile(path)
+        return
+    if states.size and (states.min() < 0 or states.max() > 255):
+        raise ValueError("El formato de un byte por celda admite valores 0..255.")
+    states.astype(np.uint8).tofile(path)
+
+
+def check_file(
+    path: str,
+    goal: Optional[AnyState] = None,
+    geom: Optional[Geometry] = None,
+    packed: bool = False,
+    max_errors: int = MAX_ERRORS,
+    chunk_rows: int = CHUNK_ROWS,
+) -> BulkReport:
+    # check_states sobre un archivo binario de estados (3x3 por defecto), leído por tramos
+    geom = geom if geom is not None else geometry(3)
+    return check_states(read_states_file(path, geom, packed), goal, geom, packed, max_errors, chunk_rows)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Valida un archivo binario de estados y filtra los resolubles.')
+    parser.add_argument('input', help='Archivo de estados: un byte por celda (o enteros de 64 bits con --packed).')
+    parser.add_argument('--size', default='3x3', help='Dimensiones del tablero, p. ej. 3x3 o 4x4 (por defecto 3x3).')
+    parser.add_argument('--packed', action='store_true', help='Estados empaquetados (ver puzzle.Geometry.encode).')
+    parser.add_argument('--goal', help='Archivo con la meta (por defecto la convencional con el vacío al final).')
+    parser.add_argument('-o', '--output', help='Escribe aquí los estados válidos y resolubles, en el mismo formato.')
+    parser.add_argument('--max-errors', type=int, default=20, help='Filas inválidas que se describen (por defecto 20).')
+    args = parser.parse_args(argv)
+
+    geom = parse_geometry(args.size)
+    goal = read_board(args.goal, geom=geom)[0] if args.goal else None
+    try:
+        _require_numpy()
+        states = read_states_file(args.input, geom, args.packed)
+        report = check_states(states, goal, geom, args.packed, args.max_errors)
+    except (ImportError, ValueError, OSError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    for row, msg in report.errors:
+        print(f"Estado {row}: {msg}", file=sys.stderr)
+    summary = report.as_dict()
+    print(f"{summary['total']} estados: {summary['valid']} válidos, {summary['solvable']} resolubles, "
+          f"{summary['unsolvable']} no resolubles, {summary['invalid']} inválidos.")
+    if args.output:
+        write_states_file(args.output, states[report.solvable], args.packed)
+    return 1 if report.invalid else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())